@@ -1,3 +1,15 @@
+from gherkin_testcontainers_eventhubs.helpers import (
+    receive_events,
+    receive_events_async,
+    send_events,
+    send_events_async,
+)
 from gherkin_testcontainers_eventhubs.plugin import EventHubsPlugin
 
-__all__ = ["EventHubsPlugin"]
+__all__ = [
+    "EventHubsPlugin",
+    "receive_events",
+    "receive_events_async",
+    "send_events",
+    "send_events_async",
+]
@@ -0,0 +1,164 @@
+import asyncio
+import contextlib
+import threading
+import time
+from collections.abc import AsyncIterable, Iterable
+from typing import Any
+
+DEFAULT_CONSUMER_GROUP = "$Default"
+
+
+def _as_event_data(event: Any) -> Any:
+    from azure.eventhub import EventData
+
+    if isinstance(event, EventData):
+        return event
+    return EventData(event)
+
+
+def send_events(producer: Any, events: Iterable[Any], **batch_kwargs) -> int:
+    """Send ``events`` through a sync producer, packing as many per batch as fit.
+
+    Items that aren't ``EventData`` are wrapped in one. ``batch_kwargs`` go to
+    ``create_batch`` (``partition_id``, ``partition_key``, ``max_size_in_bytes``).
+    Returns the number of batches sent.
+    """
+    batches = 0
+    batch = producer.create_batch(**batch_kwargs)
+    for event in events:
+        event = _as_event_data(event)
+        try:
+            batch.add(event)
+        except ValueError:
+            if len(batch) == 0:
+                raise
+            producer.send_batch(batch)
+            batches += 1
+            batch = producer.create_batch(**batch_kwargs)
+            batch.add(event)
+    if len(batch):
+        producer.send_batch(batch)
+        batches += 1
+    return batches
+
+
+async def send_events_async(
+    producer: Any, events: Iterable[Any] | AsyncIterable[Any], **batch_kwargs
+) -> int:
+    """Async counterpart of ``send_events`` for ``azure.eventhub.aio`` producers."""
+    batches = 0
+    batch = await producer.create_batch(**batch_kwargs)
+
+    async def add(event: Any) -> None:
+        nonlocal batch, batches
+        event = _as_event_data(event)
+        try:
+            batch.add(event)
+        except ValueError:
+            if len(batch) == 0:
+                raise
+            await producer.send_batch(batch)
+            batches += 1
+            batch = await producer.create_batch(**batch_kwargs)
+            batch.add(event)
+
+    if isinstance(events, AsyncIterable):
+        async for event in events:
+            await add(event)
+    else:
+        for event in events:
+            await add(event)
+    if len(batch):
+        await producer.send_batch(batch)
+        batches += 1
+    return batches
+
+
+def receive_events(
+    connection_string: str,
+    expected_count: int,
+    timeout: float = 30.0,
+    consumer_group: str = DEFAULT_CONSUMER_GROUP,
+    starting_position: Any = "-1",
+) -> list[Any]:
+    """Read from every partition until ``expected_count`` events arrive or ``timeout`` passes.
+
+    Returns the events received, which is fewer than ``expected_count`` if the
+    deadline was hit. An error raised by the consumer's ``receive`` is
+    re-raised here.
+    """
+    from azure.eventhub import EventHubConsumerClient
+
+    events: list[Any] = []
+    errors: list[BaseException] = []
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def on_event(partition_context: Any, event: Any) -> None:
+        if event is None:
+            return
+        with lock:
+            events.append(event)
+            if len(events) >= expected_count:
+                done.set()
+
+    consumer = EventHubConsumerClient.from_connection_string(
+        connection_string, consumer_group=consumer_group
+    )
+
+    def receive() -> None:
+        try:
+            consumer.receive(on_event=on_event, starting_position=starting_position)
+        except BaseException as exc:
+            errors.append(exc)
+            done.set()
+
+    worker = threading.Thread(target=receive, daemon=True)
+    deadline = time.monotonic() + timeout
+    worker.start()
+    try:
+        done.wait(timeout)
+    finally:
+        consumer.close()
+        worker.join(max(deadline - time.monotonic(), 1.0))
+    if errors:
+        raise errors[0]
+    with lock:
+        return list(events)
+
+
+async def receive_events_async(
+    connection_string: str,
+    expected_count: int,
+    timeout: float = 30.0,
+    consumer_group: str = DEFAULT_CONSUMER_GROUP,
+    starting_position: Any = "-1",
+) -> list[Any]:
+    """Async counterpart of ``receive_events`` using ``azure.eventhub.aio``."""
+    from azure.eventhub.aio import EventHubConsumerClient
+
+    events: list[Any] = []
+    done = asyncio.Event()
+
+    async def on_event(partition_context: Any, event: Any) -> None:
+        if event is None:
+            return
+        events.append(event)
+        if len(events) >= expected_count:
+            done.set()
+
+    consumer = EventHubConsumerClient.from_connection_string(
+        connection_string, consumer_group=consumer_group
+    )
+    receiving = asyncio.ensure_future(
+        consumer.receive(on_event=on_event, starting_position=starting_position)
+    )
+    try:
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(done.wait(), timeout)
+    finally:
+        await consumer.close()
+        receiving.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await receiving
+    return list(events)
@@ -1,6 +1,12 @@
+import asyncio
+import atexit
+import inspect
 import json
 import os
 import tempfile
+import threading
+import weakref
+from collections.abc import Iterable, Mapping
 from typing import Any
 
 from testcontainers.azurite import AzuriteContainer
@@ -8,14 +14,26 @@ from testcontainers.core.container import DockerContainer
 from testcontainers.core.network import Network
 from testcontainers.core.wait_strategies import PortWaitStrategy
 
+from gherkin_testcontainers.budget import ResourceSpec
+from gherkin_testcontainers.external import ExternalService
 from gherkin_testcontainers.plugin import ContainerPlugin
 
 DEFAULT_EVENTHUBS_IMAGE = "mcr.microsoft.com/azure-messaging/eventhubs-emulator:latest"
+DEFAULT_AZURITE_IMAGE = inspect.signature(AzuriteContainer).parameters["image"].default
 EVENTHUBS_AMQP_PORT = 5672
 DEFAULT_EVENTHUB_NAMESPACE = "emulatorNs1"
 DEFAULT_EVENTHUB_NAME = "eh1"
 EVENTHUBS_SHARED_ACCESS_KEY_NAME = "RootManageSharedAccessKey"
 EVENTHUBS_SHARED_ACCESS_KEY = "SAS_KEY_VALUE"
+DEFAULT_PARTITION_COUNT = 2
+DEFAULT_CONSUMER_GROUPS = ("cg1",)
+CLIENT_CLOSE_TIMEOUT = 30.0
+
+# azure.eventhub.aio clients handed out by the plugin, mapped to the event
+# loop running when they were created (None if there wasn't one).
+_async_client_loops: "weakref.WeakKeyDictionary[Any, asyncio.AbstractEventLoop | None]" = (
+    weakref.WeakKeyDictionary()
+)
 
 DEFAULT_CONFIG = {
     "UserConfig": {
@@ -41,11 +59,135 @@ DEFAULT_CONFIG = {
 }
 
 
+def build_config(
+    eventhubs: str | Iterable[str] | Mapping[str, Mapping[str, Any]] | None = None,
+    namespace: str = DEFAULT_EVENTHUB_NAMESPACE,
+    partition_count: int = DEFAULT_PARTITION_COUNT,
+    consumer_groups: Iterable[str] = DEFAULT_CONSUMER_GROUPS,
+) -> dict:
+    """Build an emulator ``Config.json`` document.
+
+    ``eventhubs`` is a hub name, a list of hub names, or a mapping of hub name
+    to per-hub overrides (``partition_count``, ``consumer_groups``). Hubs
+    without overrides use ``partition_count`` and ``consumer_groups``.
+    """
+    if eventhubs is None:
+        eventhubs = [DEFAULT_EVENTHUB_NAME]
+    elif isinstance(eventhubs, str):
+        eventhubs = [eventhubs]
+    if not isinstance(eventhubs, Mapping):
+        eventhubs = {name: {} for name in eventhubs}
+
+    entities = []
+    for hub_name, overrides in eventhubs.items():
+        groups = overrides.get("consumer_groups", consumer_groups)
+        entities.append({
+            "Name": hub_name,
+            "PartitionCount": overrides.get("partition_count", partition_count),
+            "ConsumerGroups": [{"Name": group} for group in groups],
+        })
+
+    return {
+        "UserConfig": {
+            "NamespaceConfig": [
+                {"Type": "EventHub", "Name": namespace, "Entities": entities}
+            ],
+            "LoggingConfig": {"Type": "File"},
+        }
+    }
+
+
+def first_eventhub(config: Mapping[str, Any]) -> str:
+    """Name of the first event hub in a ``Config.json`` document; ``eh1`` if it has none."""
+    for namespace in config.get("UserConfig", {}).get("NamespaceConfig", []):
+        for entity in namespace.get("Entities", []):
+            return entity["Name"]
+    return DEFAULT_EVENTHUB_NAME
+
+
+class AzuriteSidecar:
+    """Azurite container and Docker network shared by every emulator in the process.
+
+    The first ``acquire()`` creates both; later calls reuse them. They are torn
+    down by ``shutdown()``, which runs automatically at interpreter exit.
+    """
+
+    _lock = threading.Lock()
+    _network: Network | None = None
+    _azurite: AzuriteContainer | None = None
+    _atexit_registered: bool = False
+
+    @classmethod
+    def acquire(cls) -> Network:
+        with cls._lock:
+            if cls._network is None:
+                network, azurite = _start_azurite()
+                cls._network, cls._azurite = network, azurite
+                if not cls._atexit_registered:
+                    atexit.register(cls.shutdown)
+                    cls._atexit_registered = True
+            return cls._network
+
+    @classmethod
+    def shutdown(cls) -> None:
+        with cls._lock:
+            network, azurite = cls._network, cls._azurite
+            cls._network, cls._azurite = None, None
+        if azurite is not None:
+            try:
+                azurite.stop()
+            finally:
+                if network is not None:
+                    network.remove()
+
+
+def _start_azurite() -> tuple[Network, AzuriteContainer]:
+    network = Network()
+    network.create()
+    try:
+        azurite = AzuriteContainer()
+        azurite.with_network(network)
+        azurite.with_network_aliases("azurite")
+        azurite.start()
+    except Exception:
+        network.remove()
+        raise
+    return network, azurite
+
+
 class EventHubsContainer(DockerContainer):
-    """Testcontainer for the Azure Event Hubs emulator."""
+    """Testcontainer for the Azure Event Hubs emulator.
+
+    The emulator's entities come from ``eventhubs``/``namespace`` and friends
+    (see ``build_config``), or from a complete ``config`` document. By default
+    the Azurite sidecar and its network are shared with other emulators
+    started in the same process; pass ``shared_azurite=False`` to give this
+    emulator its own. ``async_client=True`` makes the plugin hand out
+    ``azure.eventhub.aio`` clients.
+
+    Connection strings, and so the plugin's client, target the first
+    configured hub unless another ``eventhub_name`` is given.
+    """
 
-    def __init__(self, image: str = DEFAULT_EVENTHUBS_IMAGE, **kwargs) -> None:
+    def __init__(
+        self,
+        image: str = DEFAULT_EVENTHUBS_IMAGE,
+        eventhubs: str | Iterable[str] | Mapping[str, Mapping[str, Any]] | None = None,
+        namespace: str = DEFAULT_EVENTHUB_NAMESPACE,
+        partition_count: int = DEFAULT_PARTITION_COUNT,
+        consumer_groups: Iterable[str] = DEFAULT_CONSUMER_GROUPS,
+        config: dict | None = None,
+        shared_azurite: bool = True,
+        async_client: bool = False,
+        **kwargs,
+    ) -> None:
         super().__init__(image, **kwargs)
+        self.async_client = async_client
+        self.config = config if config is not None else build_config(
+            eventhubs, namespace, partition_count, consumer_groups
+        )
+        self.default_eventhub = first_eventhub(self.config)
+        self.shared_azurite = shared_azurite
         self._eh_network: Network | None = None
         self._azurite: AzuriteContainer | None = None
         self._config_tmp: str | None = None
@@ -55,38 +197,34 @@ class EventHubsContainer(DockerContainer):
         self.with_env("METADATA_SERVER", "azurite")
         self.waiting_for(PortWaitStrategy(EVENTHUBS_AMQP_PORT))
 
-    def get_connection_string(self, eventhub_name: str = DEFAULT_EVENTHUB_NAME) -> str:
+    def get_connection_string(self, eventhub_name: str | None = None) -> str:
         host = self.get_container_host_ip()
         port = self.get_exposed_port(EVENTHUBS_AMQP_PORT)
         return (
             f"Endpoint=sb://{host}:{port};"
             f"SharedAccessKeyName={EVENTHUBS_SHARED_ACCESS_KEY_NAME};"
             f"SharedAccessKey={EVENTHUBS_SHARED_ACCESS_KEY};"
-            f"EntityPath={eventhub_name};"
+            f"EntityPath={eventhub_name or self.default_eventhub};"
             "UseDevelopmentEmulator=true;"
         )
 
     def start(self) -> "EventHubsContainer":
         fd, self._config_tmp = tempfile.mkstemp(suffix=".json")
         with os.fdopen(fd, "w") as f:
-            json.dump(DEFAULT_CONFIG, f)
+            json.dump(self.config, f)
 
         try:
-            self._eh_network = Network()
-            self._eh_network.create()
-
-            self._azurite = AzuriteContainer()
-            self._azurite.with_network(self._eh_network)
-            self._azurite.with_network_aliases("azurite")
-            self._azurite.start()
+            if self.shared_azurite:
+                network = AzuriteSidecar.acquire()
+            else:
+                self._eh_network, self._azurite = _start_azurite()
+                network = self._eh_network
         except Exception:
-            if self._eh_network is not None:
-                self._eh_network.remove()
             if self._config_tmp is not None and os.path.exists(self._config_tmp):
                 os.unlink(self._config_tmp)
             raise
 
-        self.with_network(self._eh_network)
+        self.with_network(network)
         self.with_volume_mapping(
             self._config_tmp,
             "/Eventhubs_Emulator/ConfigFiles/Config.json",
@@ -101,14 +239,44 @@ class EventHubsContainer(DockerContainer):
         finally:
             if self._azurite is not None:
                 self._azurite.stop(force=force, delete_volume=delete_volume)
+                self._azurite = None
             if self._eh_network is not None:
                 self._eh_network.remove()
+                self._eh_network = None
             if self._config_tmp is not None and os.path.exists(self._config_tmp):
                 os.unlink(self._config_tmp)
 
 
+class ExternalEventHubs(ExternalService):
+    """An already-running namespace or emulator, given as its connection string."""
+
+    def __init__(self, connection_string: str, async_client: bool = False) -> None:
+        super().__init__(connection_string)
+        self.async_client = async_client
+
+    def get_connection_string(self, eventhub_name: str | None = None) -> str:
+        """The given connection string, with its ``EntityPath`` replaced by ``eventhub_name`` if given."""
+        if eventhub_name is None:
+            return self.url
+        parts = [part for part in self.url.split(";") if part]
+        entity = f"EntityPath={eventhub_name}"
+        for index, part in enumerate(parts):
+            if part.startswith("EntityPath="):
+                parts[index] = entity
+                break
+        else:
+            parts.append(entity)
+        return ";".join(parts) + ";"
+
+    def __repr__(self) -> str:
+        return "ExternalEventHubs()"
+
+
 class EventHubsPlugin(ContainerPlugin):
 
+    startup_estimate = 30.0
+    resources = ResourceSpec(memory_mb=1024, cpus=1.0)
+
     @property
     def name(self) -> str:
         return "eventhubs"
@@ -116,6 +284,53 @@ class EventHubsPlugin(ContainerPlugin):
     def create_container(self, **kwargs) -> EventHubsContainer:
         return EventHubsContainer(**kwargs)
 
+    def create_external(self, endpoint: str, **kwargs) -> ExternalEventHubs:
+        return ExternalEventHubs(endpoint, async_client=kwargs.get("async_client", False))
+
+    def external_url(self, container: EventHubsContainer) -> str:
+        return container.get_connection_string()
+
+    def get_images(self, **kwargs) -> list[str]:
+        return [kwargs.get("image", DEFAULT_EVENTHUBS_IMAGE), DEFAULT_AZURITE_IMAGE]
+
     def get_client(self, container: EventHubsContainer) -> Any:
-        from azure.eventhub import EventHubProducerClient
-        return EventHubProducerClient.from_connection_string(container.get_connection_string())
+        if not container.async_client:
+            from azure.eventhub import EventHubProducerClient
+
+            return EventHubProducerClient.from_connection_string(container.get_connection_string())
+        from azure.eventhub.aio import EventHubProducerClient
+
+        client = EventHubProducerClient.from_connection_string(container.get_connection_string())
+        _async_client_loops[client] = _running_loop()
+        return client
+
+    def close_client(self, client: Any) -> None:
+        """Close ``client``; aio clients are closed on the loop they were created in.
+
+        If that loop is running on another thread the close is scheduled there
+        and waited for; if it's the current thread's running loop the close is
+        only scheduled, and happens once control returns to the loop. Without
+        a usable loop the client is closed on a fresh one.
+        """
+        if client not in _async_client_loops:
+            super().close_client(client)
+            return
+        loop = _async_client_loops.pop(client)
+        running = _running_loop()
+        if loop is None or loop.is_closed():
+            loop = running
+        if loop is None:
+            asyncio.run(client.close())
+        elif loop is running:
+            loop.create_task(client.close())
+        elif loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.close(), loop).result(CLIENT_CLOSE_TIMEOUT)
+        else:
+            loop.run_until_complete(client.close())
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
@@ -1,3 +1,3 @@
-from gherkin_testcontainers_google_pubsub.plugin import GooglePubSubPlugin
+from gherkin_testcontainers_google_pubsub.plugin import GooglePubSubPlugin, PubSubClient
 
-__all__ = ["GooglePubSubPlugin"]
+__all__ = ["GooglePubSubPlugin", "PubSubClient"]
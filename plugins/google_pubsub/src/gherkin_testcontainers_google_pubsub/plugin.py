@@ -1,18 +1,244 @@
-from typing import Any
+import inspect
+import threading
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Callable, Iterable
 
 from testcontainers.google import PubSubContainer
 
+from gherkin_testcontainers.budget import ResourceSpec
+from gherkin_testcontainers.external import ExternalService
+from gherkin_testcontainers.loadgen import DEFAULT_MESSAGE_SIZE, message_payload
+from gherkin_testcontainers.memory import MemoryService, is_memory_endpoint
 from gherkin_testcontainers.plugin import ContainerPlugin
 
+DEFAULT_PUBSUB_IMAGE = inspect.signature(PubSubContainer).parameters["image"].default
+
+# Publisher defaults tuned for tests that publish many small messages: larger
+# batches and a short linger so bursts go out in few RPCs.
+DEFAULT_BATCH_SETTINGS = {"max_messages": 1000, "max_bytes": 1_000_000, "max_latency": 0.005}
+DEFAULT_PUBLISH_FLOW_CONTROL = {"message_limit": 10_000, "byte_limit": 100_000_000}
+# Publish futures are awaited per chunk so a bulk publish holds a bounded number.
+BULK_PUBLISH_CHUNK_SIZE = 10_000
+PUBLISH_TIMEOUT = 30.0
+
+
+@dataclass
+class PubSubClient:
+    """Publisher and subscriber clients for the emulator, plus bulk helpers."""
+
+    publisher: Any
+    subscriber: Any
+    project: str
+
+    def topic_path(self, topic: str) -> str:
+        return self.publisher.topic_path(self.project, topic)
+
+    def subscription_path(self, subscription: str) -> str:
+        return self.subscriber.subscription_path(self.project, subscription)
+
+    def create_topics(self, *topics: str) -> list[str]:
+        """Create ``topics`` (skipping existing ones) and return their paths."""
+        from google.api_core.exceptions import AlreadyExists
+
+        paths = []
+        for topic in topics:
+            path = self.topic_path(topic)
+            try:
+                self.publisher.create_topic(name=path)
+            except AlreadyExists:
+                pass
+            paths.append(path)
+        return paths
+
+    def create_subscriptions(self, subscriptions: dict[str, str], **kwargs) -> list[str]:
+        """Create subscriptions from a ``{subscription: topic}`` mapping and return their paths.
+
+        Extra ``kwargs`` (e.g. ``enable_message_ordering``) go to every
+        ``create_subscription`` request.
+        """
+        from google.api_core.exceptions import AlreadyExists
+
+        paths = []
+        for subscription, topic in subscriptions.items():
+            path = self.subscription_path(subscription)
+            request = {"name": path, "topic": self.topic_path(topic), **kwargs}
+            try:
+                self.subscriber.create_subscription(request=request)
+            except AlreadyExists:
+                pass
+            paths.append(path)
+        return paths
+
+    def publish(self, topic: str, data: bytes, **attributes: str) -> Any:
+        """Publish one message; returns the publish future."""
+        return self.publisher.publish(self.topic_path(topic), data, **attributes)
+
+    def publish_many(self, topic: str, messages: list[bytes], timeout: float = 30.0) -> list[str]:
+        """Publish ``messages`` through the batching publisher and wait for all message ids."""
+        path = self.topic_path(topic)
+        futures = [self.publisher.publish(path, data) for data in messages]
+        return [future.result(timeout=timeout) for future in futures]
+
+    def collect(self, subscription: str, expected_count: int, timeout: float = 30.0) -> list[Any]:
+        """Streaming-pull from ``subscription`` until ``expected_count`` messages arrive.
+
+        Messages are acked as they arrive. Returns early once the count is
+        reached; otherwise returns whatever arrived before ``timeout``.
+        """
+        received: list[Any] = []
+        lock = threading.Lock()
+        done = threading.Event()
+
+        def callback(message: Any) -> None:
+            message.ack()
+            with lock:
+                received.append(message)
+                if len(received) >= expected_count:
+                    done.set()
+
+        future = self.subscriber.subscribe(self.subscription_path(subscription), callback)
+        try:
+            done.wait(timeout)
+        finally:
+            future.cancel()
+            future.result(timeout=timeout)
+        with lock:
+            return list(received)
+
+    def close(self) -> None:
+        self.publisher.stop()
+        self.subscriber.close()
+
+
+class ExternalPubSub(ExternalService):
+    """An already-running emulator, given as ``host:port``; the project is a kwarg."""
+
+    def __init__(self, url: str, project: str = "test-project") -> None:
+        super().__init__(url)
+        self.project = project
+
+    def get_pubsub_emulator_host(self) -> str:
+        return self.address
+
+    # The client factories only need the emulator host, so reuse them.
+    _get_client = PubSubContainer._get_client
+    get_publisher_client = PubSubContainer.get_publisher_client
+    get_subscriber_client = PubSubContainer.get_subscriber_client
+
+
+class MemoryPubSub(MemoryService):
+    """An in-memory stand-in emulator, for a ``memory://`` endpoint.
+
+    Topics must be created before publishing, and a subscription only
+    receives messages published after it was created, as with the emulator.
+    """
+
+    def __init__(self, url: str, project: str = "test-project") -> None:
+        super().__init__(url)
+        self.project = project
+        self.subscriptions: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def topic_of(self, subscription: str) -> str:
+        from google.api_core.exceptions import NotFound
+
+        with self._lock:
+            topic = self.subscriptions.get(subscription)
+        if topic is None:
+            raise NotFound(f"Subscription does not exist: {subscription}")
+        return topic
+
+    def reset(self) -> None:
+        super().reset()
+        with self._lock:
+            self.subscriptions.clear()
+
+
+def _pop_publisher_settings(kwargs: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "batch_settings": {**DEFAULT_BATCH_SETTINGS, **kwargs.pop("batch_settings", {})},
+        "flow_control": {**DEFAULT_PUBLISH_FLOW_CONTROL, **kwargs.pop("flow_control", {})},
+        "enable_message_ordering": kwargs.pop("enable_message_ordering", False),
+    }
+
 
 class GooglePubSubPlugin(ContainerPlugin):
 
+    startup_estimate = 10.0
+    resources = ResourceSpec(memory_mb=512, cpus=0.5)
+    supports_standin = True
+
     @property
     def name(self) -> str:
         return "google_pubsub"
 
     def create_container(self, **kwargs) -> PubSubContainer:
-        return PubSubContainer(**kwargs)
+        publisher_settings = _pop_publisher_settings(kwargs)
+        container = PubSubContainer(**kwargs)
+        container.publisher_settings = publisher_settings
+        return container
+
+    def create_external(self, endpoint: str, **kwargs) -> ExternalPubSub | MemoryPubSub:
+        publisher_settings = _pop_publisher_settings(kwargs)
+        project = kwargs.get("project", "test-project")
+        if is_memory_endpoint(endpoint):
+            return MemoryPubSub(endpoint, project)
+        service = ExternalPubSub(endpoint, project)
+        service.publisher_settings = publisher_settings
+        return service
+
+    def external_url(self, container: PubSubContainer) -> str:
+        return container.get_pubsub_emulator_host()
+
+    def reset(self, container: PubSubContainer) -> None:
+        # Delete the project's subscriptions, then its topics.
+        project = f"projects/{container.project}"
+        subscriber = container.get_subscriber_client()
+        try:
+            for subscription in subscriber.list_subscriptions(request={"project": project}):
+                subscriber.delete_subscription(request={"subscription": subscription.name})
+        finally:
+            subscriber.close()
+        publisher = container.get_publisher_client()
+        try:
+            for topic in publisher.list_topics(request={"project": project}):
+                publisher.delete_topic(request={"topic": topic.name})
+        finally:
+            publisher.stop()
+
+    def get_images(self, **kwargs) -> list[str]:
+        return [kwargs.get("image", DEFAULT_PUBSUB_IMAGE)]
+
+    def get_client(self, container: PubSubContainer | ExternalPubSub | MemoryPubSub) -> PubSubClient:
+        if isinstance(container, MemoryPubSub):
+            from gherkin_testcontainers_google_pubsub.standin import MemoryPublisher, MemorySubscriber
+            return PubSubClient(MemoryPublisher(container), MemorySubscriber(container), container.project)
+        from google.cloud.pubsub_v1 import types
+
+        settings = container.publisher_settings
+        publisher = container.get_publisher_client(
+            batch_settings=types.BatchSettings(**settings["batch_settings"]),
+            publisher_options=types.PublisherOptions(
+                enable_message_ordering=settings["enable_message_ordering"],
+                flow_control=types.PublishFlowControl(**{
+                    "limit_exceeded_behavior": types.LimitExceededBehavior.BLOCK,
+                    **settings["flow_control"],
+                }),
+            ),
+        )
+        subscriber = container.get_subscriber_client()
+        return PubSubClient(publisher, subscriber, container.project)
+
+    def bulk_publish(self, client: PubSubClient, topic: str, messages: Iterable[bytes]) -> None:
+        messages = iter(messages)
+        while chunk := list(islice(messages, BULK_PUBLISH_CHUNK_SIZE)):
+            client.publish_many(topic, chunk)
+
+    def load_operation(
+        self, client: PubSubClient, target: str, message_size: int = DEFAULT_MESSAGE_SIZE, **options
+    ) -> Callable[[int], Any]:
+        def run(index: int) -> None:
+            client.publish(target, message_payload(index, message_size)).result(timeout=PUBLISH_TIMEOUT)
 
-    def get_client(self, container: PubSubContainer) -> Any:
-        return container.get_publisher()
+        return run
@@ -0,0 +1,247 @@
+"""In-memory stand-ins for the Pub/Sub publisher and subscriber clients.
+
+Used when the plugin is bound to a ``memory://`` endpoint; see
+``gherkin_testcontainers.memory``. The plugin bundles them in a
+``PubSubClient`` like the real clients. Requests may be given as a
+``request`` dict or as keyword arguments, as with the real clients.
+"""
+import itertools
+import logging
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from google.api_core.exceptions import AlreadyExists, NotFound
+
+from gherkin_testcontainers.memory import Record
+from gherkin_testcontainers_google_pubsub.plugin import MemoryPubSub
+
+logger = logging.getLogger(__name__)
+
+# How often a streaming pull checks whether it was cancelled.
+STREAM_POLL_SECONDS = 0.1
+STREAM_BATCH_SIZE = 100
+
+
+def _fields(request: dict[str, Any] | None, kwargs: dict[str, Any]) -> dict[str, Any]:
+    return {**(request or {}), **kwargs}
+
+
+class MemoryPublisher:
+    """Stand-in for ``pubsub_v1.PublisherClient``; ``publish`` returns a completed future."""
+
+    def __init__(self, service: MemoryPubSub) -> None:
+        self.service = service
+
+    @staticmethod
+    def topic_path(project: str, topic: str) -> str:
+        return f"projects/{project}/topics/{topic}"
+
+    def create_topic(self, request: dict[str, Any] | None = None, **kwargs: Any) -> dict[str, Any]:
+        name = _fields(request, kwargs)["name"]
+        if not self.service.log.create(name):
+            raise AlreadyExists(f"Topic already exists: {name}")
+        return {"name": name}
+
+    def delete_topic(self, request: dict[str, Any] | None = None, **kwargs: Any) -> None:
+        self.service.log.delete(_fields(request, kwargs)["topic"])
+
+    def publish(self, topic: str, data: bytes, ordering_key: str = "", **attributes: str) -> Future:
+        if not isinstance(data, bytes):
+            raise TypeError("Data being published to Pub/Sub must be sent as a bytestring.")
+        future: Future = Future()
+        if topic not in self.service.log:
+            future.set_exception(NotFound(f"Topic not found: {topic}"))
+            return future
+        record = self.service.log.append(topic, data, ordering_key, attributes)
+        future.set_result(str(record.offset))
+        return future
+
+    def stop(self) -> None:
+        """Publishes complete immediately; nothing to flush."""
+
+
+@dataclass
+class MemoryPubSubMessage:
+    """The fields and ``ack``/``nack`` of a received Pub/Sub message."""
+
+    record: Record = field(repr=False)
+    subscription: str
+    ack_id: str
+    _settle: Callable[["MemoryPubSubMessage", bool], None] = field(repr=False)
+    acked: bool = False
+
+    @property
+    def data(self) -> bytes:
+        return self.record.value
+
+    @property
+    def attributes(self) -> dict[str, str]:
+        return dict(self.record.headers)
+
+    @property
+    def message_id(self) -> str:
+        return str(self.record.offset)
+
+    @property
+    def ordering_key(self) -> str:
+        return self.record.key or ""
+
+    @property
+    def publish_time(self) -> datetime:
+        return datetime.fromtimestamp(self.record.timestamp, timezone.utc)
+
+    @property
+    def delivery_attempt(self) -> int:
+        return self.record.redeliveries + 1
+
+    @property
+    def size(self) -> int:
+        return len(self.record.value)
+
+    # Received messages expose their payload as ``.message`` in pull responses.
+    @property
+    def message(self) -> "MemoryPubSubMessage":
+        return self
+
+    def ack(self) -> None:
+        self._settle(self, False)
+
+    def nack(self) -> None:
+        self._settle(self, True)
+
+
+@dataclass
+class PullResponse:
+    received_messages: list[MemoryPubSubMessage]
+
+
+class StreamingPullFuture(Future):
+    """Delivers a subscription's messages to a callback on a thread until ``cancel()``."""
+
+    def __init__(self, subscriber: "MemorySubscriber", subscription: str, callback: Callable) -> None:
+        super().__init__()
+        self._subscriber = subscriber
+        self._subscription = subscription
+        self._callback = callback
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="gherkin-testcontainers-pubsub-stream", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            self._stream()
+        except Exception as exc:
+            self.set_exception(exc)
+        else:
+            self.set_result(None)
+
+    def _stream(self) -> None:
+        log = self._subscriber.service.log
+        topic = self._subscriber.service.topic_of(self._subscription)
+        while not self._stopping.is_set():
+            records = log.poll(
+                lambda: log.claim(self._subscription, topic, STREAM_BATCH_SIZE), STREAM_POLL_SECONDS
+            )
+            for index, record in enumerate(records):
+                if self._stopping.is_set():
+                    log.redeliver(self._subscription, records[index:])
+                    break
+                message = self._subscriber._message(self._subscription, record)
+                try:
+                    self._callback(message)
+                except Exception:
+                    logger.warning("Pub/Sub callback failed; redelivering", exc_info=True)
+                    message.nack()
+
+    def cancel(self) -> bool:
+        self._stopping.set()
+        return True
+
+
+class MemorySubscriber:
+    """Stand-in for ``pubsub_v1.SubscriberClient``: streaming and synchronous pull.
+
+    Subscribers of one subscription share it, so each message goes to one
+    of them. ``nack`` (or a zero ack deadline) redelivers at once; there is
+    no ack deadline otherwise, so unacked messages are not redelivered.
+    """
+
+    def __init__(self, service: MemoryPubSub) -> None:
+        self.service = service
+        self._ack_ids = itertools.count()
+        self._outstanding: dict[str, MemoryPubSubMessage] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def subscription_path(project: str, subscription: str) -> str:
+        return f"projects/{project}/subscriptions/{subscription}"
+
+    def create_subscription(self, request: dict[str, Any] | None = None, **kwargs: Any) -> dict[str, Any]:
+        fields = _fields(request, kwargs)
+        name, topic = fields["name"], fields["topic"]
+        if topic not in self.service.log:
+            raise NotFound(f"Topic not found: {topic}")
+        with self.service._lock:
+            if name in self.service.subscriptions:
+                raise AlreadyExists(f"Subscription already exists: {name}")
+            self.service.subscriptions[name] = topic
+        self.service.log.subscribe(name, topic, from_end=True)
+        return {"name": name, "topic": topic}
+
+    def delete_subscription(self, request: dict[str, Any] | None = None, **kwargs: Any) -> None:
+        with self.service._lock:
+            self.service.subscriptions.pop(_fields(request, kwargs)["subscription"], None)
+
+    def _message(self, subscription: str, record: Record) -> MemoryPubSubMessage:
+        message = MemoryPubSubMessage(record, subscription, str(next(self._ack_ids)), self._settle)
+        with self._lock:
+            self._outstanding[message.ack_id] = message
+        return message
+
+    def _settle(self, message: MemoryPubSubMessage, redeliver: bool) -> None:
+        with self._lock:
+            if self._outstanding.pop(message.ack_id, None) is None:
+                return
+        if redeliver:
+            self.service.log.redeliver(message.subscription, [message.record])
+        else:
+            message.acked = True
+
+    def subscribe(self, subscription: str, callback: Callable, **kwargs: Any) -> StreamingPullFuture:
+        self.service.topic_of(subscription)
+        return StreamingPullFuture(self, subscription, callback)
+
+    def pull(self, request: dict[str, Any] | None = None, timeout: float | None = None, **kwargs: Any) -> PullResponse:
+        """Up to ``max_messages`` messages, waiting up to ``timeout`` seconds for the first."""
+        fields = _fields(request, kwargs)
+        subscription = fields["subscription"]
+        topic = self.service.topic_of(subscription)
+        log = self.service.log
+        records = log.poll(
+            lambda: log.claim(subscription, topic, fields.get("max_messages", 1000)), timeout or 0
+        )
+        return PullResponse([self._message(subscription, record) for record in records])
+
+    def acknowledge(self, request: dict[str, Any] | None = None, **kwargs: Any) -> None:
+        self._settle_ids(_fields(request, kwargs)["ack_ids"], redeliver=False)
+
+    def modify_ack_deadline(self, request: dict[str, Any] | None = None, **kwargs: Any) -> None:
+        """A deadline of 0 nacks the messages; other deadlines change nothing here."""
+        fields = _fields(request, kwargs)
+        if fields.get("ack_deadline_seconds") == 0:
+            self._settle_ids(fields["ack_ids"], redeliver=True)
+
+    def _settle_ids(self, ack_ids: list[str], redeliver: bool) -> None:
+        with self._lock:
+            messages = [self._outstanding.get(ack_id) for ack_id in ack_ids]
+        for message in messages:
+            if message is not None:
+                self._settle(message, redeliver)
+
+    def close(self) -> None:
+        """Nothing to disconnect from."""
@@ -1,3 +1,3 @@
-from gherkin_testcontainers_iggy.plugin import IggyPlugin
+from gherkin_testcontainers_iggy.plugin import IggyConnection, IggyPlugin
 
-__all__ = ["IggyPlugin"]
+__all__ = ["IggyConnection", "IggyPlugin"]
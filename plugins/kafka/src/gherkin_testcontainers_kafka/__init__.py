@@ -1,3 +1,3 @@
-from gherkin_testcontainers_kafka.plugin import KafkaPlugin
+from gherkin_testcontainers_kafka.plugin import KafkaPlugin, open_consumer
 
-__all__ = ["KafkaPlugin"]
+__all__ = ["KafkaPlugin", "open_consumer"]
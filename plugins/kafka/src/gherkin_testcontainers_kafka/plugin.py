@@ -1,12 +1,48 @@
-from typing import Any
+import inspect
+import time
+from typing import Any, Callable, Iterable
 
 from testcontainers.kafka import KafkaContainer
 
+from gherkin_testcontainers.budget import ResourceSpec
+from gherkin_testcontainers.external import ExternalService
+from gherkin_testcontainers.loadgen import DEFAULT_MESSAGE_SIZE, message_payload
+from gherkin_testcontainers.memory import MemoryService, is_memory_endpoint
 from gherkin_testcontainers.plugin import ContainerPlugin
 
+DEFAULT_KAFKA_IMAGE = inspect.signature(KafkaContainer).parameters["image"].default
+CLOSE_TIMEOUT = 10.0
+SEND_TIMEOUT = 30.0
+RESET_TIMEOUT = 30.0
+
+
+class ExternalKafka(ExternalService):
+    """An already-running broker, given as ``host:port`` (or ``kafka://host:port``)."""
+
+    def get_bootstrap_server(self) -> str:
+        return self.address
+
+
+def open_consumer(client: Any, *topics: str, **configs: Any) -> Any:
+    """A consumer for the cluster of the injected ``client``, taking ``KafkaConsumer`` configs.
+
+    A ``kafka.KafkaConsumer`` normally, or a ``MemoryKafkaConsumer`` when
+    the plugin runs as an in-memory stand-in, so steps work with both.
+    """
+    from gherkin_testcontainers_kafka.standin import MemoryKafkaProducer
+
+    if isinstance(client, MemoryKafkaProducer):
+        return client.consumer(*topics, **configs)
+    from kafka import KafkaConsumer
+    return KafkaConsumer(*topics, bootstrap_servers=client.config["bootstrap_servers"], **configs)
+
 
 class KafkaPlugin(ContainerPlugin):
 
+    startup_estimate = 15.0
+    resources = ResourceSpec(memory_mb=1024, cpus=1.0)
+    supports_standin = True
+
     @property
     def name(self) -> str:
         return "kafka"
@@ -14,7 +50,63 @@ class KafkaPlugin(ContainerPlugin):
     def create_container(self, **kwargs) -> KafkaContainer:
         return KafkaContainer(**kwargs)
 
-    def get_client(self, container: KafkaContainer) -> Any:
+    def create_external(self, endpoint: str, **kwargs) -> ExternalKafka | MemoryService:
+        if is_memory_endpoint(endpoint):
+            return MemoryService(endpoint)
+        return ExternalKafka(endpoint)
+
+    def external_url(self, container: KafkaContainer) -> str:
+        return container.get_bootstrap_server()
+
+    def reset(self, container: KafkaContainer) -> None:
+        # Drop every consumer group and topic but Kafka's own (``__``), and
+        # wait for the deletions, which the broker completes asynchronously.
+        from kafka import KafkaAdminClient
+
+        admin = KafkaAdminClient(bootstrap_servers=container.get_bootstrap_server())
+        try:
+            groups = [group for group, _ in admin.list_consumer_groups()]
+            if groups:
+                admin.delete_consumer_groups(groups)
+            topics = [topic for topic in admin.list_topics() if not topic.startswith("__")]
+            if topics:
+                admin.delete_topics(topics, timeout_ms=int(RESET_TIMEOUT * 1000))
+            deadline = time.monotonic() + RESET_TIMEOUT
+            while set(topics) & set(admin.list_topics()):
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Kafka topics still exist after {RESET_TIMEOUT}s: {topics}")
+                time.sleep(0.1)
+        finally:
+            admin.close()
+
+    def get_images(self, **kwargs) -> list[str]:
+        return [kwargs.get("image", DEFAULT_KAFKA_IMAGE)]
+
+    def get_client(self, container: KafkaContainer | MemoryService) -> Any:
+        if isinstance(container, MemoryService):
+            from gherkin_testcontainers_kafka.standin import MemoryKafkaProducer
+            return MemoryKafkaProducer(container)
         from kafka import KafkaProducer
         bootstrap_servers = container.get_bootstrap_server()
         return KafkaProducer(bootstrap_servers=bootstrap_servers)
+
+    def bulk_publish(self, client: Any, topic: str, messages: Iterable[bytes]) -> None:
+        # send() only queues; flush() waits for every batch to be acked.
+        errors: list[Exception] = []
+        for message in messages:
+            client.send(topic, value=message).add_errback(errors.append)
+        client.flush()
+        if errors:
+            raise RuntimeError(f"{len(errors)} Kafka send(s) failed: {errors[0]}")
+
+    def load_operation(
+        self, client: Any, target: str, message_size: int = DEFAULT_MESSAGE_SIZE, **options
+    ) -> Callable[[int], Any]:
+        def run(index: int) -> None:
+            client.send(target, value=message_payload(index, message_size)).get(timeout=SEND_TIMEOUT)
+
+        return run
+
+    def close_client(self, client: Any) -> None:
+        # Bound the flush so a broken broker can't hang teardown.
+        client.close(timeout=CLOSE_TIMEOUT)
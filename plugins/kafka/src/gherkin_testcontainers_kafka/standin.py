@@ -0,0 +1,235 @@
+"""In-memory stand-ins for ``kafka.KafkaProducer`` and ``kafka.KafkaConsumer``.
+
+Used when the plugin is bound to a ``memory://`` endpoint; see
+``gherkin_testcontainers.memory``. Every topic has a single partition, 0.
+"""
+from collections import deque
+from typing import Any, Iterable
+
+from kafka.consumer.fetcher import ConsumerRecord
+from kafka.errors import IllegalStateError
+from kafka.future import Future
+from kafka.producer.future import RecordMetadata
+from kafka.structs import TopicPartition
+
+from gherkin_testcontainers.memory import MemoryLog, MemoryService, Record
+
+PARTITION = 0
+
+
+def _build(record_type: Any, values: dict[str, Any]) -> Any:
+    # The fields of these namedtuples differ between kafka-python releases.
+    return record_type(**{name: values.get(name) for name in record_type._fields})
+
+
+def _size(data: bytes | None) -> int:
+    return -1 if data is None else len(data)
+
+
+class SentFuture(Future):
+    """An already-completed send, like the ``FutureRecordMetadata`` of ``send()``."""
+
+    def get(self, timeout: float | None = None) -> RecordMetadata:
+        if self.exception is not None:
+            raise self.exception
+        return self.value
+
+
+class MemoryKafkaProducer:
+    """Stand-in for ``kafka.KafkaProducer`` that appends to a ``MemoryLog``.
+
+    ``send`` stores the record at once and returns a completed future, so
+    ``flush`` has nothing to wait for. ``key_serializer`` and
+    ``value_serializer`` apply as usual; ``config["bootstrap_servers"]`` is
+    the ``memory://`` URL. Open consumers with ``consumer()``.
+    """
+
+    def __init__(self, service: MemoryService, **configs: Any) -> None:
+        self.log = service.log
+        self.config = {
+            "bootstrap_servers": service.url,
+            "key_serializer": None,
+            "value_serializer": None,
+            **configs,
+        }
+        self._closed = False
+
+    def send(
+        self,
+        topic: str,
+        value: Any = None,
+        key: Any = None,
+        headers: list[tuple[str, bytes]] | None = None,
+        partition: int | None = None,
+        timestamp_ms: int | None = None,
+    ) -> SentFuture:
+        if self._closed:
+            raise IllegalStateError("Cannot send after the producer is closed")
+        if key is not None and self.config["key_serializer"]:
+            key = self.config["key_serializer"](key)
+        if value is not None and self.config["value_serializer"]:
+            value = self.config["value_serializer"](value)
+        record = self.log.append(topic, value, key, dict(headers or []))
+        metadata = _build(RecordMetadata, {
+            "topic": topic,
+            "partition": PARTITION,
+            "topic_partition": TopicPartition(topic, PARTITION),
+            "offset": record.offset,
+            "timestamp": timestamp_ms if timestamp_ms is not None else int(record.timestamp * 1000),
+            "log_start_offset": 0,
+            "serialized_key_size": _size(key),
+            "serialized_value_size": _size(value),
+            "serialized_header_size": -1,
+        })
+        return SentFuture().success(metadata)
+
+    def flush(self, timeout: float | None = None) -> None:
+        """Sends complete immediately; nothing to wait for."""
+
+    def partitions_for(self, topic: str) -> set[int]:
+        return {PARTITION}
+
+    def close(self, timeout: float | None = None) -> None:
+        self._closed = True
+
+    def consumer(self, *topics: str, **configs: Any) -> "MemoryKafkaConsumer":
+        """A ``MemoryKafkaConsumer`` on this producer's log, taking ``KafkaConsumer`` configs."""
+        return MemoryKafkaConsumer(*topics, log=self.log, **configs)
+
+
+class MemoryKafkaConsumer:
+    """Stand-in for ``kafka.KafkaConsumer`` that reads a ``MemoryLog``.
+
+    Consumers with the same ``group_id`` share one position per topic, so
+    each record goes to one of them; positions advance as records are
+    fetched, as with auto-commit. Without a group, each consumer reads
+    every record. ``auto_offset_reset`` (``"latest"`` by default, as in
+    kafka-python) places a new position, and iteration stops after
+    ``consumer_timeout_ms`` without a record.
+    """
+
+    def __init__(
+        self,
+        *topics: str,
+        log: MemoryLog,
+        group_id: str | None = None,
+        auto_offset_reset: str = "latest",
+        consumer_timeout_ms: float = float("inf"),
+        key_deserializer: Any = None,
+        value_deserializer: Any = None,
+        **configs: Any,
+    ) -> None:
+        self.log = log
+        self.config = {
+            "group_id": group_id,
+            "auto_offset_reset": auto_offset_reset,
+            "consumer_timeout_ms": consumer_timeout_ms,
+            "key_deserializer": key_deserializer,
+            "value_deserializer": value_deserializer,
+            **configs,
+        }
+        self._positions: dict[str, int] = {}
+        self._topics: list[str] = []
+        self._buffer: deque[ConsumerRecord] = deque()
+        self._closed = False
+        if topics:
+            self.subscribe(topics)
+
+    @property
+    def _group(self) -> str | None:
+        return self.config["group_id"]
+
+    def subscribe(self, topics: Iterable[str] = (), pattern: str | None = None, listener: Any = None) -> None:
+        self._topics = list(topics)
+        from_end = self.config["auto_offset_reset"] == "latest"
+        for topic in self._topics:
+            if self._group is not None:
+                self.log.subscribe(self._group, topic, from_end=from_end)
+            elif topic not in self._positions:
+                self._positions[topic] = self.log.end_offset(topic) if from_end else 0
+
+    def subscription(self) -> set[str]:
+        return set(self._topics)
+
+    def topics(self) -> set[str]:
+        return set(self.log.topics())
+
+    def _fetch(self, max_records: int | None) -> list[ConsumerRecord]:
+        fetched: list[Record] = []
+        for topic in self._topics:
+            remaining = None if max_records is None else max_records - len(fetched)
+            if remaining == 0:
+                break
+            if self._group is not None:
+                records = self.log.claim(self._group, topic, remaining)
+            else:
+                records = self.log.read(topic, self._positions[topic], remaining)
+                self._positions[topic] += len(records)
+            fetched.extend(records)
+        return [self._consumer_record(record) for record in fetched]
+
+    def _consumer_record(self, record: Record) -> ConsumerRecord:
+        key, value = record.key, record.value
+        if key is not None and self.config["key_deserializer"]:
+            key = self.config["key_deserializer"](key)
+        if value is not None and self.config["value_deserializer"]:
+            value = self.config["value_deserializer"](value)
+        return _build(ConsumerRecord, {
+            "topic": record.topic,
+            "partition": PARTITION,
+            "leader_epoch": -1,
+            "offset": record.offset,
+            "timestamp": int(record.timestamp * 1000),
+            "timestamp_type": 0,
+            "key": key,
+            "value": value,
+            "headers": list(record.headers.items()),
+            "serialized_key_size": _size(record.key),
+            "serialized_value_size": _size(record.value),
+            "serialized_header_size": -1,
+        })
+
+    def poll(
+        self, timeout_ms: float = 0, max_records: int | None = None, update_offsets: bool = True
+    ) -> dict[TopicPartition, list[ConsumerRecord]]:
+        """Records by partition, waiting up to ``timeout_ms`` for the first one."""
+        if self._closed:
+            raise IllegalStateError("Consumer is closed")
+        records = self.log.poll(lambda: self._fetch(max_records), timeout_ms / 1000)
+        batches: dict[TopicPartition, list[ConsumerRecord]] = {}
+        for record in records:
+            batches.setdefault(TopicPartition(record.topic, PARTITION), []).append(record)
+        return batches
+
+    def __iter__(self) -> "MemoryKafkaConsumer":
+        return self
+
+    def __next__(self) -> ConsumerRecord:
+        if not self._buffer:
+            timeout_ms = self.config["consumer_timeout_ms"]
+            timeout = None if timeout_ms == float("inf") else timeout_ms / 1000
+            self._buffer.extend(self.log.poll(lambda: self._fetch(None), timeout))
+            if not self._buffer:
+                raise StopIteration
+        return self._buffer.popleft()
+
+    def seek_to_beginning(self, *partitions: TopicPartition) -> None:
+        for topic in [partition.topic for partition in partitions] or self._topics:
+            self._seek(topic, 0)
+
+    def seek_to_end(self, *partitions: TopicPartition) -> None:
+        for topic in [partition.topic for partition in partitions] or self._topics:
+            self._seek(topic, self.log.end_offset(topic))
+
+    def _seek(self, topic: str, offset: int) -> None:
+        self._buffer = deque(record for record in self._buffer if record.topic != topic)
+        if self._group is not None:
+            self.log.seek(self._group, topic, offset)
+        else:
+            self._positions[topic] = offset
+
+    def commit(self, offsets: Any = None) -> None:
+        """Positions are committed as records are fetched; nothing left to do."""
+
+    def close(self, autocommit: bool = True) -> None:
+        self._closed = True
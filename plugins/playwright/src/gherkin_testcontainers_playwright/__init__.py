@@ -1,3 +1,19 @@
-from gherkin_testcontainers_playwright.plugin import PlaywrightPlugin
+from gherkin_testcontainers_playwright.plugin import (
+    AssetCache,
+    AsyncBrowserSession,
+    AsyncPlaywrightClient,
+    BrowserSession,
+    PlaywrightPlugin,
+    StorageStateCache,
+    UserResult,
+)
 
-__all__ = ["PlaywrightPlugin"]
+__all__ = [
+    "AssetCache",
+    "AsyncBrowserSession",
+    "AsyncPlaywrightClient",
+    "BrowserSession",
+    "PlaywrightPlugin",
+    "StorageStateCache",
+    "UserResult",
+]
@@ -1,40 +1,442 @@
+import asyncio
+import atexit
+import concurrent.futures
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Callable
+from urllib.parse import urlsplit
 
+from playwright.async_api import async_playwright
 from playwright.sync_api import sync_playwright
 
+from gherkin_testcontainers.docker_client import SharedDockerClient
 from gherkin_testcontainers.plugin import ContainerPlugin
 
+DEFAULT_STORAGE_STATE_DIR = os.path.join(
+    tempfile.gettempdir(), "gherkin-testcontainers", "storage-state"
+)
+DEFAULT_STORAGE_STATE_TTL = 3600.0
+PLAYWRIGHT_MODES = ("sync", "async")
+HAR_MODES = ("replay", "record")
+# Options applied to the scenario's single BrowserContext, which async mode doesn't have.
+SYNC_ONLY_OPTIONS = ("login", "har_path", "asset_cache_dir", "block_hosts")
+CACHEABLE_RESOURCE_TYPES = frozenset({"script", "stylesheet", "font", "image"})
+# Bodies handed back by route.fetch() are already decoded, so these headers
+# no longer describe them.
+_UNCACHED_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+
+
+class BrowserSession:
+    """Playwright driver and browsers shared by every scenario in the process.
+
+    One browser is kept per (browser type, headless, launch kwargs) and is
+    relaunched if it has crashed or disconnected. Everything is shut down by
+    ``shutdown()``, which runs automatically at interpreter exit.
+    """
+
+    _playwright: Any = None
+    _browsers: dict[str, Any] = {}
+    _atexit_registered: bool = False
+
+    @classmethod
+    def browser(cls, browser_type: str, headless: bool, launch_kwargs: dict[str, Any]) -> Any:
+        key = repr((browser_type, headless, sorted(launch_kwargs.items())))
+        browser = cls._browsers.get(key)
+        if browser is not None and browser.is_connected():
+            return browser
+
+        if cls._playwright is None:
+            cls._playwright = sync_playwright().start()
+            if not cls._atexit_registered:
+                atexit.register(cls.shutdown)
+                cls._atexit_registered = True
+        launcher = getattr(cls._playwright, browser_type)
+        browser = launcher.launch(headless=headless, **launch_kwargs)
+        cls._browsers[key] = browser
+        return browser
+
+    @classmethod
+    def shutdown(cls) -> None:
+        browsers, cls._browsers = cls._browsers, {}
+        for browser in browsers.values():
+            browser.close()
+        if cls._playwright is not None:
+            cls._playwright.stop()
+            cls._playwright = None
+
+
+class AsyncBrowserSession:
+    """Event loop, async Playwright driver and browsers shared by async-mode scenarios.
+
+    The loop runs in a background thread so synchronous behave steps can
+    submit coroutines to it with ``run()``. Browsers are cached and relaunched
+    like ``BrowserSession``'s; ``shutdown()`` runs at interpreter exit.
+    """
+
+    _loop: asyncio.AbstractEventLoop | None = None
+    _thread: threading.Thread | None = None
+    _playwright: Any = None
+    _browsers: dict[str, Any] = {}
+    _atexit_registered: bool = False
+
+    @classmethod
+    def run(cls, coro: Any, timeout: float | None = None) -> Any:
+        """Run ``coro`` on the session loop and wait for its result."""
+        return cls.submit(coro).result(timeout)
+
+    @classmethod
+    def submit(cls, coro: Any) -> concurrent.futures.Future:
+        """Schedule ``coro`` on the session loop; returns its ``concurrent.futures.Future``."""
+        if cls._loop is None:
+            cls._loop = asyncio.new_event_loop()
+            cls._thread = threading.Thread(
+                target=cls._loop.run_forever, name="gherkin-testcontainers-playwright", daemon=True
+            )
+            cls._thread.start()
+            if not cls._atexit_registered:
+                atexit.register(cls.shutdown)
+                cls._atexit_registered = True
+        return asyncio.run_coroutine_threadsafe(coro, cls._loop)
+
+    @classmethod
+    async def browser(cls, browser_type: str, headless: bool, launch_kwargs: dict[str, Any]) -> Any:
+        key = repr((browser_type, headless, sorted(launch_kwargs.items())))
+        browser = cls._browsers.get(key)
+        if browser is not None and browser.is_connected():
+            return browser
+        if cls._playwright is None:
+            cls._playwright = await async_playwright().start()
+        launcher = getattr(cls._playwright, browser_type)
+        browser = await launcher.launch(headless=headless, **launch_kwargs)
+        cls._browsers[key] = browser
+        return browser
+
+    @classmethod
+    async def _close(cls) -> None:
+        browsers, cls._browsers = cls._browsers, {}
+        for browser in browsers.values():
+            await browser.close()
+        if cls._playwright is not None:
+            await cls._playwright.stop()
+            cls._playwright = None
+
+    @classmethod
+    def shutdown(cls) -> None:
+        if cls._loop is None:
+            return
+        loop, thread = cls._loop, cls._thread
+        try:
+            cls.run(cls._close())
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+            cls._loop, cls._thread = None, None
+
+
+@dataclass
+class UserResult:
+    """Outcome of one simulated user in ``AsyncPlaywrightClient.run_users``."""
+
+    user: int
+    result: Any = None
+    error: BaseException | None = None
+    elapsed: float = 0.0
+
+
+class AsyncPlaywrightClient:
+    """Scenario handle on the async session browser for driving pages concurrently.
+
+    Each ``new_page()`` opens its own ``BrowserContext``, so simulated users
+    don't share cookies or storage. All contexts are closed with the scenario.
+    """
+
+    def __init__(self, browser: Any, context_kwargs: dict[str, Any] | None = None) -> None:
+        self.browser = browser
+        self.context_kwargs = context_kwargs or {}
+        self._contexts: list[Any] = []
+
+    @property
+    def async_api(self) -> Any:
+        """The ``playwright.async_api`` module, e.g. for ``expect``."""
+        import playwright.async_api
+        return playwright.async_api
+
+    def run(self, coro: Any, timeout: float | None = None) -> Any:
+        """Run ``coro`` on the session event loop and return its result."""
+        return AsyncBrowserSession.run(coro, timeout)
+
+    async def new_page(self, **context_kwargs) -> Any:
+        context = await self.browser.new_context(**{**self.context_kwargs, **context_kwargs})
+        self._contexts.append(context)
+        return await context.new_page()
+
+    def run_users(
+        self,
+        count: int,
+        user: Callable[[Any, int], Any],
+        timeout: float | None = None,
+    ) -> list[UserResult]:
+        """Run ``await user(page, index)`` for ``count`` users concurrently.
+
+        Every user gets a page in a fresh context. Failures are captured per
+        user rather than cancelling the others.
+        """
+
+        async def run_one(index: int) -> UserResult:
+            outcome = UserResult(user=index)
+            started = time.perf_counter()
+            try:
+                page = await self.new_page()
+                outcome.result = await user(page, index)
+            except Exception as exc:
+                outcome.error = exc
+            finally:
+                outcome.elapsed = time.perf_counter() - started
+            return outcome
+
+        async def run_all() -> list[UserResult]:
+            return list(await asyncio.gather(*(run_one(i) for i in range(count))))
+
+        return self.run(run_all(), timeout)
+
+    def close(self) -> None:
+        contexts, self._contexts = self._contexts, []
+
+        async def close_contexts() -> None:
+            for context in contexts:
+                await context.close()
+
+        if contexts:
+            self.run(close_contexts())
+
+
+@dataclass
+class StorageStateCache:
+    """On-disk cache of a logged-in ``context.storage_state()``.
+
+    The cache file name is derived from ``key`` and, when ``app_image`` is
+    set, the id of that Docker image, so rebuilding the app under test starts
+    from a fresh login. The image id is looked up once per cache. Entries
+    older than ``ttl`` seconds are refreshed.
+    """
+
+    key: str
+    ttl: float = DEFAULT_STORAGE_STATE_TTL
+    directory: str = DEFAULT_STORAGE_STATE_DIR
+    app_image: str | None = None
+    _app_image_id: str | None = field(default=None, init=False, repr=False)
+
+    @property
+    def app_image_id(self) -> str:
+        if self._app_image_id is None:
+            self._app_image_id = _image_id(self.app_image) if self.app_image else ""
+        return self._app_image_id
+
+    @property
+    def path(self) -> str:
+        image_id = self.app_image_id
+        digest = hashlib.sha256(f"{self.key}\0{image_id}".encode()).hexdigest()[:16]
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", self.key)[:64]
+        return os.path.join(self.directory, f"{slug}-{digest}.json")
+
+    def is_fresh(self) -> bool:
+        try:
+            age = time.time() - os.path.getmtime(self.path)
+        except OSError:
+            return False
+        return age < self.ttl
+
+    def ensure(self, browser: Any, login: Callable[[Any], None], context_kwargs: dict[str, Any]) -> str:
+        """Return the cached state file, logging in through ``browser`` first if it's missing or stale."""
+        path = self.path
+        if self.is_fresh():
+            return path
+        os.makedirs(self.directory, exist_ok=True)
+        context = browser.new_context(**context_kwargs)
+        try:
+            login(context.new_page())
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            context.storage_state(path=tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            context.close()
+        return path
+
+    def invalidate(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+@dataclass
+class AssetCache:
+    """Shared on-disk cache for static assets, installed as a context route.
+
+    GET requests for scripts, stylesheets, fonts and images are served from
+    ``directory`` once fetched. Entries are keyed by URL and store the
+    response ETag; each hit sends ``If-None-Match`` and only re-downloads on
+    a change. ``revalidate=False`` serves hits without asking, which is only
+    safe when asset URLs change with their content (hashed bundle names).
+    """
+
+    directory: str
+    revalidate: bool = True
+
+    def handle(self, route: Any) -> None:
+        request = route.request
+        if request.method != "GET" or request.resource_type not in CACHEABLE_RESOURCE_TYPES:
+            route.fallback()
+            return
+
+        body_path, meta_path = self._paths(request.url)
+        meta = self._load_meta(meta_path)
+        if meta is not None and not self.revalidate:
+            route.fulfill(status=meta["status"], headers=meta["headers"], path=body_path)
+            return
+
+        headers = dict(request.headers)
+        if meta is not None and meta.get("etag"):
+            headers["if-none-match"] = meta["etag"]
+        response = route.fetch(headers=headers)
+        if response.status == 304 and meta is not None:
+            route.fulfill(status=meta["status"], headers=meta["headers"], path=body_path)
+            return
+        if response.status == 200:
+            self._store(body_path, meta_path, response)
+        route.fulfill(response=response)
+
+    def _paths(self, url: str) -> tuple[str, str]:
+        digest = hashlib.sha256(url.encode()).hexdigest()
+        base = os.path.join(self.directory, digest[:2], digest)
+        return f"{base}.body", f"{base}.json"
+
+    @staticmethod
+    def _load_meta(meta_path: str) -> dict | None:
+        try:
+            with open(meta_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _store(body_path: str, meta_path: str, response: Any) -> None:
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name.lower() not in _UNCACHED_HEADERS
+        }
+        meta = {"status": response.status, "headers": headers, "etag": headers.get("etag")}
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        suffix = f".{os.getpid()}.tmp"
+        with open(body_path + suffix, "wb") as f:
+            f.write(response.body())
+        with open(meta_path + suffix, "w") as f:
+            json.dump(meta, f)
+        os.replace(body_path + suffix, body_path)
+        os.replace(meta_path + suffix, meta_path)
+
+
+def _host_matcher(patterns: list[str]) -> Callable[[str], bool]:
+    def matches(url: str) -> bool:
+        host = urlsplit(url).hostname or ""
+        return any(fnmatch.fnmatch(host, pattern) for pattern in patterns)
+
+    return matches
+
+
+def _image_id(image: str) -> str:
+    from docker.errors import DockerException
+
+    try:
+        return SharedDockerClient.get().client.images.get(image).id
+    except DockerException:
+        return image
+
 
 @dataclass
 class PlaywrightContainer:
-    """Lightweight stand-in for a DockerContainer — manages a Playwright browser instance."""
+    """Lightweight stand-in for a DockerContainer — an isolated BrowserContext on the session browser."""
 
     browser_type: str = "chromium"
     headless: bool = True
     launch_kwargs: dict[str, Any] = field(default_factory=dict)
+    context_kwargs: dict[str, Any] = field(default_factory=dict)
+    login: Callable[[Any], None] | None = None
+    storage_state: StorageStateCache | None = None
+    har_path: str | None = None
+    har_mode: str = "replay"
+    asset_cache: AssetCache | None = None
+    block_hosts: list[str] = field(default_factory=list)
+    mode: str = "sync"
 
     def __post_init__(self):
-        self._playwright = None
         self._browser = None
+        self._context = None
+        self._async_client = None
 
     def start(self):
-        self._playwright = sync_playwright().start()
-        launcher = getattr(self._playwright, self.browser_type)
-        self._browser = launcher.launch(headless=self.headless, **self.launch_kwargs)
+        if self.mode == "async":
+            browser = AsyncBrowserSession.run(AsyncBrowserSession.browser(
+                self.browser_type, self.headless, self.launch_kwargs
+            ))
+            self._async_client = AsyncPlaywrightClient(browser, self.context_kwargs)
+            return self
+
+        self._browser = BrowserSession.browser(
+            self.browser_type, self.headless, self.launch_kwargs
+        )
+        context_kwargs = dict(self.context_kwargs)
+        if self.login is not None and self.storage_state is not None:
+            context_kwargs["storage_state"] = self.storage_state.ensure(
+                self._browser, self.login, self.context_kwargs
+            )
+        self._context = self._browser.new_context(**context_kwargs)
+        self._install_routes(self._context)
         return self
 
+    def _install_routes(self, context: Any) -> None:
+        # Playwright runs the most recently registered route first and
+        # route.fallback() hands over to the previous one, so register from
+        # lowest to highest priority: asset cache, HAR, blocked hosts.
+        if self.asset_cache is not None:
+            context.route("**/*", self.asset_cache.handle)
+        if self.har_path is not None:
+            if self.har_mode == "record":
+                context.route_from_har(self.har_path, update=True)
+            else:
+                context.route_from_har(self.har_path, not_found="fallback")
+        if self.block_hosts:
+            context.route(_host_matcher(self.block_hosts), lambda route: route.abort())
+
+    def new_page(self):
+        return self._context.new_page()
+
     def stop(self):
-        if self._browser:
-            self._browser.close()
-            self._browser = None
-        if self._playwright:
-            self._playwright.stop()
-            self._playwright = None
+        if self._async_client:
+            self._async_client.close()
+            self._async_client = None
+        if self._context:
+            self._context.close()
+            self._context = None
+        self._browser = None
 
 
 class PlaywrightPlugin(ContainerPlugin):
 
+    startup_estimate = 1.0
+    # The sync Playwright API is bound to the thread that started it.
+    background_start = False
+    max_load_concurrency = 1
+
     @property
     def name(self) -> str:
         return "playwright"
@@ -42,11 +444,86 @@ class PlaywrightPlugin(ContainerPlugin):
     def create_container(self, **kwargs) -> PlaywrightContainer:
         browser_type = kwargs.pop("browser_type", "chromium")
         headless = kwargs.pop("headless", True)
+        mode = kwargs.pop("mode", "sync")
+        if mode not in PLAYWRIGHT_MODES:
+            raise ValueError(f"Unknown mode '{mode}'. Available: {list(PLAYWRIGHT_MODES)}")
+        if mode == "async":
+            unsupported = [option for option in SYNC_ONLY_OPTIONS if kwargs.get(option)]
+            if unsupported:
+                raise ValueError(f"Options {unsupported} are not supported with mode='async'")
+        context_kwargs = kwargs.pop("context_kwargs", {})
+        login = kwargs.pop("login", None)
+        storage_state = None
+        cache_options = {
+            "key": kwargs.pop("storage_state_key", None),
+            "ttl": kwargs.pop("storage_state_ttl", DEFAULT_STORAGE_STATE_TTL),
+            "directory": kwargs.pop("storage_state_dir", DEFAULT_STORAGE_STATE_DIR),
+            "app_image": kwargs.pop("app_image", None),
+        }
+        har_path = kwargs.pop("har_path", None)
+        har_mode = kwargs.pop("har_mode", "replay")
+        if har_mode not in HAR_MODES:
+            raise ValueError(f"Unknown har_mode '{har_mode}'. Available: {list(HAR_MODES)}")
+        asset_cache_dir = kwargs.pop("asset_cache_dir", None)
+        asset_cache_revalidate = kwargs.pop("asset_cache_revalidate", True)
+        asset_cache = None
+        if asset_cache_dir is not None:
+            asset_cache = AssetCache(asset_cache_dir, revalidate=asset_cache_revalidate)
+        block_hosts = list(kwargs.pop("block_hosts", []))
+        if login is not None:
+            if cache_options["key"] is None:
+                cache_options["key"] = f"{login.__module__}.{login.__qualname__}"
+            storage_state = StorageStateCache(**cache_options)
         return PlaywrightContainer(
             browser_type=browser_type,
             headless=headless,
             launch_kwargs=kwargs,
+            context_kwargs=context_kwargs,
+            login=login,
+            storage_state=storage_state,
+            har_path=har_path,
+            har_mode=har_mode,
+            asset_cache=asset_cache,
+            block_hosts=block_hosts,
+            mode=mode,
         )
 
+    def reset(self, container: PlaywrightContainer) -> None:
+        # A fresh browser context drops cookies and storage; the browser stays up.
+        container.stop()
+        container.start()
+
+    def get_images(self, **kwargs) -> list[str]:
+        return []
+
     def get_client(self, container: PlaywrightContainer) -> Any:
-        return container._browser.new_page()
+        if container.mode == "async":
+            return container._async_client
+        return container.new_page()
+
+    def load_operation(self, client: Any, target: str, **options) -> Callable[[int], Any]:
+        if isinstance(client, AsyncPlaywrightClient):
+            return _async_load_operation(client, target, options)
+
+        def run(index: int) -> None:
+            client.goto(target, **options)
+
+        return run
+
+
+def _async_load_operation(client: AsyncPlaywrightClient, target: str, options: dict[str, Any]) -> Callable[[int], Any]:
+    # The pages belong to the session loop, so each goto runs there and the
+    # load's own loop awaits it. Pages are reused: one per concurrent task.
+    idle_pages: list[Any] = []
+
+    async def visit() -> None:
+        page = idle_pages.pop() if idle_pages else await client.new_page()
+        try:
+            await page.goto(target, **options)
+        finally:
+            idle_pages.append(page)
+
+    async def run(index: int) -> None:
+        await asyncio.wrap_future(AsyncBrowserSession.submit(visit()))
+
+    return run
@@ -1,3 +1,3 @@
-from gherkin_testcontainers_pulsar.plugin import PulsarContainer, PulsarPlugin
+from gherkin_testcontainers_pulsar.plugin import PulsarClient, PulsarContainer, PulsarPlugin
 
-__all__ = ["PulsarContainer", "PulsarPlugin"]
+__all__ = ["PulsarClient", "PulsarContainer", "PulsarPlugin"]
@@ -1,21 +1,79 @@
-from typing import Any
+import json
+import threading
+import urllib.request
+from typing import Any, Callable, Iterable
+from urllib.parse import quote
 
 from testcontainers.core.container import DockerContainer
 from testcontainers.core.waiting_utils import wait_for_logs
 
+from gherkin_testcontainers.budget import ResourceSpec
+from gherkin_testcontainers.external import ExternalService
+from gherkin_testcontainers.loadgen import DEFAULT_MESSAGE_SIZE, message_payload
+from gherkin_testcontainers.memory import MemoryService, is_memory_endpoint
 from gherkin_testcontainers.plugin import ContainerPlugin
 
 DEFAULT_PULSAR_IMAGE = "apachepulsar/pulsar:3.0.0"
 PULSAR_BINARY_PORT = 6650
 PULSAR_HTTP_PORT = 8080
 
+PULSAR_PROFILES = ("default", "fast")
+
+# "fast" profile: standalone without the functions worker or stream storage,
+# a small heap, and a BookKeeper tuned for throwaway data (no journal fsync,
+# small caches). Keys prefixed with PULSAR_PREFIX_ are written into
+# conf/standalone.conf by bin/apply-config-from-env.py before startup.
+FAST_PROFILE_COMMAND = (
+    "bash -c 'bin/apply-config-from-env.py conf/standalone.conf"
+    " && exec bin/pulsar standalone -nfw -nss'"
+)
+FAST_PROFILE_ENV = {
+    "PULSAR_MEM": "-Xms128m -Xmx256m -XX:MaxDirectMemorySize=256m",
+    "PULSAR_GC": "-XX:+UseSerialGC",
+    "PULSAR_EXTRA_OPTS": "-XX:TieredStopAtLevel=1",
+    "PULSAR_PREFIX_journalSyncData": "false",
+    "PULSAR_PREFIX_journalMaxGroupWaitMSec": "1",
+    "PULSAR_PREFIX_dbStorage_writeCacheMaxSizeMb": "16",
+    "PULSAR_PREFIX_dbStorage_readAheadCacheMaxSizeMb": "16",
+    "PULSAR_PREFIX_dbStorage_rocksDB_blockCacheSize": "16777216",
+    "PULSAR_PREFIX_managedLedgerCacheSizeMB": "16",
+}
+
+# Left alone by ``reset``: Pulsar's own tenant and namespace.
+SYSTEM_TENANTS = ("pulsar",)
+SYSTEM_NAMESPACES = ("public/functions",)
+ADMIN_TIMEOUT = 30.0
+
+DEFAULT_PRODUCER_SETTINGS = {
+    "batching_enabled": True,
+    "batching_max_publish_delay_ms": 5,
+    "block_if_queue_full": True,
+}
+
 
 class PulsarContainer(DockerContainer):
-    """Testcontainer for Apache Pulsar."""
+    """Testcontainer for Apache Pulsar.
+
+    ``profile="fast"`` trades the functions worker, stream storage and JVM
+    headroom for a quicker, smaller standalone broker.
+    """
 
-    def __init__(self, image: str = DEFAULT_PULSAR_IMAGE, **kwargs) -> None:
+    def __init__(
+        self, image: str = DEFAULT_PULSAR_IMAGE, profile: str = "default", **kwargs
+    ) -> None:
+        if profile not in PULSAR_PROFILES:
+            raise ValueError(
+                f"Unknown Pulsar profile '{profile}'. Available: {list(PULSAR_PROFILES)}"
+            )
         super().__init__(image, **kwargs)
-        self.with_command("bin/pulsar standalone")
+        self.profile = profile
+        self._clients: list["PulsarClient"] = []
+        if profile == "fast":
+            self.with_command(FAST_PROFILE_COMMAND)
+            for key, value in FAST_PROFILE_ENV.items():
+                self.with_env(key, value)
+        else:
+            self.with_command("bin/pulsar standalone")
         self.with_exposed_ports(PULSAR_BINARY_PORT, PULSAR_HTTP_PORT)
 
     def get_broker_url(self) -> str:
@@ -34,8 +92,119 @@ class PulsarContainer(DockerContainer):
         return self
 
 
+class ExternalPulsar(ExternalService):
+    """An already-running broker, given as its ``pulsar://host:port`` service URL."""
+
+    def __init__(self, url: str) -> None:
+        super().__init__(url)
+        self._clients: list["PulsarClient"] = []
+
+    def get_broker_url(self) -> str:
+        return self.url
+
+
+class MemoryPulsar(MemoryService):
+    """An in-memory stand-in broker, for a ``memory://`` endpoint."""
+
+    def __init__(self, url: str) -> None:
+        super().__init__(url)
+        self._clients: list["PulsarClient"] = []
+
+    def get_broker_url(self) -> str:
+        return self.url
+
+
+class PulsarClient:
+    """Wraps a ``pulsar.Client`` and caches its producers and consumers.
+
+    Producers are cached per topic and consumers per (topic, subscription), so
+    steps can call ``producer()`` / ``consumer()`` repeatedly without creating
+    new ones. Producers batch and ``send()`` is asynchronous; call ``flush()``
+    to wait for outstanding messages. Anything not defined here is forwarded
+    to the underlying ``pulsar.Client``.
+    """
+
+    def __init__(self, client: Any, **producer_settings) -> None:
+        self.client = client
+        self._producer_settings = {**DEFAULT_PRODUCER_SETTINGS, **producer_settings}
+        self._producers: dict[str, Any] = {}
+        self._consumers: dict[tuple[str, str], Any] = {}
+        self._send_errors: list[str] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def producer(self, topic: str, **kwargs) -> Any:
+        """Return the cached producer for ``topic``, creating it on first use."""
+        with self._lock:
+            if topic not in self._producers:
+                settings = {**self._producer_settings, **kwargs}
+                self._producers[topic] = self.client.create_producer(topic, **settings)
+            return self._producers[topic]
+
+    def consumer(self, topic: str, subscription: str, **kwargs) -> Any:
+        """Return the cached consumer for (``topic``, ``subscription``).
+
+        New subscriptions start from the earliest message unless an
+        ``initial_position`` is given.
+        """
+        import pulsar
+
+        key = (topic, subscription)
+        with self._lock:
+            if key not in self._consumers:
+                kwargs.setdefault("initial_position", pulsar.InitialPosition.Earliest)
+                self._consumers[key] = self.client.subscribe(topic, subscription, **kwargs)
+            return self._consumers[key]
+
+    def send(self, topic: str, content: bytes, **kwargs) -> None:
+        """Send ``content`` to ``topic`` without waiting for the broker ack."""
+        self.producer(topic).send_async(content, self._on_sent, **kwargs)
+
+    def flush(self) -> None:
+        """Wait for all pending sends; raise if any of them failed."""
+        for producer in list(self._producers.values()):
+            producer.flush()
+        with self._lock:
+            errors, self._send_errors = self._send_errors, []
+        if errors:
+            raise RuntimeError(f"{len(errors)} Pulsar send(s) failed: {errors[0]}")
+
+    def close(self) -> None:
+        """Close all cached producers and consumers, then the client itself."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            for producer in self._producers.values():
+                producer.close()
+            for consumer in self._consumers.values():
+                consumer.close()
+        finally:
+            self._producers.clear()
+            self._consumers.clear()
+            self.client.close()
+
+    def _on_sent(self, result: Any, message_id: Any) -> None:
+        import pulsar
+
+        if result != pulsar.Result.Ok:
+            with self._lock:
+                self._send_errors.append(str(result))
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+
 class PulsarPlugin(ContainerPlugin):
 
+    startup_estimate = 40.0
+    fast_startup_estimate = 15.0
+    resources = ResourceSpec(memory_mb=1536, cpus=1.0)
+    fast_resources = ResourceSpec(memory_mb=512, cpus=0.5)
+    supports_standin = True
+
     @property
     def name(self) -> str:
         return "pulsar"
@@ -43,9 +212,89 @@ class PulsarPlugin(ContainerPlugin):
     def create_container(self, **kwargs) -> PulsarContainer:
         return PulsarContainer(**kwargs)
 
-    def get_client(self, container: PulsarContainer) -> Any:
-        import pulsar
-        return pulsar.Client(container.get_broker_url())
+    def create_external(self, endpoint: str, **kwargs) -> ExternalPulsar | MemoryPulsar:
+        if is_memory_endpoint(endpoint):
+            return MemoryPulsar(endpoint)
+        return ExternalPulsar(endpoint)
+
+    def external_url(self, container: PulsarContainer) -> str:
+        return container.get_broker_url()
+
+    def reset(self, container: PulsarContainer) -> None:
+        # Force-delete every topic, with its subscriptions, outside Pulsar's
+        # own namespaces; consumers start at the earliest message, so a kept
+        # topic would replay the last run's messages.
+        admin = f"{container.get_admin_url()}/admin/v2"
+        for tenant in _admin(f"{admin}/tenants"):
+            if tenant in SYSTEM_TENANTS:
+                continue
+            for namespace in _admin(f"{admin}/namespaces/{tenant}"):
+                if namespace in SYSTEM_NAMESPACES:
+                    continue
+                for domain in ("persistent", "non-persistent"):
+                    topics = f"{admin}/{domain}/{namespace}"
+                    # Partitioned topics first, which deletes their partitions too.
+                    for name in _user_topics(_admin(f"{topics}/partitioned")):
+                        _admin(f"{topics}/{name}/partitions?force=true", "DELETE")
+                    for name in _user_topics(_admin(topics)):
+                        _admin(f"{topics}/{name}?force=true", "DELETE")
+
+    def get_images(self, **kwargs) -> list[str]:
+        return [kwargs.get("image", DEFAULT_PULSAR_IMAGE)]
+
+    def estimate_startup(self, **kwargs) -> float:
+        if kwargs.get("profile") == "fast":
+            return self.fast_startup_estimate
+        return self.startup_estimate
+
+    def get_resources(self, **kwargs) -> ResourceSpec:
+        if kwargs.get("profile") == "fast":
+            return self.fast_resources
+        return self.resources
+
+    def get_client(self, container: PulsarContainer | ExternalPulsar | MemoryPulsar) -> PulsarClient:
+        if isinstance(container, MemoryPulsar):
+            from gherkin_testcontainers_pulsar.standin import MemoryPulsarClient
+            client = PulsarClient(MemoryPulsarClient(container))
+        else:
+            import pulsar
+            client = PulsarClient(pulsar.Client(container.get_broker_url()))
+        container._clients.append(client)
+        return client
+
+    def bulk_publish(self, client: PulsarClient, topic: str, messages: Iterable[bytes]) -> None:
+        for message in messages:
+            client.send(topic, message)
+        client.flush()
+
+    def load_operation(
+        self, client: PulsarClient, target: str, message_size: int = DEFAULT_MESSAGE_SIZE, **options
+    ) -> Callable[[int], Any]:
+        # A producer of its own, unbatched: a blocking send on the cached
+        # batching producer would also wait out the batch delay. The client
+        # closes it with the others.
+        producer = client.client.create_producer(target, batching_enabled=False, block_if_queue_full=True)
+
+        def run(index: int) -> None:
+            # Blocking send: returns once the broker has persisted the message.
+            producer.send(message_payload(index, message_size))
+
+        return run
+
+    def on_stop(self, container: PulsarContainer | ExternalPulsar | MemoryPulsar) -> None:
+        clients, container._clients = container._clients, []
+        for client in clients:
+            client.close()
+
+
+def _admin(url: str, method: str = "GET") -> Any:
+    request = urllib.request.Request(url, method=method)
+    with urllib.request.urlopen(request, timeout=ADMIN_TIMEOUT) as response:
+        body = response.read()
+    return json.loads(body) if body else None
+
 
-    def on_stop(self, container: PulsarContainer) -> None:
-        pass
+def _user_topics(topics: list[str]) -> list[str]:
+    # Local names, URL-quoted, of full topic names; system topics start with "__".
+    names = (topic.rsplit("/", 1)[-1] for topic in topics)
+    return [quote(name, safe="") for name in names if not name.startswith("__")]
@@ -0,0 +1,167 @@
+"""In-memory stand-in for ``pulsar.Client`` and its producers and consumers.
+
+Used when the plugin is bound to a ``memory://`` endpoint; see
+``gherkin_testcontainers.memory``. The plugin wraps it in ``PulsarClient``
+like the real client.
+"""
+from typing import Any, Callable
+
+import pulsar
+
+from gherkin_testcontainers.memory import MemoryLog, MemoryService, Record
+
+
+class MemoryMessage:
+    """The accessors of ``pulsar.Message`` over a stored record."""
+
+    def __init__(self, record: Record) -> None:
+        self.record = record
+
+    def data(self) -> bytes:
+        return self.record.value
+
+    def value(self) -> bytes:
+        return self.record.value
+
+    def properties(self) -> dict[str, str]:
+        return dict(self.record.headers.get("properties", {}))
+
+    def partition_key(self) -> str:
+        return self.record.key or ""
+
+    def ordering_key(self) -> str:
+        return self.record.headers.get("ordering_key") or ""
+
+    def message_id(self) -> pulsar.MessageId:
+        return pulsar.MessageId(-1, 0, self.record.offset, -1)
+
+    def topic_name(self) -> str:
+        return self.record.topic
+
+    def publish_timestamp(self) -> int:
+        return int(self.record.timestamp * 1000)
+
+    def event_timestamp(self) -> int:
+        return self.record.headers.get("event_timestamp") or 0
+
+    def redelivery_count(self) -> int:
+        return self.record.redeliveries
+
+    def __repr__(self) -> str:
+        return f"MemoryMessage({self.record.topic}, offset={self.record.offset})"
+
+
+class MemoryProducer:
+    """Stand-in for ``pulsar.Producer``; every send is persisted before it returns."""
+
+    def __init__(self, log: MemoryLog, topic: str, **settings: Any) -> None:
+        self.log = log
+        self._topic = topic
+        self._closed = False
+
+    def topic(self) -> str:
+        return self._topic
+
+    def send(
+        self,
+        content: bytes,
+        properties: dict[str, str] | None = None,
+        partition_key: str | None = None,
+        ordering_key: str | None = None,
+        event_timestamp: int | None = None,
+        **kwargs: Any,
+    ) -> pulsar.MessageId:
+        if self._closed:
+            raise pulsar.AlreadyClosed("Producer is closed")
+        headers = {
+            "properties": dict(properties or {}),
+            "ordering_key": ordering_key,
+            "event_timestamp": event_timestamp,
+        }
+        record = self.log.append(self._topic, content, partition_key, headers)
+        return MemoryMessage(record).message_id()
+
+    def send_async(self, content: bytes, callback: Callable[[Any, Any], None], **kwargs: Any) -> None:
+        message_id = self.send(content, **kwargs)
+        callback(pulsar.Result.Ok, message_id)
+
+    def flush(self) -> None:
+        """Sends complete immediately; nothing to wait for."""
+
+    def close(self) -> None:
+        self._closed = True
+
+
+class MemoryConsumer:
+    """Stand-in for ``pulsar.Consumer`` on a subscription's shared cursor.
+
+    Consumers of one subscription share it, as with a ``Shared``
+    subscription: each message goes to one of them. ``negative_acknowledge``
+    redelivers at once; acknowledgements are only recorded.
+    """
+
+    def __init__(self, log: MemoryLog, topic: str, subscription: str) -> None:
+        self.log = log
+        self._topic = topic
+        self._subscription = subscription
+        self.acknowledged: list[MemoryMessage] = []
+        self._closed = False
+
+    def topic(self) -> str:
+        return self._topic
+
+    def subscription_name(self) -> str:
+        return self._subscription
+
+    def receive(self, timeout_millis: int | None = None) -> MemoryMessage:
+        """The next message; raises ``pulsar.Timeout`` after ``timeout_millis`` (None waits forever)."""
+        if self._closed:
+            raise pulsar.AlreadyClosed("Consumer is closed")
+        timeout = None if timeout_millis is None else timeout_millis / 1000
+        records = self.log.poll(lambda: self.log.claim(self._subscription, self._topic, 1), timeout)
+        if not records:
+            raise pulsar.Timeout("Timed out waiting for a message")
+        return MemoryMessage(records[0])
+
+    def acknowledge(self, message: MemoryMessage) -> None:
+        self.acknowledged.append(message)
+
+    def acknowledge_cumulative(self, message: MemoryMessage) -> None:
+        self.acknowledged.append(message)
+
+    def negative_acknowledge(self, message: MemoryMessage) -> None:
+        self.log.redeliver(self._subscription, [message.record])
+
+    def seek(self, message_id: Any) -> None:
+        self.log.seek(self._subscription, self._topic, message_id.entry_id())
+
+    def unsubscribe(self) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._closed = True
+
+
+class MemoryPulsarClient:
+    """Stand-in for ``pulsar.Client`` backed by a ``MemoryService``'s log."""
+
+    def __init__(self, service: MemoryService) -> None:
+        self.log = service.log
+        self.service_url = service.url
+
+    def create_producer(self, topic: str, **settings: Any) -> MemoryProducer:
+        return MemoryProducer(self.log, topic, **settings)
+
+    def subscribe(
+        self,
+        topic: str,
+        subscription_name: str,
+        initial_position: Any = pulsar.InitialPosition.Latest,
+        **kwargs: Any,
+    ) -> MemoryConsumer:
+        from_end = initial_position == pulsar.InitialPosition.Latest
+        self.log.subscribe(subscription_name, topic, from_end=from_end)
+        return MemoryConsumer(self.log, topic, subscription_name)
+
+    def close(self) -> None:
+        """Nothing to disconnect from."""
@@ -1,8 +1,10 @@
+import os
 import sqlite3
 import tempfile
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Callable, Iterable
 
+from gherkin_testcontainers.external import ExternalService
 from gherkin_testcontainers.plugin import ContainerPlugin
 
 
@@ -17,13 +19,17 @@ class SqliteContainer:
         return self
 
     def stop(self):
-        import os
         if self.db_path and os.path.exists(self.db_path):
             os.remove(self.db_path)
 
 
 class SqlitePlugin(ContainerPlugin):
 
+    startup_estimate = 0.0
+    # sqlite3 connections refuse use from threads other than their creator.
+    background_start = False
+    max_load_concurrency = 1
+
     @property
     def name(self) -> str:
         return "sqlite"
@@ -31,5 +37,39 @@ class SqlitePlugin(ContainerPlugin):
     def create_container(self, **kwargs) -> SqliteContainer:
         return SqliteContainer(**kwargs)
 
+    def create_external(self, endpoint: str, **kwargs) -> ExternalService:
+        # An existing database file; unlike a temp one it's left in place.
+        service = ExternalService(endpoint)
+        service.db_path = endpoint
+        return service
+
+    def reset(self, container: SqliteContainer) -> None:
+        # The client is closed by now; the next one starts an empty file.
+        if os.path.exists(container.db_path):
+            os.remove(container.db_path)
+
+    def get_images(self, **kwargs) -> list[str]:
+        return []
+
     def get_client(self, container: SqliteContainer) -> Any:
         return sqlite3.connect(container.db_path)
+
+    def bulk_load(self, client: Any, table: str, columns: list[str], rows: Iterable[tuple]) -> None:
+        # One transaction for the whole load; executemany pulls rows lazily.
+        quoted = ", ".join(_quote(column) for column in columns)
+        placeholders = ", ".join("?" for _ in columns)
+        with client:
+            client.executemany(
+                f"INSERT INTO {_quote(table)} ({quoted}) VALUES ({placeholders})", rows
+            )
+
+    def load_operation(self, client: Any, target: str, **options) -> Callable[[int], Any]:
+        def run(index: int) -> None:
+            client.execute(target).fetchall()
+            client.commit()
+
+        return run
+
+
+def _quote(identifier: str) -> str:
+    return ".".join('"' + part.replace('"', '""') + '"' for part in identifier.split("."))
@@ -3,6 +3,9 @@ from gherkin_testcontainers.registry import PluginRegistry
 from gherkin_testcontainers.manager import ContainerManager
 from gherkin_testcontainers.decorators import use_container
 from gherkin_testcontainers.hooks import setup_hooks
+from gherkin_testcontainers.lazy import LazyClient, resolve
+from gherkin_testcontainers.budget import HostBudget, ResourceSpec
+from gherkin_testcontainers.external import ExternalService
 
 __all__ = [
     "ContainerPlugin",
@@ -10,4 +13,9 @@ __all__ = [
     "ContainerManager",
     "use_container",
     "setup_hooks",
+    "LazyClient",
+    "resolve",
+    "HostBudget",
+    "ResourceSpec",
+    "ExternalService",
 ]
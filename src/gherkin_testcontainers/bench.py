@@ -0,0 +1,233 @@
+"""Repeat scenarios against warm containers and measure how long they and their steps take.
+
+``run_bench`` runs ``behave`` in-process ``warmup + repeat`` times inside
+``hold_containers()``, so containers start during the first run and are
+reused by every later one, after their plugin's ``reset`` hook cleaned
+them. The warmup runs are discarded; for the others,
+the duration of every passing scenario and of each of its steps (background
+included) is collected and summarised as mean/p50/p95/p99. ``compare``
+checks such a result against a stored baseline.
+"""
+import logging
+import math
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from gherkin_testcontainers.hooks import hold_containers
+from gherkin_testcontainers.registry import PluginRegistry
+from gherkin_testcontainers.scan import ScenarioScan, load_features, scan_features
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPEAT = 10
+DEFAULT_WARMUP = 1
+DEFAULT_THRESHOLD = 0.10
+# Below this, a relative change is timer noise rather than a regression.
+DEFAULT_MIN_DELTA_MS = 1.0
+# p99 is left out: with fewer than 100 repeats it is just the slowest run.
+COMPARED_STATS = ("mean_ms", "p50_ms", "p95_ms")
+
+
+def distribution(samples: Iterable[float]) -> dict[str, float]:
+    """Count plus mean, nearest-rank p50/p95/p99, min and max of ``samples`` (seconds), in ms."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {"count": 0}
+
+    def percentile(percent: float) -> float:
+        rank = max(math.ceil(len(ordered) * percent / 100.0), 1)
+        return ordered[rank - 1] * 1000
+
+    return {
+        "count": len(ordered),
+        "mean_ms": sum(ordered) / len(ordered) * 1000,
+        "p50_ms": percentile(50),
+        "p95_ms": percentile(95),
+        "p99_ms": percentile(99),
+        "min_ms": ordered[0] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+@dataclass
+class _ScenarioTimings:
+    name: str
+    durations: list[float] = field(default_factory=list)
+    failures: int = 0
+    steps: list[tuple[str, list[float]]] = field(default_factory=list)
+
+    def add(self, scenario: Any) -> None:
+        if scenario.status.name != "passed":
+            self.failures += 1
+            return
+        self.durations.append(scenario.duration)
+        for index, step in enumerate(scenario.all_steps):
+            if index == len(self.steps):
+                self.steps.append((f"{step.keyword} {step.name}", []))
+            self.steps[index][1].append(step.duration)
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "failures": self.failures,
+            **distribution(self.durations),
+            "steps": [{"step": text, **distribution(samples)} for text, samples in self.steps],
+        }
+
+
+def _run_behave(command_args: list[str]) -> tuple[bool, list]:
+    from behave.configuration import Configuration
+    from behave.runner import Runner
+
+    runner = Runner(Configuration(command_args=command_args))
+    failed = runner.run()
+    return failed, runner.features
+
+
+def unresettable_plugins(scans: Iterable[ScenarioScan]) -> list[str]:
+    """Plugins ``scans`` start containers of that can't be cleaned between runs (no ``reset`` hook).
+
+    Requests bound to an endpoint are skipped: in-memory stand-ins are
+    reset, and other services aren't ours to clean.
+    """
+    names: list[str] = []
+    for scan in scans:
+        for request in scan.requests:
+            try:
+                plugin = PluginRegistry.get(request.plugin_name)
+            except KeyError:
+                continue
+            if plugin.get_endpoint(**request.kwargs) is None and not plugin.can_reset:
+                if request.plugin_name not in names:
+                    names.append(request.plugin_name)
+    return names
+
+
+def _check_resettable(paths: list[str], tags: list[str], names: list[str]) -> None:
+    features, tag_expression, step_registry = load_features(paths, tags)
+    scans = scan_features(features, tag_expression, step_registry)
+    if names:
+        # Selected as ``behave --name`` does.
+        name_re = re.compile("|".join(names))
+        scans = [scan for scan in scans if name_re.search(scan.scenario.name)]
+    unresettable = unresettable_plugins(scans)
+    if unresettable:
+        raise ValueError(
+            f"Can't bench scenarios that use {', '.join(unresettable)}: without a reset hook, each"
+            " run would see what the previous one left behind. Bind them to a service"
+            " (GTC_<PLUGIN>_URL) or an in-memory stand-in (GTC_STANDINS) instead."
+        )
+
+
+def run_bench(
+    paths: Iterable[str] = (),
+    tags: Iterable[str] = (),
+    names: Iterable[str] = (),
+    repeat: int = DEFAULT_REPEAT,
+    warmup: int = DEFAULT_WARMUP,
+) -> dict[str, Any]:
+    """Run the selected scenarios ``warmup + repeat`` times and summarise the last ``repeat``.
+
+    ``tags`` and ``names`` select scenarios as ``behave --tags`` and
+    ``--name`` do. Returns a JSON-ready dict: the wall time of each run
+    under ``"run"``, the number of runs with a failure under
+    ``"failed_runs"``, and per scenario (keyed by location) its own and its
+    steps' timings. Scenarios that didn't pass in a run are counted under
+    ``"failures"`` and left out of that run's timings.
+
+    Raises ``ValueError`` before running anything if a selected scenario
+    needs a container its plugin can't reset (see ``unresettable_plugins``).
+    """
+    if repeat < 1:
+        raise ValueError("repeat must be at least 1")
+    if warmup < 0:
+        raise ValueError("warmup can't be negative")
+    paths, tags, names = list(paths), list(tags), list(names)
+    _check_resettable(paths, tags, names)
+    command_args = [
+        *paths,
+        *(f"--tags={tag}" for tag in tags),
+        *(f"--name={name}" for name in names),
+        "--format=null",
+        "--no-summary",
+    ]
+    scenarios: dict[str, _ScenarioTimings] = {}
+    run_seconds = []
+    failed_runs = 0
+    with hold_containers():
+        for iteration in range(warmup + repeat):
+            started = time.monotonic()
+            failed, features = _run_behave(command_args)
+            seconds = time.monotonic() - started
+            measured = iteration >= warmup
+            logger.info(
+                "%s run %d/%d: %.3fs%s",
+                "Measured" if measured else "Warmup",
+                iteration - warmup + 1 if measured else iteration + 1,
+                repeat if measured else warmup,
+                seconds,
+                " (failed)" if failed else "",
+            )
+            if not measured:
+                continue
+            run_seconds.append(seconds)
+            failed_runs += bool(failed)
+            for feature in features:
+                for scenario in feature.walk_scenarios():
+                    if scenario.status.name in ("skipped", "untested"):
+                        continue
+                    location = str(scenario.location)
+                    timings = scenarios.setdefault(location, _ScenarioTimings(scenario.name))
+                    timings.add(scenario)
+    return {
+        "repeat": repeat,
+        "warmup": warmup,
+        "failed_runs": failed_runs,
+        "run": distribution(run_seconds),
+        "scenarios": {location: timings.summary() for location, timings in scenarios.items()},
+    }
+
+
+def _changes(
+    label: dict[str, Any], current: dict[str, Any], baseline: dict[str, Any],
+    threshold: float, min_delta_ms: float,
+) -> list[dict[str, Any]]:
+    changes = []
+    for stat in COMPARED_STATS:
+        before, after = baseline.get(stat), current.get(stat)
+        if not before or after is None:
+            continue
+        change = (after - before) / before
+        if change > threshold and after - before >= min_delta_ms:
+            changes.append({**label, "stat": stat, "baseline": before, "current": after, "change": change})
+    return changes
+
+
+def compare(
+    result: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+) -> list[dict[str, Any]]:
+    """Regressions of ``result`` against ``baseline`` (both from ``run_bench``).
+
+    A scenario or step regresses when its mean, p50 or p95 grew by more
+    than ``threshold`` (a fraction) and by at least ``min_delta_ms``. Steps
+    are matched by position and text; scenarios or steps missing from
+    either side are skipped.
+    """
+    regressions = []
+    for location, scenario in result["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(location)
+        if before is None:
+            continue
+        label = {"scenario": location, "step": None}
+        regressions.extend(_changes(label, scenario, before, threshold, min_delta_ms))
+        for step, step_before in zip(scenario["steps"], before.get("steps", [])):
+            if step["step"] != step_before.get("step"):
+                continue
+            label = {"scenario": location, "step": step["step"]}
+            regressions.extend(_changes(label, step, step_before, threshold, min_delta_ms))
+    return regressions
@@ -0,0 +1,189 @@
+import json
+import os
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+DEFAULT_BUDGET_FILE = os.path.join(tempfile.gettempdir(), "gherkin-testcontainers-budget.json")
+POLL_INTERVAL = 0.5
+# Longest a container start waits for the budget before failing.
+DEFAULT_ACQUIRE_TIMEOUT = 900.0
+
+
+@dataclass(frozen=True)
+class ResourceSpec:
+    """Host resources a container is expected to use.
+
+    ``memory_mb`` and ``cpus`` are what the budget reserves. With
+    ``enforce=True`` they're also applied to the container as Docker's
+    ``mem_limit`` and ``nano_cpus``, so it can't use more than it reserved.
+    """
+
+    memory_mb: int = 0
+    cpus: float = 0.0
+    enforce: bool = False
+
+    @property
+    def is_empty(self) -> bool:
+        return self.memory_mb <= 0 and self.cpus <= 0
+
+    def docker_limits(self) -> dict[str, Any]:
+        limits: dict[str, Any] = {}
+        if self.memory_mb > 0:
+            limits["mem_limit"] = f"{self.memory_mb}m"
+        if self.cpus > 0:
+            limits["nano_cpus"] = int(self.cpus * 1_000_000_000)
+        return limits
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class HostBudget:
+    """Memory/CPU budget shared by every worker process on the host.
+
+    Reservations live in a JSON file guarded by an exclusive ``flock``, so
+    separate behave processes pointed at the same ``path`` admit container
+    starts against one budget. Reservations and queued requests of
+    processes that died are dropped.
+
+    ``acquire`` queues its request in the same file and requests are
+    admitted in arrival order, so a large start isn't starved by a stream of
+    smaller ones. A request that doesn't fit is still admitted when every
+    current reservation belongs to the requesting process (it would
+    otherwise wait on itself, e.g. two containers of one scenario that
+    together exceed the budget) or when nothing is reserved at all.
+    """
+
+    def __init__(self, memory_mb: int, cpus: float, path: str = DEFAULT_BUDGET_FILE) -> None:
+        self.memory_mb = memory_mb
+        self.cpus = cpus
+        self.path = path
+
+    @classmethod
+    def from_env(cls) -> "HostBudget | None":
+        """Build a budget from ``GTC_HOST_MEMORY_MB`` / ``GTC_HOST_CPUS`` / ``GTC_BUDGET_FILE``.
+
+        Returns None (no admission control) unless ``GTC_HOST_MEMORY_MB`` is set.
+        """
+        memory_mb = os.environ.get("GTC_HOST_MEMORY_MB")
+        if not memory_mb:
+            return None
+        cpus = float(os.environ.get("GTC_HOST_CPUS") or os.cpu_count() or 1)
+        return cls(int(memory_mb), cpus, os.environ.get("GTC_BUDGET_FILE", DEFAULT_BUDGET_FILE))
+
+    def _update(self, change) -> Any:
+        """Run ``change(reservations, queue)`` on the file's state under the lock and save it."""
+        import fcntl
+
+        with open(self.path, "a+", encoding="utf-8") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                handle.seek(0)
+                text = handle.read()
+                state = json.loads(text) if text.strip() else {}
+                reservations = {
+                    token: entry for token, entry in state.get("reservations", {}).items()
+                    if _pid_alive(entry["pid"])
+                }
+                queue = [entry for entry in state.get("queue", []) if _pid_alive(entry["pid"])]
+                result = change(reservations, queue)
+                handle.seek(0)
+                handle.truncate()
+                json.dump({"reservations": reservations, "queue": queue}, handle)
+                handle.flush()
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+        return result
+
+    def usage(self) -> tuple[int, float]:
+        """Currently reserved ``(memory_mb, cpus)`` across all processes."""
+
+        def total(reservations: dict, queue: list) -> tuple[int, float]:
+            return (
+                sum(entry["memory_mb"] for entry in reservations.values()),
+                sum(entry["cpus"] for entry in reservations.values()),
+            )
+
+        return self._update(total)
+
+    def _admits(self, reservations: dict, spec: ResourceSpec) -> bool:
+        memory = sum(entry["memory_mb"] for entry in reservations.values())
+        cpus = sum(entry["cpus"] for entry in reservations.values())
+        fits = memory + spec.memory_mb <= self.memory_mb and cpus + spec.cpus <= self.cpus
+        pid = os.getpid()
+        return fits or all(entry["pid"] == pid for entry in reservations.values())
+
+    def _reserve(self, reservations: dict, spec: ResourceSpec, label: str) -> str:
+        token = uuid.uuid4().hex
+        reservations[token] = {
+            "pid": os.getpid(),
+            "label": label,
+            "memory_mb": spec.memory_mb,
+            "cpus": spec.cpus,
+        }
+        return token
+
+    def try_acquire(self, spec: ResourceSpec, label: str = "") -> str | None:
+        """Reserve ``spec`` if it's admitted now and nobody is queued; returns a token for ``release`` or None."""
+
+        def reserve(reservations: dict, queue: list) -> str | None:
+            if queue or not self._admits(reservations, spec):
+                return None
+            return self._reserve(reservations, spec, label)
+
+        return self._update(reserve)
+
+    def acquire(
+        self, spec: ResourceSpec, label: str = "", timeout: float | None = DEFAULT_ACQUIRE_TIMEOUT
+    ) -> str:
+        """Queue for ``spec``, wait until it's admitted, reserve it and return a token.
+
+        Raises TimeoutError, naming what holds the budget, if it isn't
+        admitted within ``timeout`` seconds (None waits forever).
+        """
+        ticket = uuid.uuid4().hex
+        self._update(lambda reservations, queue: queue.append({"ticket": ticket, "pid": os.getpid()}))
+
+        def reserve_at_head(reservations: dict, queue: list) -> str | None:
+            if queue[0]["ticket"] != ticket or not self._admits(reservations, spec):
+                return None
+            queue.pop(0)
+            return self._reserve(reservations, spec, label)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while True:
+                token = self._update(reserve_at_head)
+                if token is not None:
+                    return token
+                if deadline is not None and time.monotonic() >= deadline:
+                    holders = self._update(lambda reservations, queue: [
+                        f"{entry['label'] or 'container'} ({entry['memory_mb']} MB, pid {entry['pid']})"
+                        for entry in reservations.values()
+                    ])
+                    raise TimeoutError(
+                        f"Timed out after {timeout:g}s waiting for {spec.memory_mb} MB /"
+                        f" {spec.cpus} CPUs for {label or 'container'} within the host budget"
+                        f" of {self.memory_mb} MB / {self.cpus} CPUs; reserved by:"
+                        f" {', '.join(holders) or 'nothing (queued behind other requests)'}"
+                    )
+                time.sleep(POLL_INTERVAL)
+        finally:
+            # Admitted, timed out or interrupted: leave the queue either way.
+            def dequeue(reservations: dict, queue: list) -> None:
+                queue[:] = [entry for entry in queue if entry["ticket"] != ticket]
+
+            self._update(dequeue)
+
+    def release(self, token: str) -> None:
+        self._update(lambda reservations, queue: reservations.pop(token, None))
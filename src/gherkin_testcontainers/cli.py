@@ -0,0 +1,177 @@
+import argparse
+import json
+import logging
+import sys
+
+from gherkin_testcontainers.bench import (
+    DEFAULT_MIN_DELTA_MS,
+    DEFAULT_REPEAT,
+    DEFAULT_THRESHOLD,
+    DEFAULT_WARMUP,
+    compare,
+    run_bench,
+)
+from gherkin_testcontainers.daemon import DEFAULT_TTL, BrokerClient, serve
+from gherkin_testcontainers.plan import build_plan, format_plan
+from gherkin_testcontainers.prepull import DEFAULT_PULL_WORKERS, prepull_images
+from gherkin_testcontainers.runner import PLAN_RUNNER
+from gherkin_testcontainers.scan import load_features, resolve_images, scan_features
+
+
+def _add_selection_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("paths", nargs="*", help="Feature files or directories (default: features)")
+    parser.add_argument(
+        "-t", "--tags", action="append", default=[],
+        help="Tag expression selecting scenarios, as for behave (repeatable)",
+    )
+
+
+def _prepull(args: argparse.Namespace) -> int:
+    features, tag_expression, step_registry = load_features(args.paths, args.tags)
+    images = resolve_images(scan_features(features, tag_expression, step_registry))
+    if args.dry_run:
+        for image, plugins in sorted(images.items()):
+            print(f"{image}  ({', '.join(plugins)})")
+        return 0
+    outcomes = prepull_images(images, max_workers=args.workers)
+    failed = [image for image, outcome in outcomes.items() if outcome.startswith("failed")]
+    return 1 if failed else 0
+
+
+def _plan(args: argparse.Namespace) -> int:
+    features, tag_expression, step_registry = load_features(args.paths, args.tags)
+    plan = build_plan(scan_features(features, tag_expression, step_registry))
+    print(format_plan(plan, verbose=args.verbose))
+    if args.order_file:
+        with open(args.order_file, "w", encoding="utf-8") as handle:
+            handle.writelines(f"{scan.location}\n" for scan in plan.reordered)
+        print(
+            f"\nRun list written to {args.order_file}; run it with:"
+            f" behave --runner={PLAN_RUNNER} @{args.order_file}"
+        )
+    return 0
+
+
+def _daemon(args: argparse.Namespace) -> int:
+    if args.status:
+        print(json.dumps(BrokerClient(args.socket).status(), indent=2))
+        return 0
+    if args.stop:
+        BrokerClient(args.socket).shutdown()
+        return 0
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    serve(args.socket, ttl=args.ttl)
+    return 0
+
+
+def _bench(args: argparse.Namespace) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", stream=sys.stderr)
+    result = run_bench(args.paths, args.tags, args.name, repeat=args.repeat, warmup=args.warmup)
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        regressions = compare(result, baseline, args.threshold, args.min_delta_ms)
+        result["baseline"] = args.baseline
+        result["regressions"] = regressions
+        for entry in regressions:
+            where = entry["scenario"] + (f" / {entry['step']}" if entry["step"] else "")
+            print(
+                f"Regression: {where}: {entry['stat']} {entry['baseline']:.2f} ms"
+                f" -> {entry['current']:.2f} ms ({entry['change']:+.0%})",
+                file=sys.stderr,
+            )
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(output + "\n")
+    else:
+        print(output)
+    return 1 if regressions or result["failed_runs"] else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="gherkin-testcontainers")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    prepull = commands.add_parser(
+        "prepull", help="Pull every image the selected scenarios need, in parallel"
+    )
+    _add_selection_args(prepull)
+    prepull.add_argument(
+        "-j", "--workers", type=int, default=DEFAULT_PULL_WORKERS,
+        help=f"Concurrent pulls (default: {DEFAULT_PULL_WORKERS})",
+    )
+    prepull.add_argument(
+        "--dry-run", action="store_true", help="List the images without pulling them"
+    )
+    prepull.set_defaults(handler=_prepull)
+
+    plan = commands.add_parser(
+        "plan", help="Show the containers each scenario needs and estimate startup cost"
+    )
+    _add_selection_args(plan)
+    plan.add_argument(
+        "-v", "--verbose", action="store_true", help="List the scenarios of each signature"
+    )
+    plan.add_argument(
+        "-o", "--order-file", metavar="PATH",
+        help=f"Write scenario locations grouped by container signature, for 'behave --runner={PLAN_RUNNER} @PATH'",
+    )
+    plan.set_defaults(handler=_plan)
+
+    daemon = commands.add_parser(
+        "daemon", help="Keep containers warm across behave runs (setup_hooks(daemon=True))"
+    )
+    daemon.add_argument(
+        "--socket", metavar="PATH", help="Unix socket path (default: $GTC_DAEMON_SOCKET or per-user)"
+    )
+    daemon.add_argument(
+        "--ttl", type=float, default=DEFAULT_TTL,
+        help=f"Stop containers idle for this many seconds (default: {DEFAULT_TTL:.0f})",
+    )
+    action = daemon.add_mutually_exclusive_group()
+    action.add_argument("--status", action="store_true", help="Print the running daemon's containers")
+    action.add_argument("--stop", action="store_true", help="Stop the running daemon and its containers")
+    daemon.set_defaults(handler=_daemon)
+
+    bench = commands.add_parser(
+        "bench", help="Run scenarios repeatedly against warm containers and report step timings"
+    )
+    _add_selection_args(bench)
+    bench.add_argument(
+        "-n", "--name", action="append", default=[],
+        help="Only scenarios whose name matches this regular expression, as for behave (repeatable)",
+    )
+    bench.add_argument(
+        "--repeat", type=int, default=DEFAULT_REPEAT,
+        help=f"Measured runs (default: {DEFAULT_REPEAT})",
+    )
+    bench.add_argument(
+        "--warmup", type=int, default=DEFAULT_WARMUP,
+        help=f"Unmeasured runs before them (default: {DEFAULT_WARMUP})",
+    )
+    bench.add_argument("-o", "--output", metavar="PATH", help="Write the JSON result here instead of stdout")
+    bench.add_argument(
+        "--baseline", metavar="PATH",
+        help="A previous JSON result; exit 1 if a scenario or step got slower than it",
+    )
+    bench.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help=f"Slowdown that counts as a regression, as a fraction (default: {DEFAULT_THRESHOLD})",
+    )
+    bench.add_argument(
+        "--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+        help=f"Ignore slowdowns smaller than this (default: {DEFAULT_MIN_DELTA_MS} ms)",
+    )
+    bench.set_defaults(handler=_bench)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
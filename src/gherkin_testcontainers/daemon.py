@@ -0,0 +1,352 @@
+"""A long-lived process that keeps containers warm across ``behave`` runs.
+
+``gherkin-testcontainers daemon`` runs a ``ContainerBroker`` behind a Unix
+socket. With ``setup_hooks(daemon=True)``, each ``ContainerManager`` leases
+containers from it instead of starting its own: the daemon hands back an
+endpoint URL and the manager binds the plugin to it, exactly as with
+``GTC_<PLUGIN>_URL``. When the scenario (or feature/session) ends, the
+lease is returned, the plugin's ``reset`` hook cleans the container, and it
+waits for the next lease with the same plugin and kwargs. Containers idle
+for longer than the TTL are stopped.
+
+The protocol is one JSON object per line in each direction. Each lease
+holds its own connection open, so the daemon takes leases back from a
+``behave`` process that dies without returning them.
+"""
+import hashlib
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any
+
+from testcontainers.core.container import DockerContainer
+
+from gherkin_testcontainers.docker_client import SharedDockerClient
+from gherkin_testcontainers.registry import PluginRegistry
+from gherkin_testcontainers.scan import ContainerRequest
+
+logger = logging.getLogger(__name__)
+
+SOCKET_ENV = "GTC_DAEMON_SOCKET"
+DEFAULT_TTL = 600.0
+# Leases may wait for a cold start (Oracle takes about a minute).
+DEFAULT_LEASE_TIMEOUT = 600.0
+KEY_LABEL = "gherkin-testcontainers.key"
+
+
+def default_socket_path() -> str:
+    """``$GTC_DAEMON_SOCKET``, else a per-user socket in the runtime or temp directory."""
+    if os.environ.get(SOCKET_ENV):
+        return os.environ[SOCKET_ENV]
+    directory = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(directory, f"gherkin-testcontainers-{os.getuid()}.sock")
+
+
+def container_key(plugin_name: str, kwargs: dict[str, Any]) -> str:
+    """Hash of the plugin and kwargs; containers are only reused for an identical key."""
+    signature = ContainerRequest(plugin_name, kwargs).signature
+    return hashlib.sha256(signature.encode()).hexdigest()[:16]
+
+
+@dataclass
+class WarmContainer:
+    key: str
+    plugin_name: str
+    kwargs: dict[str, Any]
+    container: Any
+    endpoint: str
+    start_seconds: float
+    leases: int = 0
+    idle_since: float | None = None
+
+    def describe(self, state: str, now: float) -> dict[str, Any]:
+        # The endpoint carries credentials; leave it out of status output.
+        return {
+            "key": self.key,
+            "plugin": self.plugin_name,
+            "kwargs": self.kwargs,
+            "state": state,
+            "leases": self.leases,
+            "start_seconds": self.start_seconds,
+            "idle_seconds": None if self.idle_since is None else now - self.idle_since,
+        }
+
+
+class ContainerBroker:
+    """Pools started containers by ``container_key`` and leases them out one at a time.
+
+    A lease for a key with no idle container starts a new one, so
+    concurrent runs never share a container.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL) -> None:
+        self.ttl = ttl
+        self._idle: dict[str, list[WarmContainer]] = {}
+        self._leased: dict[str, WarmContainer] = {}
+        self._lock = threading.Lock()
+
+    def lease(self, plugin_name: str, kwargs: dict[str, Any]) -> tuple[str, WarmContainer]:
+        """Lease a container of ``plugin_name``; raises ``ValueError`` if the plugin can't be pooled.
+
+        Only plugins that implement ``external_url`` and ``reset`` can be
+        (``ContainerPlugin.can_lease``); they are checked before anything
+        starts.
+        """
+        if not PluginRegistry.get(plugin_name).can_lease:
+            raise ValueError(f"The '{plugin_name}' plugin can't be pooled: it needs external_url and reset hooks")
+        key = container_key(plugin_name, kwargs)
+        with self._lock:
+            pool = self._idle.get(key)
+            warm = pool.pop() if pool else None
+        if warm is None:
+            warm = self._start(key, plugin_name, kwargs)
+        lease_id = uuid.uuid4().hex
+        with self._lock:
+            warm.leases += 1
+            warm.idle_since = None
+            self._leased[lease_id] = warm
+        return lease_id, warm
+
+    def _start(self, key: str, plugin_name: str, kwargs: dict[str, Any]) -> WarmContainer:
+        plugin = PluginRegistry.get(plugin_name)
+        started = time.monotonic()
+        with SharedDockerClient.inject():
+            container = plugin.create_container(**kwargs)
+            if isinstance(container, DockerContainer):
+                labels = {**container._kwargs.get("labels", {}), KEY_LABEL: key}
+                container.with_kwargs(**{**container._kwargs, "labels": labels})
+            container.start()
+            try:
+                endpoint = plugin.external_url(container)
+            except BaseException:
+                container.stop()
+                raise
+        logger.info("Started %s container %s", plugin_name, key)
+        return WarmContainer(key, plugin_name, kwargs, container, endpoint, time.monotonic() - started)
+
+    def release(self, lease_id: str) -> None:
+        """Reset the container of ``lease_id`` and return it to the pool; stop it if the reset fails."""
+        with self._lock:
+            warm = self._leased.pop(lease_id, None)
+        if warm is None:
+            return
+        try:
+            with SharedDockerClient.inject():
+                PluginRegistry.get(warm.plugin_name).reset(warm.container)
+        except Exception:
+            logger.warning("Resetting the %s container failed; stopping it", warm.plugin_name, exc_info=True)
+            self._stop(warm)
+            return
+        with self._lock:
+            warm.idle_since = time.monotonic()
+            self._idle.setdefault(warm.key, []).append(warm)
+
+    def evict_idle(self, now: float | None = None) -> list[WarmContainer]:
+        """Stop containers idle for at least ``ttl`` seconds; returns them."""
+        now = time.monotonic() if now is None else now
+        expired = []
+        with self._lock:
+            for key, pool in list(self._idle.items()):
+                keep = [warm for warm in pool if now - warm.idle_since < self.ttl]
+                expired.extend(warm for warm in pool if now - warm.idle_since >= self.ttl)
+                if keep:
+                    self._idle[key] = keep
+                else:
+                    del self._idle[key]
+        for warm in expired:
+            self._stop(warm)
+        return expired
+
+    def status(self) -> list[dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                *(warm.describe("idle", now) for pool in self._idle.values() for warm in pool),
+                *(warm.describe("leased", now) for warm in self._leased.values()),
+            ]
+
+    def shutdown(self) -> None:
+        """Stop every container, leased or not."""
+        with self._lock:
+            containers = [warm for pool in self._idle.values() for warm in pool]
+            containers.extend(self._leased.values())
+            self._idle.clear()
+            self._leased.clear()
+        for warm in containers:
+            self._stop(warm)
+
+    def _stop(self, warm: WarmContainer) -> None:
+        try:
+            with SharedDockerClient.inject():
+                warm.container.stop()
+        except Exception:
+            logger.warning("Stopping the %s container failed", warm.plugin_name, exc_info=True)
+        else:
+            logger.info("Stopped %s container %s", warm.plugin_name, warm.key)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    def handle(self) -> None:
+        leases: set[str] = set()
+        try:
+            for line in self.rfile:
+                response = self.server.dispatch(json.loads(line), leases)
+                self.wfile.write(json.dumps(response).encode() + b"\n")
+        finally:
+            # Connection closed: take back whatever it still holds.
+            for lease_id in leases:
+                self.server.broker.release(lease_id)
+
+
+class BrokerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serves a ``ContainerBroker`` on a Unix socket only the current user can open."""
+
+    daemon_threads = True
+
+    def __init__(self, path: str, broker: ContainerBroker) -> None:
+        if os.path.exists(path):
+            if _is_listening(path):
+                raise RuntimeError(f"A container daemon is already listening on {path}")
+            os.unlink(path)
+        self.broker = broker
+        super().__init__(path, _Handler)
+        os.chmod(path, 0o600)
+
+    def dispatch(self, request: dict[str, Any], leases: set[str]) -> dict[str, Any]:
+        op = request.get("op")
+        try:
+            if op == "lease":
+                lease_id, warm = self.broker.lease(request["plugin"], request.get("kwargs", {}))
+                leases.add(lease_id)
+                return {"ok": True, "lease": lease_id, "endpoint": warm.endpoint, "key": warm.key}
+            if op == "release":
+                leases.discard(request["lease"])
+                self.broker.release(request["lease"])
+                return {"ok": True}
+            if op == "status":
+                return {"ok": True, "containers": self.broker.status()}
+            if op == "shutdown":
+                threading.Thread(target=self.shutdown, daemon=True).start()
+                return {"ok": True}
+            return {"ok": False, "error": f"Unknown op '{op}'"}
+        except Exception as exc:
+            logger.warning("Daemon request %s failed", op, exc_info=True)
+            return {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+
+
+def _is_listening(path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+def serve(path: str | None = None, ttl: float = DEFAULT_TTL) -> None:
+    """Run the daemon until a ``shutdown`` request, SIGTERM or Ctrl-C; then stop every container."""
+    path = path or default_socket_path()
+    broker = ContainerBroker(ttl)
+    server = BrokerServer(path, broker)
+    stopping = threading.Event()
+
+    def evict_loop() -> None:
+        while not stopping.wait(min(ttl / 4, 30.0)):
+            broker.evict_idle()
+
+    threading.Thread(target=evict_loop, name="gherkin-testcontainers-evict", daemon=True).start()
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    logger.info("Container daemon listening on %s (idle TTL %.0fs)", path, ttl)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stopping.set()
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
+        broker.shutdown()
+
+
+@dataclass
+class Lease:
+    """A container leased from the daemon; ``release()`` hands it back."""
+
+    lease_id: str
+    endpoint: str
+    key: str
+    _connection: Any = field(repr=False)
+
+    def release(self) -> None:
+        try:
+            _request(self._connection, {"op": "release", "lease": self.lease_id})
+        except (OSError, RuntimeError):
+            # Closing the connection releases the lease too.
+            pass
+        finally:
+            self._connection.close()
+
+
+class BrokerClient:
+    """Talks to the daemon at ``path`` (default: ``default_socket_path()``)."""
+
+    def __init__(self, path: str | None = None, timeout: float = DEFAULT_LEASE_TIMEOUT) -> None:
+        self.path = path or default_socket_path()
+        self.timeout = timeout
+
+    def _connect(self) -> socket.socket:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(self.timeout)
+        try:
+            connection.connect(self.path)
+        except OSError:
+            connection.close()
+            raise
+        return connection
+
+    def lease(self, plugin_name: str, kwargs: dict[str, Any]) -> Lease:
+        """Lease a container; raises ``OSError`` if the daemon is unreachable and
+        ``RuntimeError`` if it couldn't provide one."""
+        request = json.dumps({"op": "lease", "plugin": plugin_name, "kwargs": kwargs})
+        connection = self._connect()
+        try:
+            response = _request(connection, request)
+        except BaseException:
+            connection.close()
+            raise
+        return Lease(response["lease"], response["endpoint"], response["key"], connection)
+
+    def status(self) -> list[dict[str, Any]]:
+        with self._connect() as connection:
+            return _request(connection, {"op": "status"})["containers"]
+
+    def shutdown(self) -> None:
+        with self._connect() as connection:
+            _request(connection, {"op": "shutdown"})
+
+
+def _request(connection: socket.socket, request: dict[str, Any] | str) -> dict[str, Any]:
+    line = request if isinstance(request, str) else json.dumps(request)
+    connection.sendall(line.encode() + b"\n")
+    buffer = b""
+    while not buffer.endswith(b"\n"):
+        chunk = connection.recv(65536)
+        if not chunk:
+            raise ConnectionError("The container daemon closed the connection")
+        buffer += chunk
+    response = json.loads(buffer)
+    if not response.get("ok"):
+        raise RuntimeError(response.get("error", "Container daemon request failed"))
+    return response
@@ -0,0 +1,197 @@
+"""Synthetic test data from a declarative schema, generated a batch at a time with NumPy.
+
+Each column draws from its own random stream derived from the schema seed,
+so the same schema, seed, row count and batch size always produce the same
+data, and appending a column doesn't change the values of the others.
+"""
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+from gherkin_testcontainers.seeding import RowSource
+
+DEFAULT_BATCH_SIZE = 10_000
+DEFAULT_SEED = 0
+
+COLUMN_TYPES = ("int", "float", "bool", "string", "choice", "timestamp")
+DISTRIBUTIONS = ("uniform", "normal", "zipf", "sequence")
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError as exc:
+        raise ImportError(
+            "Generating data requires numpy: pip install gherkin-testcontainers[datagen]"
+        ) from exc
+    return numpy
+
+
+@dataclass(frozen=True)
+class Column:
+    """One generated column.
+
+    - ``int``/``float``: ``distribution`` ``"uniform"`` draws from
+      [``low``, ``high``), ``"normal"`` from N(``mean``, ``stddev``),
+      ``"zipf"`` a skewed value in [``low``, ``high``) with exponent
+      ``zipf_a``, and ``"sequence"`` counts up from ``low`` (ints only).
+    - ``string``: ``prefix`` plus a number drawn like an int column from
+      [0, ``cardinality``), so ``cardinality`` bounds the distinct values.
+    - ``choice``: one of ``values``, weighted by ``weights`` if given.
+    - ``bool``: True with ``probability``.
+    - ``timestamp``: ``start`` plus a number of seconds drawn like an int
+      column from [0, ``high``); ``"sequence"`` steps by ``step`` seconds.
+
+    ``null_fraction`` replaces that share of values with None.
+    """
+
+    name: str
+    type: str = "int"
+    distribution: str = "uniform"
+    low: float = 0
+    high: float = 1_000_000
+    mean: float = 0.0
+    stddev: float = 1.0
+    zipf_a: float = 1.5
+    cardinality: int = 1_000
+    prefix: str | None = None
+    values: tuple = ()
+    weights: tuple = ()
+    probability: float = 0.5
+    start: str = "2024-01-01T00:00:00"
+    step: int = 1
+    null_fraction: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.type not in COLUMN_TYPES:
+            raise ValueError(
+                f"Unknown type '{self.type}' for column '{self.name}'. Available: {list(COLUMN_TYPES)}"
+            )
+        if self.distribution not in DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown distribution '{self.distribution}' for column '{self.name}'."
+                f" Available: {list(DISTRIBUTIONS)}"
+            )
+        if self.type == "choice" and not self.values:
+            raise ValueError(f"Choice column '{self.name}' needs values")
+        if self.weights and len(self.weights) != len(self.values):
+            raise ValueError(
+                f"Column '{self.name}' has {len(self.weights)} weights for {len(self.values)} values"
+            )
+
+    def generate(self, rng: Any, offset: int, size: int) -> Any:
+        """``size`` values for rows ``offset`` onwards, as a NumPy array."""
+        np = _numpy()
+        if self.type == "int":
+            values = self._integers(rng, offset, size, int(self.low), int(self.high))
+        elif self.type == "float":
+            values = self._floats(rng, size)
+        elif self.type == "bool":
+            values = rng.random(size) < self.probability
+        elif self.type == "string":
+            numbers = self._integers(rng, offset, size, 0, self.cardinality)
+            prefix = f"{self.name}-" if self.prefix is None else self.prefix
+            values = np.char.add(prefix, numbers.astype(str))
+        elif self.type == "choice":
+            weights = None
+            if self.weights:
+                weights = np.asarray(self.weights, dtype=float)
+                weights = weights / weights.sum()
+            values = np.asarray(self.values)[rng.choice(len(self.values), size, p=weights)]
+        else:
+            seconds = self._integers(rng, offset, size, 0, int(self.high), step=self.step)
+            values = np.datetime64(self.start, "s") + seconds.astype("timedelta64[s]")
+        if self.null_fraction:
+            values = values.astype(object)
+            values[rng.random(size) < self.null_fraction] = None
+        return values
+
+    def _integers(self, rng: Any, offset: int, size: int, low: int, high: int, step: int = 1) -> Any:
+        np = _numpy()
+        if self.distribution == "sequence":
+            return low + (offset + np.arange(size, dtype=np.int64)) * step
+        if self.distribution == "normal":
+            return np.rint(rng.normal(self.mean, self.stddev, size)).astype(np.int64)
+        if self.distribution == "zipf":
+            # Rank 1 is the most frequent; fold the unbounded tail into range.
+            return low + (rng.zipf(self.zipf_a, size) - 1) % max(high - low, 1)
+        return rng.integers(low, high, size)
+
+    def _floats(self, rng: Any, size: int) -> Any:
+        if self.distribution == "normal":
+            return rng.normal(self.mean, self.stddev, size)
+        if self.distribution == "uniform":
+            return rng.uniform(self.low, self.high, size)
+        raise ValueError(f"Float column '{self.name}' doesn't support '{self.distribution}'")
+
+
+@dataclass(frozen=True)
+class Schema:
+    """Columns to generate plus the seed their random streams derive from."""
+
+    columns: tuple[Column, ...]
+    seed: int = DEFAULT_SEED
+    batch_size: int = DEFAULT_BATCH_SIZE
+
+    @classmethod
+    def from_dict(cls, spec: dict[str, Any]) -> "Schema":
+        """Build from plain data, e.g. a parsed YAML/JSON file::
+
+            {"seed": 42, "columns": [
+                {"name": "id", "type": "int", "distribution": "sequence"},
+                {"name": "country", "type": "choice", "values": ["DE", "FR"]},
+            ]}
+        """
+        columns = tuple(
+            Column(**{
+                key: tuple(value) if isinstance(value, list) else value
+                for key, value in column.items()
+            })
+            for column in spec["columns"]
+        )
+        return cls(
+            columns,
+            seed=spec.get("seed", DEFAULT_SEED),
+            batch_size=spec.get("batch_size", DEFAULT_BATCH_SIZE),
+        )
+
+    @property
+    def names(self) -> list[str]:
+        return [column.name for column in self.columns]
+
+    def batches(self, rows: int) -> Iterator[dict[str, Any]]:
+        """``rows`` rows as ``{column: numpy array}`` batches of up to ``batch_size`` rows."""
+        np = _numpy()
+        streams = np.random.SeedSequence(self.seed).spawn(len(self.columns))
+        generators = [np.random.default_rng(stream) for stream in streams]
+        for offset in range(0, rows, self.batch_size):
+            size = min(self.batch_size, rows - offset)
+            yield {
+                column.name: column.generate(rng, offset, size)
+                for column, rng in zip(self.columns, generators)
+            }
+
+    def arrow_batches(self, rows: int) -> Iterator[Any]:
+        """Like ``batches`` but as ``pyarrow.RecordBatch`` objects. Needs ``pyarrow``."""
+        try:
+            import pyarrow as pa
+        except ImportError as exc:
+            raise ImportError("Arrow batches require pyarrow: pip install pyarrow") from exc
+        for batch in self.batches(rows):
+            yield pa.RecordBatch.from_pydict(batch)
+
+    def rows(self, rows: int) -> Iterator[tuple]:
+        """``rows`` rows as tuples of Python values, converted a batch at a time."""
+        for batch in self.batches(rows):
+            yield from zip(*(_to_python(values) for values in batch.values()))
+
+    def source(self, rows: int) -> RowSource:
+        """A lazy ``RowSource`` for ``seeding.seed`` and ``seeding.publish``."""
+        return RowSource(self.names, self.rows(rows))
+
+
+def _to_python(values: Any) -> list:
+    # tolist() converts datetime64[s] to datetime, but leaves object arrays alone.
+    if values.dtype == object:
+        return [value.item() if hasattr(value, "item") else value for value in values]
+    return values.tolist()
+
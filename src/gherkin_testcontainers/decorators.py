@@ -2,22 +2,36 @@ import functools
 from typing import Any, Callable
 
 
-def use_container(plugin_name: str, **container_kwargs) -> Callable:
+def use_container(plugin_name: str, lazy: bool = False, **container_kwargs) -> Callable:
     """Decorator that injects a container client into a behave step function.
 
     The client is injected as a keyword argument named '{plugin_name}_client'.
+    With ``lazy=True`` a ``LazyClient`` proxy is injected instead: the
+    container starts in the background and the step only blocks on it when
+    the client is first used.
+    The request is also recorded in the wrapper's ``container_requests``
+    attribute so tools can see which containers a step needs without running it.
     """
     client_param = f"{plugin_name}_client"
 
     def decorator(fn: Callable) -> Callable:
         @functools.wraps(fn)
         def wrapper(context, *args, **kwargs):
-            client = context.containers.get_client(
-                plugin_name, **container_kwargs
-            )
+            if lazy:
+                client = context.containers.get_lazy_client(
+                    plugin_name, **container_kwargs
+                )
+            else:
+                client = context.containers.get_client(
+                    plugin_name, **container_kwargs
+                )
             kwargs[client_param] = client
             return fn(context, *args, **kwargs)
 
+        wrapper.container_requests = [
+            *getattr(fn, "container_requests", []),
+            (plugin_name, container_kwargs),
+        ]
         return wrapper
 
     return decorator
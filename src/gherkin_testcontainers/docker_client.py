@@ -0,0 +1,84 @@
+import atexit
+import contextlib
+import threading
+from typing import Any, Iterator
+
+from testcontainers.core import container as _container_module
+from testcontainers.core import image as _image_module
+from testcontainers.core import network as _network_module
+from testcontainers.core.docker_client import DockerClient
+
+# Enough connections for parallel background starts, pulls and log/stat
+# streams without requests discarding sockets ("Connection pool is full").
+DEFAULT_MAX_POOL_SIZE = 32
+
+# testcontainers modules that build their own DockerClient per object.
+_PATCHED_MODULES = (_container_module, _network_module, _image_module)
+
+
+class SharedDockerClient:
+    """One testcontainers ``DockerClient`` shared by every container in the run.
+
+    While ``inject()`` is active on the current thread, ``DockerContainer``,
+    ``Network`` and ``DockerImage`` objects it creates without
+    ``docker_client_kw`` use the shared client instead of opening their own
+    connection pool and negotiating the API version again. Every HTTP request
+    it makes to the daemon is counted in ``api_calls``.
+    """
+
+    _client: DockerClient | None = None
+    _api_calls = 0
+    # Per-thread inject() depth: other threads keep their own clients.
+    _active = threading.local()
+    _installed = False
+    _lock = threading.RLock()
+
+    max_pool_size = DEFAULT_MAX_POOL_SIZE
+
+    @classmethod
+    def get(cls) -> DockerClient:
+        with cls._lock:
+            if cls._client is None:
+                client = DockerClient(max_pool_size=cls.max_pool_size)
+                client.client.api.hooks["response"].append(cls._count)
+                cls._client = client
+                atexit.register(cls.shutdown)
+            return cls._client
+
+    @classmethod
+    def _count(cls, response: Any, *args, **kwargs) -> None:
+        with cls._lock:
+            cls._api_calls += 1
+
+    @classmethod
+    def api_calls(cls) -> int:
+        """Docker API requests made through the shared client so far."""
+        return cls._api_calls
+
+    @classmethod
+    def _factory(cls, **kwargs) -> DockerClient:
+        if getattr(cls._active, "depth", 0) and not kwargs:
+            return cls.get()
+        return DockerClient(**kwargs)
+
+    @classmethod
+    @contextlib.contextmanager
+    def inject(cls) -> Iterator[None]:
+        """Route testcontainers objects this thread creates in this block to the shared client."""
+        with cls._lock:
+            if not cls._installed:
+                for module in _PATCHED_MODULES:
+                    module.DockerClient = cls._factory
+                cls._installed = True
+        cls._active.depth = getattr(cls._active, "depth", 0) + 1
+        try:
+            yield
+        finally:
+            cls._active.depth -= 1
+
+    @classmethod
+    def shutdown(cls) -> None:
+        with cls._lock:
+            client, cls._client = cls._client, None
+        if client is not None:
+            client.client.close()
@@ -0,0 +1,61 @@
+from typing import Any
+from urllib.parse import unquote, urlsplit
+
+
+class ExternalService:
+    """Stands in for a container when a plugin is bound to an already-running service.
+
+    ``start`` and ``stop`` do nothing; host, port, credentials and database
+    name come from ``url``. A bare ``host:port`` is accepted too. Plugins
+    return one of these (or a subclass adding their container's accessors)
+    from ``ContainerPlugin.create_external``.
+    """
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self._parts = urlsplit(url if "://" in url else f"//{url}")
+
+    @property
+    def host(self) -> str:
+        return self._parts.hostname or "localhost"
+
+    @property
+    def port(self) -> int | None:
+        return self._parts.port
+
+    @property
+    def address(self) -> str:
+        """``host:port``, or just the host when the URL has no port."""
+        return self.host if self.port is None else f"{self.host}:{self.port}"
+
+    @property
+    def username(self) -> str | None:
+        return unquote(self._parts.username) if self._parts.username else None
+
+    @property
+    def password(self) -> str | None:
+        return unquote(self._parts.password) if self._parts.password else None
+
+    @property
+    def dbname(self) -> str | None:
+        return self._parts.path.lstrip("/") or None
+
+    def start(self) -> "ExternalService":
+        return self
+
+    def stop(self, *args: Any, **kwargs: Any) -> None:
+        """The service isn't ours to stop."""
+
+    def get_container_host_ip(self) -> str:
+        return self.host
+
+    def get_exposed_port(self, port: int) -> int | None:
+        # An external service exposes one port: the one in its URL.
+        return self.port
+
+    def get_connection_url(self) -> str:
+        return self.url
+
+    def __repr__(self) -> str:
+        # Keep credentials out of logs.
+        return f"ExternalService({self._parts.scheme or 'tcp'}://{self.address})"
@@ -1,14 +1,201 @@
+import contextlib
+import copy
+import logging
+import time
+from typing import Iterator
+
+from gherkin_testcontainers.budget import HostBudget
+from gherkin_testcontainers.daemon import BrokerClient
+from gherkin_testcontainers.leaks import LeakDetector
 from gherkin_testcontainers.manager import ContainerManager
+from gherkin_testcontainers.report import RunReport, scenario_lifecycle
+
+logger = logging.getLogger(__name__)
+
+SCOPES = ("scenario", "feature", "session")
+
+
+class _Hold:
+    """State of ``hold_containers()``: the one manager every hook shares while active."""
+
+    active = False
+    manager: ContainerManager | None = None
+
+
+@contextlib.contextmanager
+def hold_containers() -> Iterator[None]:
+    """Keep containers running across ``behave`` runs in this process, whatever the scope.
+
+    While active, every scenario of every run shares one ``ContainerManager``,
+    and where a scope would stop its containers they are reset instead (see
+    ``ContainerManager.reset``). ``gherkin-testcontainers bench`` uses this
+    to repeat scenarios against warm containers. The containers stop when
+    the block exits.
+    """
+    _Hold.active = True
+    try:
+        yield
+    finally:
+        manager, _Hold.manager = _Hold.manager, None
+        _Hold.active = False
+        if manager is not None:
+            _stop(manager, "held containers")
+
+
+def _end(manager: ContainerManager, label: str) -> None:
+    if _Hold.active:
+        manager.reset()
+    else:
+        _stop(manager, label)
+
+
+def _stop(manager: ContainerManager, label: str) -> None:
+    manager.stop_all()
+    logger.info("%s: %d Docker API calls", label, manager.stats["docker_api_calls"])
+    for plugin_name, entry in manager.idle_report().items():
+        logger.info(
+            "%s: %s unpaused %d time(s), mean %.3fs vs %.3fs fresh start",
+            label, plugin_name, entry["unpauses"],
+            entry["mean_unpause_seconds"], entry["start_seconds"],
+        )
+
+
+def _prepull(config) -> None:
+    """Pull the images of the scenarios ``config`` selects; failures only cost the head start."""
+    from gherkin_testcontainers.prepull import prepull_images
+    from gherkin_testcontainers.scan import parse_selected_features, resolve_images, scan_features
+
+    try:
+        scans = scan_features(parse_selected_features(config), config.tag_expression)
+        prepull_images(resolve_images(scans))
+    except Exception:
+        logger.warning("Pre-pulling images failed; scenarios will pull them as they start", exc_info=True)
+
+
+def setup_hooks(
+    namespace: dict,
+    prepull: bool = False,
+    track_leaks: bool = False,
+    scope: str = "scenario",
+    idle_timeout: float | None = None,
+    budget: HostBudget | None = None,
+    report_path: str | None = None,
+    sample_interval: float | None = None,
+    daemon: bool = False,
+) -> None:
+    """Wire behave lifecycle hooks into the given namespace (environment.py globals).
+
+    With ``prepull=True`` a ``before_all`` hook also pulls, in parallel, every
+    image the selected scenarios will need before the first one starts. It is
+    best effort: if pulling fails (e.g. Docker is unreachable), a warning is
+    logged and the run goes on.
+
+    With ``track_leaks=True`` the growth in open fds, threads and RSS over
+    each scenario (after its clients and containers are closed) is stored in
+    ``context.containers.stats["resource_growth"]`` and logged.
+
+    ``scope`` sets how long containers live: ``"scenario"`` (default),
+    ``"feature"`` or ``"session"``. With a wider scope, scenarios reuse the
+    same containers and clients, and ``idle_timeout`` (seconds) pauses
+    containers that no scenario has requested for that long.
+
+    ``budget`` admits container starts against a host-wide memory/CPU budget
+    shared by all workers; it defaults to ``HostBudget.from_env()``.
+
+    ``sample_interval`` (seconds) samples CPU, memory, block I/O and network
+    of every container from the Docker stats stream; each scenario's peak
+    and mean values go to ``context.containers.stats["resource_usage"]``.
+    ``report_path`` writes a JSON run report with each scenario's container
+    lifecycle timings and resource usage when the run ends.
+
+    With ``daemon=True`` containers are leased from a running
+    ``gherkin-testcontainers daemon`` (socket from ``GTC_DAEMON_SOCKET``)
+    and stay warm between runs; plugins it can't provide start locally.
+    """
+    if scope not in SCOPES:
+        raise ValueError(f"Unknown scope '{scope}'. Available: {list(SCOPES)}")
+    if budget is None:
+        budget = HostBudget.from_env()
+
+    report = RunReport(report_path) if report_path else None
+
+    def new_manager() -> ContainerManager:
+        if _Hold.active and _Hold.manager is not None:
+            return _Hold.manager
+        manager = ContainerManager(
+            idle_timeout=idle_timeout,
+            budget=budget,
+            sample_interval=sample_interval,
+            broker=BrokerClient() if daemon else None,
+        )
+        if _Hold.active:
+            _Hold.manager = manager
+        return manager
+
+    def before_all(context):
+        if prepull:
+            _prepull(context.config)
+        if scope == "session":
+            context.containers = new_manager()
+
+    def after_all(context):
+        if scope == "session":
+            _end(context.containers, "session")
+        if report is not None:
+            report.write()
 
+    def before_feature(context, feature):
+        context.containers = new_manager()
 
-def setup_hooks(namespace: dict) -> None:
-    """Wire behave lifecycle hooks into the given namespace (environment.py globals)."""
+    def after_feature(context, feature):
+        _end(context.containers, feature.name)
 
     def before_scenario(context, scenario):
-        context.containers = ContainerManager()
+        if track_leaks:
+            context.leak_detector = LeakDetector()
+            context.leak_detector.start()
+        if scope == "scenario":
+            context.containers = new_manager()
+        context.scenario_started = time.monotonic()
+        context.scenario_stats = copy.deepcopy(context.containers.stats)
 
     def after_scenario(context, scenario):
-        context.containers.stop_all()
+        manager = context.containers
+        manager.stats["resource_usage"] = manager.resource_usage(since=context.scenario_started)
+        if scope == "scenario":
+            _end(manager, scenario.name)
+        else:
+            manager.release()
+        growth = None
+        if track_leaks:
+            growth = context.leak_detector.stop()
+            manager.stats["resource_growth"] = growth.as_dict()
+            leaked = (growth.fds or 0) > 0 or growth.threads > 0
+            logger.log(
+                logging.WARNING if leaked else logging.INFO,
+                "%s: resource growth fds=%s threads=%s rss=%s bytes",
+                scenario.name, growth.fds, growth.threads, growth.rss_bytes,
+            )
+        if report is not None:
+            sections = {
+                "lifecycle": scenario_lifecycle(context.scenario_stats, manager.stats),
+                "resource_usage": manager.stats["resource_usage"],
+            }
+            if growth is not None:
+                sections["resource_growth"] = growth.as_dict()
+            load_results = getattr(context, "load_results", None)
+            if load_results:
+                sections["load"] = [result.summary() for result in load_results]
+            report.add_scenario(
+                scenario, time.monotonic() - context.scenario_started, **sections
+            )
 
+    if prepull or scope == "session":
+        namespace["before_all"] = before_all
+    if scope == "session" or report is not None:
+        namespace["after_all"] = after_all
+    if scope == "feature":
+        namespace["before_feature"] = before_feature
+        namespace["after_feature"] = after_feature
     namespace["before_scenario"] = before_scenario
     namespace["after_scenario"] = after_scenario
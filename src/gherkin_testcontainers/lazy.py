@@ -0,0 +1,89 @@
+import threading
+from typing import Any, Callable
+
+_UNSET = object()
+
+
+class LazyClient:
+    """Transparent proxy for a client that may still be starting.
+
+    ``load`` is called on first real use (attribute access, call, iteration,
+    ``with``, ...) and its result is cached; every later operation goes to
+    that client. Use ``resolve(proxy)`` to get the underlying client, e.g. to
+    pass it to code that checks types.
+    """
+
+    __slots__ = ("_load", "_target", "_lock")
+
+    def __init__(self, load: Callable[[], Any]) -> None:
+        object.__setattr__(self, "_load", load)
+        object.__setattr__(self, "_target", _UNSET)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _resolve(self) -> Any:
+        target = object.__getattribute__(self, "_target")
+        if target is _UNSET:
+            with object.__getattribute__(self, "_lock"):
+                target = object.__getattribute__(self, "_target")
+                if target is _UNSET:
+                    target = object.__getattribute__(self, "_load")()
+                    object.__setattr__(self, "_target", target)
+        return target
+
+    @property
+    def _resolved(self) -> bool:
+        return object.__getattribute__(self, "_target") is not _UNSET
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._resolve(), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(self._resolve(), name)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self._resolve()(*args, **kwargs)
+
+    def __enter__(self) -> Any:
+        return self._resolve().__enter__()
+
+    def __exit__(self, *exc_info) -> Any:
+        return self._resolve().__exit__(*exc_info)
+
+    def __iter__(self):
+        return iter(self._resolve())
+
+    def __len__(self) -> int:
+        return len(self._resolve())
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._resolve()[key]
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self._resolve()
+
+    def __bool__(self) -> bool:
+        return bool(self._resolve())
+
+    def __eq__(self, other: Any) -> bool:
+        return self._resolve() == resolve(other)
+
+    def __hash__(self) -> int:
+        return hash(self._resolve())
+
+    def __str__(self) -> str:
+        return str(self._resolve())
+
+    def __repr__(self) -> str:
+        if not self._resolved:
+            return "<LazyClient (not started)>"
+        return f"<LazyClient {object.__getattribute__(self, '_target')!r}>"
+
+
+def resolve(client: Any) -> Any:
+    """Return the real client behind a ``LazyClient``, starting it if needed."""
+    if isinstance(client, LazyClient):
+        return client._resolve()
+    return client
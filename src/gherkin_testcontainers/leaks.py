@@ -0,0 +1,81 @@
+import gc
+import os
+import threading
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ResourceSnapshot:
+    """Process resource usage at one point in time; ``None`` where unavailable."""
+
+    fds: int | None
+    threads: int
+    rss_bytes: int | None
+
+    def __sub__(self, other: "ResourceSnapshot") -> "ResourceSnapshot":
+        def diff(a: int | None, b: int | None) -> int | None:
+            return None if a is None or b is None else a - b
+
+        return ResourceSnapshot(
+            fds=diff(self.fds, other.fds),
+            threads=self.threads - other.threads,
+            rss_bytes=diff(self.rss_bytes, other.rss_bytes),
+        )
+
+    def as_dict(self) -> dict[str, int | None]:
+        return {"fds": self.fds, "threads": self.threads, "rss_bytes": self.rss_bytes}
+
+
+def _count_fds() -> int | None:
+    for path in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(path))
+        except OSError:
+            continue
+    return None
+
+
+def _count_threads() -> int:
+    # /proc also sees native threads (librdkafka, pulsar, gRPC, ...).
+    try:
+        return len(os.listdir("/proc/self/task"))
+    except OSError:
+        return threading.active_count()
+
+
+def _rss_bytes() -> int | None:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def take_snapshot() -> ResourceSnapshot:
+    """Collect garbage, then measure open fds, threads and resident memory."""
+    gc.collect()
+    return ResourceSnapshot(fds=_count_fds(), threads=_count_threads(), rss_bytes=_rss_bytes())
+
+
+class LeakDetector:
+    """Measures how much a scenario's resource usage grew between ``start`` and ``stop``.
+
+    The first scenario also accounts for run-wide resources created on
+    first use (the shared Docker client, session browsers, sidecars), so
+    look for growth that repeats scenario after scenario.
+    """
+
+    def __init__(self) -> None:
+        self.baseline: ResourceSnapshot | None = None
+
+    def start(self) -> ResourceSnapshot:
+        self.baseline = take_snapshot()
+        return self.baseline
+
+    def stop(self) -> ResourceSnapshot:
+        """Return the growth since ``start``."""
+        if self.baseline is None:
+            raise RuntimeError("LeakDetector.stop() called before start()")
+        growth = take_snapshot() - self.baseline
+        self.baseline = None
+        return growth
@@ -0,0 +1,330 @@
+"""Load generation against plugin clients, with HDR-style latency histograms.
+
+``run_load`` calls an operation ``count`` times (or for ``duration``
+seconds) from a pool of worker threads, or of asyncio tasks when the
+operation is a coroutine function:
+
+- closed loop (no ``rate``): each worker starts its next operation as soon
+  as the previous one finishes; latency is the operation's own time.
+- open loop (``rate`` per second): operation ``i`` is scheduled for
+  ``start + i / rate``, and latency is measured from that scheduled time,
+  so a backed-up system shows up as latency instead of silently lowering
+  the offered rate (coordinated omission).
+"""
+import asyncio
+import inspect
+import logging
+import math
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from gherkin_testcontainers.registry import PluginRegistry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 32
+DEFAULT_MESSAGE_SIZE = 100
+# 2**7 sub-buckets per power of two: under 1% error at any magnitude.
+DEFAULT_PRECISION_BITS = 7
+
+
+class LatencyHistogram:
+    """Log-linear histogram of latencies in microseconds, like HdrHistogram.
+
+    Values below ``2 ** (precision_bits + 1)`` microseconds are counted
+    exactly; above that each power-of-two range is split into
+    ``2 ** precision_bits`` buckets, bounding the relative error of any
+    reported value by ``2 ** -precision_bits``. Recording is O(1) and memory
+    grows with the number of distinct buckets, not of samples.
+    """
+
+    def __init__(self, precision_bits: int = DEFAULT_PRECISION_BITS) -> None:
+        self.precision_bits = precision_bits
+        self._sub_buckets = 1 << precision_bits
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.min_us: int | None = None
+        self.max_us = 0
+        self._total_us = 0
+
+    def _index(self, value: int) -> int:
+        shift = max(value.bit_length() - self.precision_bits - 1, 0)
+        return shift * self._sub_buckets + (value >> shift)
+
+    def _upper_bound(self, index: int) -> int:
+        if index < 2 * self._sub_buckets:
+            return index
+        shift = index // self._sub_buckets - 1
+        return ((index - shift * self._sub_buckets + 1) << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        value = max(int(seconds * 1_000_000), 0)
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self._total_us += value
+        self.max_us = max(self.max_us, value)
+        self.min_us = value if self.min_us is None else min(self.min_us, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        if other.precision_bits != self.precision_bits:
+            raise ValueError("Can't merge histograms of different precision")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self._total_us += other._total_us
+        self.max_us = max(self.max_us, other.max_us)
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+
+    def percentile(self, percent: float) -> float:
+        """Latency in seconds that ``percent`` % of recorded values are at or below."""
+        if not self.count:
+            return 0.0
+        rank = max(math.ceil(self.count * percent / 100.0 - 1e-9), 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._upper_bound(index), self.max_us) / 1_000_000
+        return self.max_us / 1_000_000
+
+    @property
+    def mean(self) -> float:
+        return self._total_us / self.count / 1_000_000 if self.count else 0.0
+
+    def summary(self) -> dict[str, float]:
+        """Count plus min/mean/p50/p90/p99/p99.9/max in milliseconds."""
+        return {
+            "count": self.count,
+            "min_ms": (self.min_us or 0) / 1000,
+            "mean_ms": self.mean * 1000,
+            **{f"p{p:g}_ms": self.percentile(p) * 1000 for p in (50, 90, 99, 99.9)},
+            "max_ms": self.max_us / 1000,
+        }
+
+
+@dataclass
+class LoadResult:
+    operations: int
+    errors: int
+    seconds: float
+    latency: LatencyHistogram
+    rate: float | None = None
+    concurrency: int = 1
+    first_error: str | None = None
+
+    @property
+    def throughput(self) -> float:
+        """Successful operations per second of wall time."""
+        return self.operations / self.seconds if self.seconds > 0 else 0.0
+
+    def percentile(self, percent: float) -> float:
+        return self.latency.percentile(percent)
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "operations": self.operations,
+            "errors": self.errors,
+            "seconds": self.seconds,
+            "target_rate": self.rate,
+            "concurrency": self.concurrency,
+            "throughput": self.throughput,
+            "latency": self.latency.summary(),
+            "first_error": self.first_error,
+        }
+
+
+class _Schedule:
+    """Hands out operation indexes and their scheduled start times to workers."""
+
+    def __init__(self, count: int | None, duration: float | None, rate: float | None) -> None:
+        self.count = count
+        self.duration = duration
+        self.rate = rate
+        self.start = time.monotonic()
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def next(self) -> tuple[int, float] | None:
+        with self._lock:
+            index = self._next
+            if self.count is not None and index >= self.count:
+                return None
+            scheduled = self.start + index / self.rate if self.rate else time.monotonic()
+            if self.duration is not None and scheduled - self.start >= self.duration:
+                return None
+            self._next += 1
+        return index, scheduled
+
+
+@dataclass
+class _Worker:
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    errors: int = 0
+    first_error: str | None = None
+
+    def failed(self, exc: Exception) -> None:
+        self.errors += 1
+        if self.first_error is None:
+            self.first_error = f"{type(exc).__name__}: {exc}"
+
+
+def _run_thread(schedule: _Schedule, operation: Callable[[int], Any], worker: _Worker) -> None:
+    while (slot := schedule.next()) is not None:
+        index, scheduled = slot
+        delay = scheduled - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        try:
+            operation(index)
+        except Exception as exc:
+            worker.failed(exc)
+            continue
+        worker.latency.record(time.monotonic() - scheduled)
+
+
+async def _run_task(schedule: _Schedule, operation: Callable[[int], Any], worker: _Worker) -> None:
+    while (slot := schedule.next()) is not None:
+        index, scheduled = slot
+        delay = scheduled - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        try:
+            await operation(index)
+        except Exception as exc:
+            worker.failed(exc)
+            continue
+        worker.latency.record(time.monotonic() - scheduled)
+
+
+def run_load(
+    operation: Callable[[int], Any],
+    count: int | None = None,
+    duration: float | None = None,
+    rate: float | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> LoadResult:
+    """Call ``operation(index)`` ``count`` times and/or for ``duration`` seconds.
+
+    With ``rate`` the load is open-loop at that many operations per second;
+    ``concurrency`` must then cover ``rate`` times the operation latency or
+    the schedule falls behind (which the latencies will show). With
+    ``concurrency=1`` a synchronous operation runs on the calling thread,
+    for clients bound to the thread that created them.
+    """
+    if count is None and duration is None:
+        raise ValueError("run_load needs a count or a duration")
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    workers = [_Worker() for _ in range(concurrency)]
+    schedule = _Schedule(count, duration, rate)
+    if inspect.iscoroutinefunction(operation):
+
+        async def run_all() -> None:
+            await asyncio.gather(*(_run_task(schedule, operation, worker) for worker in workers))
+
+        asyncio.run(run_all())
+    elif concurrency == 1:
+        _run_thread(schedule, operation, workers[0])
+    else:
+        threads = [
+            threading.Thread(
+                target=_run_thread, args=(schedule, operation, worker),
+                name=f"gherkin-testcontainers-load-{n}", daemon=True,
+            )
+            for n, worker in enumerate(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    seconds = time.monotonic() - schedule.start
+
+    latency = LatencyHistogram()
+    for worker in workers:
+        latency.merge(worker.latency)
+    return LoadResult(
+        operations=latency.count,
+        errors=sum(worker.errors for worker in workers),
+        seconds=seconds,
+        latency=latency,
+        rate=rate,
+        concurrency=concurrency,
+        first_error=next((w.first_error for w in workers if w.first_error), None),
+    )
+
+
+def message_payload(index: int, size: int = DEFAULT_MESSAGE_SIZE) -> bytes:
+    """A ``size``-byte message starting with its index, for messaging load."""
+    return str(index).encode().ljust(size, b".")
+
+
+def _per_worker(operations: list[Callable[[int], Any]]) -> Callable[[int], Any]:
+    """An operation that runs each worker thread's calls on one of ``operations`` of its own."""
+    unused: queue.SimpleQueue = queue.SimpleQueue()
+    for operation in operations:
+        unused.put(operation)
+    local = threading.local()
+
+    def run(index: int) -> Any:
+        operation = getattr(local, "operation", None)
+        if operation is None:
+            operation = local.operation = unused.get_nowait()
+        return operation(index)
+
+    return run
+
+
+def load(
+    manager: Any,
+    plugin_name: str,
+    target: str,
+    count: int | None = None,
+    duration: float | None = None,
+    rate: float | None = None,
+    concurrency: int | None = None,
+    **options: Any,
+) -> LoadResult:
+    """Run the plugin's ``load_operation`` against ``target`` (a statement, topic or URL).
+
+    ``concurrency`` defaults to ``DEFAULT_CONCURRENCY`` and, unless the
+    operation is a coroutine function, is capped with a warning at the
+    plugin's ``max_load_concurrency``; the result records the concurrency
+    that ran. With ``load_client_per_worker`` each worker
+    gets its own client. ``options`` go to ``load_operation``.
+    """
+    plugin = PluginRegistry.get(plugin_name)
+    client = manager.get_client(plugin_name)
+    operation = None
+    if not plugin.load_client_per_worker:
+        operation = plugin.load_operation(client, target, **options)
+    concurrency = concurrency or DEFAULT_CONCURRENCY
+    # Coroutine operations run as tasks on one thread, which thread-bound
+    # clients allow, so the cap only applies to worker threads.
+    capped = plugin.max_load_concurrency is not None and not inspect.iscoroutinefunction(operation)
+    if capped and concurrency > plugin.max_load_concurrency:
+        logger.warning(
+            "%s runs load with at most %d worker(s), not %d",
+            plugin_name, plugin.max_load_concurrency, concurrency,
+        )
+        concurrency = plugin.max_load_concurrency
+    shape = {"count": count, "duration": duration, "rate": rate, "concurrency": concurrency}
+    if operation is not None:
+        return run_load(operation, **shape)
+    container = manager.get_container(plugin_name)
+    clients: list[Any] = []
+    try:
+        for _ in range(concurrency):
+            clients.append(plugin.get_client(container))
+        operations = [plugin.load_operation(worker_client, target, **options) for worker_client in clients]
+        return run_load(_per_worker(operations), **shape)
+    finally:
+        for worker_client in clients:
+            try:
+                plugin.close_client(worker_client)
+            except Exception:
+                logger.warning("Closing a %s load client failed", plugin_name, exc_info=True)
@@ -1,39 +1,448 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from typing import Any
 
 from testcontainers.core.container import DockerContainer
 
+from gherkin_testcontainers.budget import HostBudget, ResourceSpec
+from gherkin_testcontainers.daemon import BrokerClient, Lease
+from gherkin_testcontainers.docker_client import SharedDockerClient
+from gherkin_testcontainers.lazy import LazyClient
+from gherkin_testcontainers.memory import MemoryService
 from gherkin_testcontainers.plugin import ContainerPlugin
 from gherkin_testcontainers.registry import PluginRegistry
+from gherkin_testcontainers.sampling import DEFAULT_MAX_SAMPLES, ContainerSampler
+
+logger = logging.getLogger(__name__)
 
 
 class ContainerManager:
-    """Manages container lifecycle for a single scenario."""
+    """Manages container lifecycle for a scenario, or for a feature/run when shared.
+
+    Containers (and helpers such as networks and sidecars) created by
+    plugins share one pooled Docker client for the whole run; see
+    ``SharedDockerClient``. ``stats["docker_api_calls"]`` counts the Docker
+    API requests made since this manager was created.
+
+    With ``idle_timeout`` set, a manager that outlives scenarios pauses
+    (``docker pause``) containers no scenario has requested for that many
+    seconds after ``release()``, and unpauses them on the next request.
+    ``stats`` records each container's start time and unpause latencies so
+    the two can be compared.
+
+    With a ``budget``, each start first reserves the plugin's declared
+    resources (or a ``resources=ResourceSpec(...)`` kwarg) and waits its
+    turn while they don't fit (see ``HostBudget.acquire``, which gives up
+    with a TimeoutError); the wait is recorded in
+    ``stats["queue_wait_seconds"]``.
+
+    With ``sample_interval`` set, every Docker container the manager starts
+    is sampled from the Docker stats stream; see ``resource_usage()``.
 
-    def __init__(self) -> None:
+    A plugin with an endpoint (an ``endpoint`` kwarg or ``GTC_<NAME>_URL``;
+    see ``ContainerPlugin.get_endpoint``) is bound to that running service
+    instead: no container is created, started, budgeted or stopped, but
+    ``on_start``, ``get_client``, ``close_client`` and ``on_stop`` still run.
+
+    With a ``broker``, containers are leased from the container daemon (see
+    ``gherkin_testcontainers.daemon``) and bound the same way; the lease is
+    returned on ``stop_all``. Plugins the daemon can't provide are started
+    locally.
+    """
+
+    def __init__(
+        self,
+        idle_timeout: float | None = None,
+        budget: HostBudget | None = None,
+        sample_interval: float | None = None,
+        max_samples: int = DEFAULT_MAX_SAMPLES,
+        broker: BrokerClient | None = None,
+    ) -> None:
         self._containers: dict[str, tuple[DockerContainer, Any]] = {}
+        self._pending: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._api_calls_base = SharedDockerClient.api_calls()
+        self.idle_timeout = idle_timeout
+        self._in_use: set[str] = set()
+        self._released_at: dict[str, float] = {}
+        self._paused: set[str] = set()
+        self._not_pausable: set[str] = set()
+        self._idle_thread: threading.Thread | None = None
+        self._closing = threading.Event()
+        self.budget = budget
+        self._reservations: dict[str, str] = {}
+        self.sample_interval = sample_interval
+        self.max_samples = max_samples
+        self._samplers: dict[str, ContainerSampler] = {}
+        self._external: set[str] = set()
+        self.broker = broker
+        self._leases: dict[str, Lease] = {}
+        self.stats: dict[str, Any] = {
+            "docker_api_calls": 0,
+            "start_seconds": {},
+            "pauses": {},
+            "unpause_seconds": {},
+            "queue_wait_seconds": {},
+            "stop_seconds": {},
+        }
+
+    def _update_stats(self) -> None:
+        self.stats["docker_api_calls"] = SharedDockerClient.api_calls() - self._api_calls_base
 
     def start(self, plugin_name: str, **kwargs) -> Any:
-        if plugin_name in self._containers:
-            _, client = self._containers[plugin_name]
+        with self._lock:
+            if plugin_name in self._containers:
+                self._acquire(plugin_name)
+                _, client = self._containers[plugin_name]
+                return client
+            pending = self._pending.get(plugin_name)
+            if pending is None:
+                # Registered before the lock is released, so concurrent
+                # start/submit calls wait for this start instead of racing it.
+                future: Future = Future()
+                self._pending[plugin_name] = future
+        if pending is not None:
+            return pending.result()
+        # Started on the calling thread: some clients are bound to it.
+        try:
+            client = self._start(plugin_name, **kwargs)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(client)
             return client
+        finally:
+            self._finish_pending(plugin_name, future)
 
+    def _start(self, plugin_name: str, **kwargs) -> Any:
         plugin = PluginRegistry.get(plugin_name)
-        container = plugin.create_container(**kwargs)
-        container.start()
-        plugin.on_start(container)
-        client = plugin.get_client(container)
-        self._containers[plugin_name] = (container, client)
+        endpoint = plugin.get_endpoint(**kwargs)
+        kwargs.pop("endpoint", None)
+        lease = None
+        if endpoint is None and self.broker is not None:
+            lease = self._lease(plugin_name, kwargs)
+            if lease is not None:
+                endpoint = lease.endpoint
+        spec: ResourceSpec = kwargs.pop("resources", None) or plugin.get_resources(**kwargs)
+        token = None
+        if endpoint is None and self.budget is not None and not spec.is_empty:
+            queued = time.monotonic()
+            token = self.budget.acquire(spec, label=plugin_name)
+            self.stats["queue_wait_seconds"][plugin_name] = time.monotonic() - queued
+        started = time.monotonic()
+        running = None
+        try:
+            with SharedDockerClient.inject():
+                if endpoint is not None:
+                    container = plugin.create_external(endpoint, **kwargs)
+                else:
+                    container = plugin.create_container(**kwargs)
+                    if spec.enforce and isinstance(container, DockerContainer):
+                        container.with_kwargs(**{**container._kwargs, **spec.docker_limits()})
+                    container.start()
+                running = container
+                plugin.on_start(container)
+                client = plugin.get_client(container)
+        except BaseException:
+            if running is not None:
+                self._abandon(plugin_name, running, external=endpoint is not None)
+            if token is not None:
+                self.budget.release(token)
+            if lease is not None:
+                lease.release()
+            raise
+        with self._lock:
+            self._containers[plugin_name] = (container, client)
+            if endpoint is not None:
+                self._external.add(plugin_name)
+            if lease is not None:
+                self._leases[plugin_name] = lease
+            if token is not None:
+                self._reservations[plugin_name] = token
+            if self.sample_interval is not None and isinstance(container, DockerContainer):
+                self._samplers[plugin_name] = ContainerSampler(
+                    container.get_wrapped_container(), self.sample_interval, self.max_samples
+                ).start()
+            self._in_use.add(plugin_name)
+            self.stats["start_seconds"][plugin_name] = time.monotonic() - started
+            if self.idle_timeout is not None and self._idle_thread is None:
+                self._idle_thread = threading.Thread(
+                    target=self._idle_loop, name="gherkin-testcontainers-idle", daemon=True
+                )
+                self._idle_thread.start()
+        self._update_stats()
         return client
 
+    def _abandon(self, plugin_name: str, container: Any, external: bool) -> None:
+        """Tear down a container whose start failed after it came up; failures are only logged."""
+        plugin = PluginRegistry.get(plugin_name)
+        with SharedDockerClient.inject():
+            try:
+                plugin.on_stop(container)
+            except Exception:
+                logger.warning("on_stop for the failed %s start raised", plugin_name, exc_info=True)
+            if not external:
+                try:
+                    container.stop()
+                except Exception:
+                    logger.warning("Stopping the failed %s container failed", plugin_name, exc_info=True)
+
+    def _lease(self, plugin_name: str, kwargs: dict[str, Any]) -> Lease | None:
+        if not PluginRegistry.get(plugin_name).can_lease:
+            logger.info("Starting %s locally; the container daemon can't pool it", plugin_name)
+            return None
+        try:
+            return self.broker.lease(plugin_name, kwargs)
+        except (OSError, RuntimeError, TypeError) as exc:
+            logger.info("Starting %s locally; the container daemon can't provide it: %s", plugin_name, exc)
+            return None
+
+    def _acquire(self, plugin_name: str) -> None:
+        """Mark a running container as in use, unpausing it first if needed. Holds the lock."""
+        self._in_use.add(plugin_name)
+        if plugin_name not in self._paused:
+            return
+        container, _ = self._containers[plugin_name]
+        started = time.monotonic()
+        container.get_wrapped_container().unpause()
+        self._paused.discard(plugin_name)
+        self.stats["unpause_seconds"].setdefault(plugin_name, []).append(
+            time.monotonic() - started
+        )
+
     def get_client(self, plugin_name: str, **kwargs) -> Any:
-        if plugin_name in self._containers:
-            _, client = self._containers[plugin_name]
-            return client
         return self.start(plugin_name, **kwargs)
 
+    def submit(self, plugin_name: str, **kwargs) -> Future:
+        """Start ``plugin_name`` in the background; the future resolves to its client.
+
+        Repeated calls, and ``start``/``get_client`` calls made while the
+        start is in flight, share the same start.
+        """
+        with self._lock:
+            if plugin_name in self._containers:
+                self._acquire(plugin_name)
+                future: Future = Future()
+                future.set_result(self._containers[plugin_name][1])
+                return future
+            if plugin_name in self._pending:
+                return self._pending[plugin_name]
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(thread_name_prefix="gherkin-testcontainers")
+            future = self._executor.submit(self._start, plugin_name, **kwargs)
+            self._pending[plugin_name] = future
+        future.add_done_callback(lambda _: self._finish_pending(plugin_name, future))
+        return future
+
+    def _finish_pending(self, plugin_name: str, future: Future) -> None:
+        with self._lock:
+            if self._pending.get(plugin_name) is future:
+                del self._pending[plugin_name]
+
+    def get_lazy_client(self, plugin_name: str, **kwargs) -> LazyClient:
+        """Return a proxy that blocks on the container only when first used.
+
+        Plugins whose clients are bound to the creating thread
+        (``background_start = False``) are started on first use instead of
+        in the background.
+        """
+        plugin: ContainerPlugin = PluginRegistry.get(plugin_name)
+        if plugin.background_start:
+            return LazyClient(self.submit(plugin_name, **kwargs).result)
+        return LazyClient(lambda: self.get_client(plugin_name, **kwargs))
+
+    def get_container(self, plugin_name: str) -> DockerContainer:
+        """Return the running container for ``plugin_name``."""
+        with self._lock:
+            pending = self._pending.get(plugin_name)
+        if pending is not None:
+            pending.result()
+        with self._lock:
+            if plugin_name not in self._containers:
+                raise KeyError(f"No running container for plugin '{plugin_name}'")
+            self._acquire(plugin_name)
+            container, _ = self._containers[plugin_name]
+        return container
+
+    def release(self) -> None:
+        """Mark every container as no longer used by the current scenario.
+
+        Shared managers call this after each scenario; released containers
+        become eligible for pausing once ``idle_timeout`` passes.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for plugin_name in self._in_use:
+                self._released_at[plugin_name] = now
+            self._in_use.clear()
+        self._update_stats()
+
+    def reset(self) -> None:
+        """Clean the containers this manager started and ``release()`` them, leaving them running.
+
+        Each plugin's client is closed, its ``reset`` hook cleans the
+        container and a new client is connected. In-memory stand-ins
+        (``MemoryService``) are reset to an empty log the same way. Bound
+        services and leased containers are left as they are: the former
+        aren't ours to clean, and the daemon resets the latter when they're
+        returned.
+        """
+        with self._lock:
+            pending = list(self._pending.values())
+        wait(pending)
+        with self._lock:
+            for plugin_name in list(self._paused):
+                self._acquire(plugin_name)
+            owned = [
+                (plugin_name, container, client)
+                for plugin_name, (container, client) in self._containers.items()
+                if plugin_name not in self._external or isinstance(container, MemoryService)
+            ]
+        with SharedDockerClient.inject():
+            for plugin_name, container, client in owned:
+                plugin = PluginRegistry.get(plugin_name)
+                try:
+                    plugin.close_client(client)
+                except Exception:
+                    logger.warning("Closing the %s client failed", plugin_name, exc_info=True)
+                try:
+                    if isinstance(container, MemoryService):
+                        container.reset()
+                    else:
+                        plugin.reset(container)
+                finally:
+                    client = plugin.get_client(container)
+                    with self._lock:
+                        self._containers[plugin_name] = (container, client)
+        self.release()
+
+    def _idle_loop(self) -> None:
+        interval = min(self.idle_timeout / 2, 1.0)
+        while not self._closing.wait(interval):
+            self.pause_idle()
+
+    def pause_idle(self) -> list[str]:
+        """Pause containers released at least ``idle_timeout`` seconds ago; returns their names."""
+        if self.idle_timeout is None:
+            return []
+        paused = []
+        now = time.monotonic()
+        with self._lock:
+            for plugin_name, (container, _) in self._containers.items():
+                if (
+                    plugin_name in self._in_use
+                    or plugin_name in self._paused
+                    or plugin_name in self._not_pausable
+                    or now - self._released_at.get(plugin_name, now) < self.idle_timeout
+                ):
+                    continue
+                if not isinstance(container, DockerContainer):
+                    # e.g. sqlite's temp file or Playwright's browser context.
+                    self._not_pausable.add(plugin_name)
+                    continue
+                try:
+                    container.get_wrapped_container().pause()
+                except Exception:
+                    logger.warning("Pausing the %s container failed", plugin_name, exc_info=True)
+                    self._not_pausable.add(plugin_name)
+                    continue
+                self._paused.add(plugin_name)
+                pauses = self.stats["pauses"]
+                pauses[plugin_name] = pauses.get(plugin_name, 0) + 1
+                paused.append(plugin_name)
+        return paused
+
+    def idle_report(self) -> dict[str, dict[str, float]]:
+        """Fresh start time vs. mean unpause latency, per plugin that was unpaused."""
+        report = {}
+        for plugin_name, latencies in self.stats["unpause_seconds"].items():
+            report[plugin_name] = {
+                "start_seconds": self.stats["start_seconds"].get(plugin_name, 0.0),
+                "unpauses": len(latencies),
+                "mean_unpause_seconds": sum(latencies) / len(latencies),
+            }
+        return report
+
+    def resource_usage(self, since: float | None = None) -> dict[str, Any]:
+        """Peak/mean CPU and memory plus I/O totals per sampled plugin.
+
+        ``since`` (a ``time.monotonic()`` value) limits the summary to samples
+        taken from then on, e.g. the start of the current scenario.
+        """
+        usage = {}
+        for plugin_name, sampler in self._samplers.items():
+            summary = sampler.summary(since)
+            if summary is not None:
+                usage[plugin_name] = summary
+        return usage
+
     def stop_all(self) -> None:
-        for plugin_name, (container, _) in self._containers.items():
-            plugin = PluginRegistry.get(plugin_name)
-            plugin.on_stop(container)
-            container.stop()
+        """Stop every container and return its lease and budget reservation.
+
+        A plugin whose teardown fails is logged and skipped over; the first
+        such error is raised once everything else has been released.
+        """
+        # Let background starts finish so their containers get stopped too;
+        # a failed start leaves nothing registered to stop.
+        with self._lock:
+            pending = list(self._pending.values())
+        wait(pending)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._closing.set()
+        if self._idle_thread is not None:
+            self._idle_thread.join()
+            self._idle_thread = None
+        self._closing.clear()
+        with self._lock:
+            # Clients need a running server to close cleanly.
+            for plugin_name in list(self._paused):
+                self._acquire(plugin_name)
+        for sampler in self._samplers.values():
+            sampler.stop()
+        first_error: Exception | None = None
+        with SharedDockerClient.inject():
+            for plugin_name, (container, client) in self._containers.items():
+                stopping = time.monotonic()
+                try:
+                    self._stop_one(plugin_name, container, client)
+                except Exception as exc:
+                    # Keep going so the other containers, leases and
+                    # reservations are still released.
+                    logger.error("Stopping the %s container failed", plugin_name, exc_info=True)
+                    first_error = first_error or exc
+                finally:
+                    lease = self._leases.pop(plugin_name, None)
+                    if lease is not None:
+                        lease.release()
+                    self.stats["stop_seconds"][plugin_name] = time.monotonic() - stopping
+                    token = self._reservations.pop(plugin_name, None)
+                    if token is not None:
+                        self.budget.release(token)
         self._containers.clear()
+        self._samplers.clear()
+        self._external.clear()
+        self._in_use.clear()
+        self._released_at.clear()
+        self._not_pausable.clear()
+        self._update_stats()
+        if first_error is not None:
+            raise first_error
+
+    def _stop_one(self, plugin_name: str, container: Any, client: Any) -> None:
+        plugin = PluginRegistry.get(plugin_name)
+        try:
+            plugin.close_client(client)
+        except Exception:
+            # Still stop the container; it takes the server side with it.
+            logger.warning("Closing the %s client failed", plugin_name, exc_info=True)
+        try:
+            plugin.on_stop(container)
+        finally:
+            if plugin_name not in self._external:
+                container.stop()
@@ -0,0 +1,173 @@
+"""In-process stand-ins for message brokers: thread-safe in-memory topic logs.
+
+Plugins that support it accept a ``memory://`` endpoint (``endpoint=`` or
+``GTC_<PLUGIN>_URL``), or every such plugin at once with
+``GTC_STANDINS=all``, and bind to a ``MemoryService`` instead of a
+container. Their stand-in clients keep the surface of the real ones and
+read and write one ``MemoryLog``, so scenarios that test application
+logic around a broker run without Docker.
+
+A ``MemoryLog`` holds one append-only list of records per topic. Readers
+either track their own offset (``read``) or share a named cursor
+(``claim``), which hands every record to exactly one reader of the group:
+Kafka consumer groups, Pulsar subscriptions and Pub/Sub subscriptions are
+all cursors. There is a single partition per topic, no retention limit and
+no redelivery timeout; nacked records are redelivered at once.
+"""
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable
+
+from gherkin_testcontainers.external import ExternalService
+
+MEMORY_SCHEME = "memory"
+STANDINS_ENV = "GTC_STANDINS"
+
+
+def is_memory_endpoint(endpoint: str | None) -> bool:
+    return bool(endpoint) and endpoint.startswith(f"{MEMORY_SCHEME}:")
+
+
+def standin_selected(plugin_name: str) -> bool:
+    """Whether ``GTC_STANDINS`` (``all`` or a comma-separated list of plugin names) selects the plugin."""
+    selected = {name.strip() for name in os.environ.get(STANDINS_ENV, "").split(",")}
+    return "all" in selected or plugin_name in selected
+
+
+@dataclass(frozen=True)
+class Record:
+    topic: str
+    offset: int
+    value: Any
+    key: Any = None
+    headers: dict[str, Any] = field(default_factory=dict)
+    timestamp: float = 0.0
+    redeliveries: int = 0
+
+
+class MemoryLog:
+    """Topics as append-only record lists, plus shared consumer cursors."""
+
+    def __init__(self) -> None:
+        self._topics: dict[str, list[Record]] = {}
+        self._cursors: dict[tuple[str, str], int] = {}
+        self._redeliveries: dict[tuple[str, str], deque[Record]] = {}
+        self._version = 0
+        self._changed = threading.Condition()
+
+    def create(self, topic: str) -> bool:
+        """Create ``topic``; False if it already exists."""
+        with self._changed:
+            if topic in self._topics:
+                return False
+            self._topics[topic] = []
+            return True
+
+    def delete(self, topic: str) -> None:
+        with self._changed:
+            self._topics.pop(topic, None)
+
+    def __contains__(self, topic: str) -> bool:
+        with self._changed:
+            return topic in self._topics
+
+    def topics(self) -> list[str]:
+        with self._changed:
+            return list(self._topics)
+
+    def append(self, topic: str, value: Any, key: Any = None, headers: dict[str, Any] | None = None) -> Record:
+        """Append a record, creating ``topic`` if needed, and wake waiting readers."""
+        with self._changed:
+            records = self._topics.setdefault(topic, [])
+            record = Record(topic, len(records), value, key, dict(headers or {}), time.time())
+            records.append(record)
+            self._version += 1
+            self._changed.notify_all()
+        return record
+
+    def end_offset(self, topic: str) -> int:
+        with self._changed:
+            return len(self._topics.get(topic, ()))
+
+    def read(self, topic: str, offset: int, max_count: int | None = None) -> list[Record]:
+        """Records of ``topic`` from ``offset`` on, without waiting."""
+        with self._changed:
+            records = self._topics.get(topic, ())
+            stop = None if max_count is None else offset + max_count
+            return list(records[offset:stop])
+
+    def subscribe(self, group: str, topic: str, from_end: bool = False) -> None:
+        """Create the cursor of ``group`` on ``topic`` at the start (or end) of the topic, unless it exists."""
+        with self._changed:
+            if (group, topic) not in self._cursors:
+                self._cursors[(group, topic)] = len(self._topics.get(topic, ())) if from_end else 0
+
+    def claim(self, group: str, topic: str, max_count: int | None = None) -> list[Record]:
+        """Take the next records of ``group``'s cursor, redeliveries first, without waiting."""
+        key = (group, topic)
+        with self._changed:
+            claimed = []
+            pending = self._redeliveries.get(key)
+            while pending and (max_count is None or len(claimed) < max_count):
+                claimed.append(pending.popleft())
+            remaining = None if max_count is None else max_count - len(claimed)
+            start = self._cursors.setdefault(key, 0)
+            records = self._topics.get(topic, ())
+            stop = len(records) if remaining is None else min(len(records), start + remaining)
+            claimed.extend(records[start:stop])
+            self._cursors[key] = max(start, stop)
+            return claimed
+
+    def seek(self, group: str, topic: str, offset: int) -> None:
+        with self._changed:
+            self._cursors[(group, topic)] = offset
+            self._redeliveries.pop((group, topic), None)
+
+    def redeliver(self, group: str, records: list[Record]) -> None:
+        """Hand ``records`` (claimed by ``group`` but not processed) to its next ``claim``."""
+        with self._changed:
+            for record in records:
+                self._redeliveries.setdefault((group, record.topic), deque()).append(
+                    replace(record, redeliveries=record.redeliveries + 1)
+                )
+            self._version += 1
+            self._changed.notify_all()
+
+    def poll(self, fetch: Callable[[], list], timeout: float | None) -> list:
+        """Call ``fetch`` until it returns something or ``timeout`` seconds pass (None: forever)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._changed:
+                version = self._version
+            found = fetch()
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if found or (remaining is not None and remaining <= 0):
+                return found
+            with self._changed:
+                self._changed.wait_for(lambda: self._version != version, remaining)
+
+
+class MemoryService(ExternalService):
+    """What a plugin binds to for a ``memory://`` endpoint: a fresh, private ``MemoryLog``.
+
+    Each scenario (or feature/session, depending on the scope) gets its own
+    service, so nothing leaks between them, like with containers.
+    """
+
+    def __init__(self, url: str = f"{MEMORY_SCHEME}://") -> None:
+        super().__init__(url)
+        self.log = MemoryLog()
+
+    def reset(self) -> None:
+        """Drop every topic and cursor, as a fresh service would have none.
+
+        Stand-in clients created before the reset may keep the old log, so
+        create new ones afterwards (``ContainerManager.reset`` does).
+        """
+        self.log = MemoryLog()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.url})"
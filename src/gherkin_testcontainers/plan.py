@@ -0,0 +1,122 @@
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from gherkin_testcontainers.registry import PluginRegistry
+from gherkin_testcontainers.scan import ContainerRequest, ScenarioScan
+
+
+@dataclass
+class SignatureGroup:
+    """Scenarios that request exactly the same set of containers."""
+
+    signature: tuple[str, ...]
+    requests: list[ContainerRequest]
+    scans: list[ScenarioScan] = field(default_factory=list)
+
+
+@dataclass
+class Plan:
+    """Scenarios in file order plus the same scenarios grouped by container signature."""
+
+    scans: list[ScenarioScan]
+    groups: list[SignatureGroup]
+    costs: dict[str, float]
+    unknown_plugins: list[str]
+
+    @property
+    def reordered(self) -> list[ScenarioScan]:
+        return [scan for group in self.groups for scan in group.scans]
+
+    def request_cost(self, signature: str) -> float:
+        return self.costs.get(signature, 0.0)
+
+    def cost_without_reuse(self) -> float:
+        """Startup cost when every scenario starts its own containers."""
+        return sum(self.request_cost(s) for scan in self.scans for s in scan.signature)
+
+    def cost_with_reuse(self, scans: Iterable[ScenarioScan]) -> float:
+        """Startup cost when a container is kept while consecutive scenarios request it."""
+        total = 0.0
+        previous: set[str] = set()
+        for scan in scans:
+            current = set(scan.signature)
+            total += sum(self.request_cost(s) for s in current - previous)
+            previous = current
+        return total
+
+
+def _estimate(request: ContainerRequest, unknown: set[str]) -> float:
+    try:
+        plugin = PluginRegistry.get(request.plugin_name)
+    except KeyError:
+        unknown.add(request.plugin_name)
+        return 0.0
+    if plugin.get_endpoint(**request.kwargs) is not None:
+        # Bound to an external service: nothing to start.
+        return 0.0
+    return plugin.estimate_startup(**request.kwargs)
+
+
+def _order_groups(groups: list[SignatureGroup], costs: dict[str, float]) -> list[SignatureGroup]:
+    """Greedy ordering: after each group, take the one sharing the most startup cost with it.
+
+    Ties keep first-appearance order, so unrelated groups stay in file order.
+    """
+    remaining = list(groups)
+    ordered = [remaining.pop(0)] if remaining else []
+    while remaining:
+        current = set(ordered[-1].signature)
+        best = max(
+            remaining,
+            key=lambda group: sum(costs.get(s, 0.0) for s in current & set(group.signature)),
+        )
+        remaining.remove(best)
+        ordered.append(best)
+    return ordered
+
+
+def build_plan(scans: Iterable[ScenarioScan]) -> Plan:
+    """Group ``scans`` by container signature and estimate startup costs."""
+    scans = list(scans)
+    unknown: set[str] = set()
+    costs: dict[str, float] = {}
+    by_signature: dict[tuple[str, ...], SignatureGroup] = {}
+    for scan in scans:
+        requests: dict[str, ContainerRequest] = {}
+        for request in scan.requests:
+            requests.setdefault(request.signature, request)
+            if request.signature not in costs:
+                costs[request.signature] = _estimate(request, unknown)
+        group = by_signature.get(scan.signature)
+        if group is None:
+            group = by_signature[scan.signature] = SignatureGroup(
+                scan.signature, [requests[s] for s in scan.signature]
+            )
+        group.scans.append(scan)
+    return Plan(
+        scans=scans,
+        groups=_order_groups(list(by_signature.values()), costs),
+        costs=costs,
+        unknown_plugins=sorted(unknown),
+    )
+
+
+def format_plan(plan: Plan, verbose: bool = False) -> str:
+    """Human-readable summary of ``plan``."""
+    lines = []
+    for group in plan.groups:
+        cost = sum(plan.request_cost(s) for s in group.signature)
+        label = ", ".join(group.signature) or "(no containers)"
+        lines.append(f"{label}")
+        lines.append(f"    {len(group.scans)} scenario(s), ~{cost:.0f}s startup")
+        if verbose:
+            lines.extend(f"    {scan.location}" for scan in group.scans)
+    lines.append("")
+    lines.append(f"Scenarios: {len(plan.scans)}, container signatures: {len(plan.groups)}")
+    lines.append("Estimated container startup:")
+    lines.append(f"    new containers per scenario: ~{plan.cost_without_reuse():.0f}s")
+    lines.append(f"    file order, reusing:         ~{plan.cost_with_reuse(plan.scans):.0f}s")
+    lines.append(f"    grouped, reusing:            ~{plan.cost_with_reuse(plan.reordered):.0f}s")
+    if plan.unknown_plugins:
+        lines.append(f"Plugins not installed (no estimate): {', '.join(plan.unknown_plugins)}")
+    return "\n".join(lines)
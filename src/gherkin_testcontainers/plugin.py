@@ -1,12 +1,47 @@
+import asyncio
+import inspect
+import os
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Callable, Iterable
 
 from testcontainers.core.container import DockerContainer
 
+from gherkin_testcontainers.budget import ResourceSpec
+from gherkin_testcontainers.memory import MEMORY_SCHEME, standin_selected
+
 
 class ContainerPlugin(ABC):
     """Base class for all container plugins."""
 
+    #: Rough seconds from ``create_container`` to a usable client, excluding
+    #: image pulls. Only used for planning; see ``estimate_startup``.
+    startup_estimate: float = 5.0
+
+    #: Whether the container may be started and its client created on a
+    #: worker thread (``use_container(..., lazy=True)``). Set to False when
+    #: the client only works on the thread that created it.
+    background_start: bool = True
+
+    #: Memory/CPU a running container is expected to use; reserved against
+    #: the host budget (``HostBudget``) before the container starts.
+    resources: ResourceSpec = ResourceSpec()
+
+    #: Most load-generation workers that may share one client (see
+    #: ``load_operation``); None means no limit. 1 runs the load on the
+    #: calling thread, for clients bound to the thread that created them.
+    #: Coroutine operations run as tasks on one thread and aren't capped.
+    max_load_concurrency: int | None = None
+
+    #: Whether each load-generation worker gets a client of its own from
+    #: ``get_client`` instead of sharing the scenario's, for clients that
+    #: run one call at a time, like a database connection. The clients are
+    #: closed when the load ends.
+    load_client_per_worker: bool = False
+
+    #: Whether ``create_external`` accepts a ``memory://`` endpoint and binds
+    #: to an in-process stand-in (see ``gherkin_testcontainers.memory``).
+    supports_standin: bool = False
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -20,6 +55,134 @@ class ContainerPlugin(ABC):
     def get_client(self, container: DockerContainer) -> Any:
         """Return a raw client/connection from a running container."""
 
+    def get_endpoint(self, **kwargs) -> str | None:
+        """URL of an already-running service to use instead of starting a container.
+
+        Taken from an ``endpoint`` kwarg, else from the ``GTC_<NAME>_URL``
+        environment variable (e.g. ``GTC_POSTGRES_URL``), else ``memory://``
+        for plugins with ``supports_standin`` that ``GTC_STANDINS`` selects.
+        None means start a container as usual.
+        """
+        endpoint = kwargs.get("endpoint") or os.environ.get(self.endpoint_env)
+        if not endpoint and self.supports_standin and standin_selected(self.name):
+            endpoint = f"{MEMORY_SCHEME}://"
+        return endpoint or None
+
+    @property
+    def endpoint_env(self) -> str:
+        """Environment variable that binds this plugin to an external service."""
+        return f"GTC_{self.name.upper()}_URL"
+
+    def create_external(self, endpoint: str, **kwargs) -> Any:
+        """Stand-in for ``create_container`` pointing at the service at ``endpoint``.
+
+        The result is passed to ``on_start``, ``get_client`` and ``on_stop``
+        like a container, but is never started or stopped. Plugins that
+        support external services return an ``ExternalService`` here.
+        """
+        raise NotImplementedError(f"The '{self.name}' plugin can't use an external service")
+
+    def external_url(self, container: DockerContainer) -> str:
+        """Endpoint for ``create_external`` that reaches the running ``container``.
+
+        The container daemon (``gherkin_testcontainers.daemon``) starts
+        containers and hands this URL to ``behave`` processes, so plugins that
+        implement ``create_external`` should implement this too.
+        """
+        raise NotImplementedError(f"The '{self.name}' plugin can't be leased from the daemon")
+
+    def reset(self, container: DockerContainer) -> None:
+        """Return a container to a clean state for its next user.
+
+        Called when a daemon lease ends and, under ``bench``, where a scope
+        would otherwise stop the container; the client is closed first. The
+        default does nothing, so the daemon and ``bench`` won't reuse the
+        plugin's containers (see ``can_reset``). If this raises, the daemon
+        stops the container instead of reusing it.
+        """
+
+    @property
+    def can_reset(self) -> bool:
+        """Whether the plugin implements ``reset``, so its containers can be reused between runs."""
+        return type(self).reset is not ContainerPlugin.reset
+
+    @property
+    def can_lease(self) -> bool:
+        """Whether the container daemon can pool the plugin: it implements ``external_url`` and ``reset``."""
+        return self.can_reset and type(self).external_url is not ContainerPlugin.external_url
+
+    def get_images(self, **kwargs) -> list[str]:
+        """Docker images that ``create_container(**kwargs)`` would run.
+
+        Used to pre-pull images; plugins with a default image or helper
+        containers should override this. Plugins that don't use Docker
+        return an empty list.
+        """
+        if "image" in kwargs:
+            return [kwargs["image"]]
+        return []
+
+    def estimate_startup(self, **kwargs) -> float:
+        """Estimated startup time in seconds for ``create_container(**kwargs)``."""
+        return self.startup_estimate
+
+    def get_resources(self, **kwargs) -> ResourceSpec:
+        """Resources ``create_container(**kwargs)`` will need; defaults to ``resources``."""
+        return self.resources
+
+    def bulk_load(self, client: Any, table: str, columns: list[str], rows: Iterable[tuple]) -> None:
+        """Load ``rows`` (tuples in ``columns`` order) into ``table`` as fast as the backend allows.
+
+        ``rows`` may be a one-shot iterator; consume it once, without
+        materializing it. Used by ``gherkin_testcontainers.seeding``.
+        """
+        raise NotImplementedError(f"The '{self.name}' plugin doesn't support bulk loading")
+
+    def bulk_publish(self, client: Any, topic: str, messages: Iterable[bytes]) -> None:
+        """Publish ``messages`` to ``topic`` and return once the broker has acknowledged them all.
+
+        Like ``bulk_load``, ``messages`` may be a one-shot iterator. Used by
+        ``gherkin_testcontainers.seeding.publish``.
+        """
+        raise NotImplementedError(f"The '{self.name}' plugin doesn't support bulk publishing")
+
+    def load_operation(self, client: Any, target: str, **options) -> Callable[[int], Any]:
+        """One unit of load against ``target``, as a callable taking the operation's index.
+
+        SQL plugins run ``target`` as a statement, messaging plugins publish
+        a message to topic ``target`` and wait for the broker's ack, and
+        browser plugins load URL ``target``. Used by
+        ``gherkin_testcontainers.loadgen``.
+        """
+        raise NotImplementedError(f"The '{self.name}' plugin doesn't support load generation")
+
+    def close_client(self, client: Any) -> None:
+        """Release a client returned by ``get_client``; called before ``on_stop``.
+
+        The default calls ``client.close()`` if it exists, running the result
+        to completion on a fresh event loop if it's awaitable (async SDK
+        clients). That can't happen inside a running loop, and async clients
+        tied to the loop that used them should be closed there; plugins
+        handing those out override this.
+        """
+        close = getattr(client, "close", None)
+        if close is None:
+            return
+        result = close()
+        if not inspect.isawaitable(result):
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(result)
+            return
+        if inspect.iscoroutine(result):
+            result.close()
+        raise RuntimeError(
+            f"Can't close the '{self.name}' client from inside a running event loop; "
+            "the plugin must override close_client to close its async clients on their own loop"
+        )
+
     def on_start(self, container: DockerContainer) -> None:
         """Optional hook called after container starts."""
 
@@ -0,0 +1,88 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable
+
+DEFAULT_PULL_WORKERS = 4
+
+ProgressCallback = Callable[[str, str], None]
+
+
+def print_progress(image: str, message: str) -> None:
+    print(f"[prepull] {image}: {message}", file=sys.stderr, flush=True)
+
+
+def is_image_present(client: Any, image: str) -> bool:
+    """True if ``image`` is available locally.
+
+    For ``name@sha256:...`` references the lookup is by digest, so a local
+    image carrying the same tag but a different digest doesn't count.
+    """
+    from docker.errors import ImageNotFound
+
+    try:
+        client.images.get(image)
+    except ImageNotFound:
+        return False
+    return True
+
+
+def pull_image(client: Any, image: str, progress: ProgressCallback = print_progress) -> str:
+    """Pull one image unless present; returns ``"present"`` or ``"pulled"``."""
+    from docker.utils import parse_repository_tag
+
+    if is_image_present(client, image):
+        progress(image, "already present")
+        return "present"
+
+    repository, tag = parse_repository_tag(image)
+    if tag is None:
+        tag = "latest"
+    started = time.monotonic()
+    layers: set[str] = set()
+    finished: set[str] = set()
+    progress(image, "pulling")
+    for event in client.api.pull(repository, tag=tag, stream=True, decode=True):
+        if "error" in event:
+            raise RuntimeError(event["error"])
+        layer = event.get("id")
+        status = event.get("status", "")
+        if layer is None or status.startswith("Pulling from"):
+            continue
+        layers.add(layer)
+        if status in ("Pull complete", "Already exists") and layer not in finished:
+            finished.add(layer)
+            progress(image, f"{len(finished)}/{len(layers)} layers")
+    progress(image, f"pulled in {time.monotonic() - started:.1f}s")
+    return "pulled"
+
+
+def prepull_images(
+    images: Iterable[str],
+    max_workers: int = DEFAULT_PULL_WORKERS,
+    progress: ProgressCallback = print_progress,
+    client: Any = None,
+) -> dict[str, str]:
+    """Pull ``images`` concurrently, skipping those already present.
+
+    Returns ``{image: outcome}`` where outcome is ``"present"``, ``"pulled"``
+    or ``"failed: <reason>"``. A failed pull doesn't stop the others; the
+    scenario that needs the image will report the error when it starts.
+    """
+    images = list(dict.fromkeys(images))
+    if not images:
+        return {}
+    if client is None:
+        from gherkin_testcontainers.docker_client import SharedDockerClient
+        client = SharedDockerClient.get().client
+
+    def pull(image: str) -> str:
+        try:
+            return pull_image(client, image, progress)
+        except Exception as exc:
+            progress(image, f"failed: {exc}")
+            return f"failed: {exc}"
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        outcomes = list(pool.map(pull, images))
+    return dict(zip(images, outcomes))
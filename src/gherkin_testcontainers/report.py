@@ -0,0 +1,63 @@
+import json
+import os
+import time
+from typing import Any
+
+
+def scenario_lifecycle(before: dict[str, Any], after: dict[str, Any]) -> dict[str, Any]:
+    """The part of ``ContainerManager.stats`` produced between two snapshots.
+
+    Shared managers accumulate stats over many scenarios; this keeps only
+    the starts, waits, unpauses, stops and API calls of one scenario.
+    """
+
+    def new_entries(key: str) -> dict[str, Any]:
+        old = before.get(key, {})
+        return {name: value for name, value in after.get(key, {}).items() if old.get(name) != value}
+
+    old_unpauses = before.get("unpause_seconds", {})
+    return {
+        "docker_api_calls": after.get("docker_api_calls", 0) - before.get("docker_api_calls", 0),
+        "start_seconds": new_entries("start_seconds"),
+        "queue_wait_seconds": new_entries("queue_wait_seconds"),
+        "stop_seconds": new_entries("stop_seconds"),
+        "unpause_seconds": {
+            name: latencies[len(old_unpauses.get(name, [])):]
+            for name, latencies in after.get("unpause_seconds", {}).items()
+            if len(latencies) > len(old_unpauses.get(name, []))
+        },
+    }
+
+
+class RunReport:
+    """Per-scenario container lifecycle timings and resource usage, written as JSON."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.started_at = time.time()
+        self.scenarios: list[dict[str, Any]] = []
+
+    def add_scenario(self, scenario: Any, duration: float, **sections: Any) -> None:
+        status = getattr(scenario, "status", None)
+        self.scenarios.append({
+            "feature": getattr(getattr(scenario, "feature", None), "name", None),
+            "name": scenario.name,
+            "location": f"{scenario.filename}:{scenario.line}",
+            "status": getattr(status, "name", None if status is None else str(status)),
+            "duration_seconds": duration,
+            **sections,
+        })
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "started_at": self.started_at,
+            "finished_at": time.time(),
+            "scenarios": self.scenarios,
+        }
+
+    def write(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as handle:
+            json.dump(self.to_dict(), handle, indent=2)
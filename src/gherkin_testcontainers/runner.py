@@ -0,0 +1,59 @@
+"""A ``behave`` runner that runs scenario locations in the order they are listed.
+
+``behave @run.txt`` merges consecutive locations in the same feature file
+into one feature and runs its scenarios in file order, so a run list that
+reorders scenarios within a file (``gherkin-testcontainers plan -o``) is
+silently undone. ``PlanRunner`` splits the list wherever that would happen
+and runs each part as its own copy of the feature::
+
+    behave --runner=gherkin_testcontainers.runner:PlanRunner @run.txt
+
+Each copy runs the feature's hooks and ``Background`` again, so containers
+are only kept across the parts with ``setup_hooks(scope="session")``.
+"""
+from typing import Any, Iterable
+
+from behave.formatter._registry import make_formatters
+from behave.runner import Context, Runner
+from behave.runner_util import parse_features
+
+PLAN_RUNNER = "gherkin_testcontainers.runner:PlanRunner"
+
+
+def split_in_order(locations: Iterable[Any]) -> list[list[Any]]:
+    """Split ``locations`` where behave would merge a location with an earlier line of the same file."""
+    parts: list[list[Any]] = []
+    previous = None
+    for location in locations:
+        if (
+            previous is None
+            or (location.filename == previous.filename and (location.line or 0) <= (previous.line or 0))
+        ):
+            parts.append([])
+        parts[-1].append(location)
+        previous = location
+    return parts
+
+
+def parse_in_order(locations: Iterable[Any], language: str | None = None) -> list:
+    """Parse ``locations`` into features whose scenarios run in the listed order."""
+    features = []
+    for part in split_in_order(locations):
+        features.extend(parse_features(part, language=language))
+    return features
+
+
+class PlanRunner(Runner):
+    """``behave.runner:Runner`` that keeps the order of the scenario locations it is given."""
+
+    def run_with_paths(self):
+        self.context = Context(self)
+        self.load_hooks()
+        self.load_step_definitions()
+        locations = [
+            location for location in self.feature_locations()
+            if not self.config.exclude(location)
+        ]
+        self.features.extend(parse_in_order(locations, language=self.config.lang))
+        self.formatters = make_formatters(self.config, self.config.outputs)
+        return self.run_model()
@@ -0,0 +1,140 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+DEFAULT_SAMPLE_INTERVAL = 1.0
+DEFAULT_MAX_SAMPLES = 3600
+
+
+@dataclass(frozen=True)
+class UsageSample:
+    """One reading from the Docker stats stream, reduced to what we report."""
+
+    timestamp: float
+    cpu_percent: float
+    memory_bytes: int
+    block_read_bytes: int
+    block_write_bytes: int
+    net_rx_bytes: int
+    net_tx_bytes: int
+
+
+def parse_stats(stats: dict[str, Any], timestamp: float) -> UsageSample | None:
+    """Turn a ``docker stats`` JSON document into a ``UsageSample``.
+
+    CPU is computed like ``docker stats`` does: container CPU time over host
+    CPU time since the previous reading, scaled by the number of CPUs.
+    Memory excludes page cache. Returns None for documents without CPU data
+    (e.g. the first reading of a stopped container).
+    """
+    cpu = stats.get("cpu_stats") or {}
+    precpu = stats.get("precpu_stats") or {}
+    usage = cpu.get("cpu_usage") or {}
+    if "total_usage" not in usage:
+        return None
+    cpu_delta = usage["total_usage"] - (precpu.get("cpu_usage") or {}).get("total_usage", 0)
+    system_delta = cpu.get("system_cpu_usage", 0) - precpu.get("system_cpu_usage", 0)
+    online_cpus = cpu.get("online_cpus") or len(usage.get("percpu_usage") or []) or 1
+    cpu_percent = cpu_delta / system_delta * online_cpus * 100.0 if system_delta > 0 else 0.0
+
+    memory = stats.get("memory_stats") or {}
+    memory_detail = memory.get("stats") or {}
+    cache = memory_detail.get("inactive_file", memory_detail.get("cache", 0))
+    memory_bytes = max(memory.get("usage", 0) - cache, 0)
+
+    block_read = block_write = 0
+    for entry in (stats.get("blkio_stats") or {}).get("io_service_bytes_recursive") or []:
+        op = entry.get("op", "").lower()
+        if op == "read":
+            block_read += entry.get("value", 0)
+        elif op == "write":
+            block_write += entry.get("value", 0)
+
+    networks = (stats.get("networks") or {}).values()
+    return UsageSample(
+        timestamp=timestamp,
+        cpu_percent=cpu_percent,
+        memory_bytes=memory_bytes,
+        block_read_bytes=block_read,
+        block_write_bytes=block_write,
+        net_rx_bytes=sum(network.get("rx_bytes", 0) for network in networks),
+        net_tx_bytes=sum(network.get("tx_bytes", 0) for network in networks),
+    )
+
+
+def summarize(samples: list[UsageSample]) -> dict[str, Any] | None:
+    """Peak and mean CPU/memory plus block I/O and network totals over ``samples``."""
+    if not samples:
+        return None
+    first, last = samples[0], samples[-1]
+    cpu = [sample.cpu_percent for sample in samples]
+    memory = [sample.memory_bytes for sample in samples]
+    return {
+        "samples": len(samples),
+        "cpu_percent": {"peak": max(cpu), "mean": sum(cpu) / len(cpu)},
+        "memory_bytes": {"peak": max(memory), "mean": sum(memory) / len(memory)},
+        "block_read_bytes": last.block_read_bytes - first.block_read_bytes,
+        "block_write_bytes": last.block_write_bytes - first.block_write_bytes,
+        "net_rx_bytes": last.net_rx_bytes - first.net_rx_bytes,
+        "net_tx_bytes": last.net_tx_bytes - first.net_tx_bytes,
+    }
+
+
+class ContainerSampler:
+    """Reads a container's Docker stats stream on a background thread.
+
+    The daemon emits about one reading per second; readings closer together
+    than ``interval`` are dropped, and only the last ``max_samples`` are kept.
+    """
+
+    def __init__(
+        self,
+        docker_container: Any,
+        interval: float = DEFAULT_SAMPLE_INTERVAL,
+        max_samples: int = DEFAULT_MAX_SAMPLES,
+    ) -> None:
+        self.docker_container = docker_container
+        self.interval = interval
+        self.samples: deque[UsageSample] = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="gherkin-testcontainers-stats", daemon=True
+        )
+
+    def start(self) -> "ContainerSampler":
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        last = float("-inf")
+        try:
+            for stats in self.docker_container.stats(stream=True, decode=True):
+                if self._stopping.is_set():
+                    return
+                now = time.monotonic()
+                if now - last < self.interval:
+                    continue
+                sample = parse_stats(stats, now)
+                if sample is None:
+                    continue
+                last = now
+                with self._lock:
+                    self.samples.append(sample)
+        except Exception:
+            # The stream ends with an error when the container goes away.
+            return
+
+    def summary(self, since: float | None = None) -> dict[str, Any] | None:
+        """Summarize the samples taken at or after ``since`` (``time.monotonic()``)."""
+        with self._lock:
+            samples = [s for s in self.samples if since is None or s.timestamp >= since]
+        return summarize(samples)
+
+    def stop(self, timeout: float = 0.0) -> None:
+        """Stop sampling; the thread exits at the next reading or when the container stops."""
+        self._stopping.set()
+        if timeout:
+            self._thread.join(timeout)
@@ -0,0 +1,112 @@
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from gherkin_testcontainers.registry import PluginRegistry
+
+
+@dataclass
+class ContainerRequest:
+    """A ``use_container(plugin_name, **kwargs)`` request found on a step."""
+
+    plugin_name: str
+    kwargs: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def signature(self) -> str:
+        """Stable key identifying the plugin and kwargs of this request."""
+        items = ", ".join(f"{k}={v!r}" for k, v in sorted(self.kwargs.items()))
+        return f"{self.plugin_name}({items})"
+
+
+@dataclass
+class ScenarioScan:
+    """The container requests reachable from one scenario's steps."""
+
+    scenario: Any
+    requests: list[ContainerRequest] = field(default_factory=list)
+
+    @property
+    def location(self) -> str:
+        return f"{self.scenario.filename}:{self.scenario.line}"
+
+    @property
+    def signature(self) -> tuple[str, ...]:
+        """Sorted, de-duplicated request signatures of the scenario."""
+        return tuple(sorted({request.signature for request in self.requests}))
+
+
+def load_features(paths: Iterable[str] = (), tags: Iterable[str] = ()) -> tuple[list, Any, Any]:
+    """Parse features and load step definitions the way ``behave`` would.
+
+    Returns ``(features, tag_expression, step_registry)``.
+    """
+    from behave.configuration import Configuration
+    from behave.runner import Runner
+    from behave.step_registry import registry
+
+    command_args = [*paths, *(f"--tags={tag}" for tag in tags)]
+    config = Configuration(command_args=command_args, load_config=False)
+    runner = Runner(config)
+    with runner.path_manager:
+        runner.setup_paths()
+        runner.load_step_definitions()
+        features = parse_selected_features(config)
+    return features, config.tag_expression, runner.step_registry or registry
+
+
+def parse_selected_features(config: Any) -> list:
+    """Parse the feature files a ``behave`` configuration selects, without loading steps."""
+    from behave.runner_util import collect_feature_locations, parse_features
+
+    locations = [
+        location for location in collect_feature_locations(config.paths)
+        if not config.exclude(location)
+    ]
+    return parse_features(locations, language=config.lang)
+
+
+def scan_features(features: Iterable[Any], tag_expression: Any = None, step_registry: Any = None) -> list[ScenarioScan]:
+    """Map every selected scenario to the container requests of its matched steps."""
+    if step_registry is None:
+        from behave.step_registry import registry as step_registry
+
+    scans = []
+    for feature in features:
+        for scenario in feature.walk_scenarios():
+            if tag_expression is not None and not scenario.should_run_with_tags(tag_expression):
+                continue
+            scan = ScenarioScan(scenario)
+            for step in scenario.all_steps:
+                match = step_registry.find_match(step)
+                if match is None:
+                    continue
+                for plugin_name, kwargs in getattr(match.func, "container_requests", []):
+                    scan.requests.append(ContainerRequest(plugin_name, dict(kwargs)))
+            scans.append(scan)
+    return scans
+
+
+def resolve_images(scans: Iterable[ScenarioScan]) -> dict[str, list[str]]:
+    """Return ``{image: [plugin names]}`` for every request in ``scans``.
+
+    Requests for plugins that aren't installed, or that are bound to an
+    external service (``ContainerPlugin.get_endpoint``), are skipped.
+    """
+    images: dict[str, list[str]] = {}
+    seen: set[str] = set()
+    for scan in scans:
+        for request in scan.requests:
+            if request.signature in seen:
+                continue
+            seen.add(request.signature)
+            try:
+                plugin = PluginRegistry.get(request.plugin_name)
+            except KeyError:
+                continue
+            if plugin.get_endpoint(**request.kwargs) is not None:
+                continue
+            for image in plugin.get_images(**request.kwargs):
+                plugins = images.setdefault(image, [])
+                if request.plugin_name not in plugins:
+                    plugins.append(request.plugin_name)
+    return images
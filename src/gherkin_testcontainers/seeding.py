@@ -0,0 +1,151 @@
+import csv
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator
+
+from gherkin_testcontainers.registry import PluginRegistry
+
+DEFAULT_PARQUET_BATCH_SIZE = 10_000
+
+
+@dataclass
+class RowSource:
+    """Column names plus a (possibly lazy) iterable of row tuples."""
+
+    columns: list[str]
+    rows: Iterable[tuple]
+
+
+@dataclass
+class SeedResult:
+    #: Table (``seed``) or topic (``publish``) the rows went to.
+    table: str
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float("inf")
+
+
+class CountingIterator:
+    """Passes rows through unchanged while counting them."""
+
+    def __init__(self, rows: Iterable[tuple]) -> None:
+        self._rows = iter(rows)
+        self.count = 0
+
+    def __iter__(self) -> "CountingIterator":
+        return self
+
+    def __next__(self) -> tuple:
+        row = next(self._rows)
+        self.count += 1
+        return row
+
+
+def _cell(value: str) -> str | None:
+    # Tables and CSV have no NULL; an empty cell is the closest thing.
+    return value if value != "" else None
+
+
+def table_source(table: Any) -> RowSource:
+    """Rows of a behave step table; empty cells become None."""
+    return RowSource(
+        list(table.headings),
+        (tuple(_cell(cell) for cell in row.cells) for row in table.rows),
+    )
+
+
+def csv_source(path: str, **reader_kwargs) -> RowSource:
+    """Rows of a CSV file with a header line, read lazily; empty fields become None."""
+
+    def rows(handle) -> Iterator[tuple]:
+        with handle:
+            for row in reader:
+                yield tuple(_cell(value) for value in row)
+
+    handle = open(path, newline="", encoding="utf-8")
+    reader = csv.reader(handle, **reader_kwargs)
+    try:
+        columns = next(reader)
+    except StopIteration:
+        handle.close()
+        return RowSource([], iter(()))
+    return RowSource(columns, rows(handle))
+
+
+def parquet_source(path: str, batch_size: int = DEFAULT_PARQUET_BATCH_SIZE) -> RowSource:
+    """Rows of a Parquet file, read one record batch at a time. Needs ``pyarrow``."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError("Seeding from Parquet requires pyarrow: pip install pyarrow") from exc
+
+    parquet = pq.ParquetFile(path)
+
+    def rows() -> Iterator[tuple]:
+        for batch in parquet.iter_batches(batch_size=batch_size):
+            yield from zip(*(column.to_pylist() for column in batch.columns))
+
+    return RowSource(list(parquet.schema_arrow.names), rows())
+
+
+def open_source(source: Any) -> RowSource:
+    """Accept a ``RowSource``, a behave table, or a ``.csv``/``.parquet`` path."""
+    if isinstance(source, RowSource):
+        return source
+    if hasattr(source, "headings") and hasattr(source, "rows"):
+        return table_source(source)
+    path = os.fspath(source)
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return csv_source(path)
+    if extension in (".parquet", ".pq"):
+        return parquet_source(path)
+    raise ValueError(f"Don't know how to seed from '{path}'; expected .csv or .parquet")
+
+
+def seed(manager: Any, plugin_name: str, table: str, source: Any) -> SeedResult:
+    """Bulk-load ``source`` into ``table`` through the plugin's fastest path.
+
+    ``manager`` is the scenario's ``ContainerManager`` (``context.containers``);
+    the plugin's container is started if it isn't running yet. Rows are
+    streamed to the plugin's ``bulk_load`` rather than materialized.
+    """
+    plugin = PluginRegistry.get(plugin_name)
+    client = manager.get_client(plugin_name)
+    rows = open_source(source)
+    counted = CountingIterator(rows.rows)
+    started = time.monotonic()
+    plugin.bulk_load(client, table, rows.columns, counted)
+    return SeedResult(table, counted.count, time.monotonic() - started)
+
+
+def json_message(columns: list[str], row: tuple) -> bytes:
+    """Encode a row as a JSON object keyed by column name."""
+    return json.dumps(dict(zip(columns, row)), default=str).encode()
+
+
+def publish(
+    manager: Any,
+    plugin_name: str,
+    topic: str,
+    source: Any,
+    encode: Callable[[list[str], tuple], bytes] = json_message,
+) -> SeedResult:
+    """Publish each row of ``source`` to ``topic`` as one message, encoded by ``encode``.
+
+    Like ``seed``, but through the plugin's ``bulk_publish``; returns once
+    the broker has acknowledged every message.
+    """
+    plugin = PluginRegistry.get(plugin_name)
+    client = manager.get_client(plugin_name)
+    rows = open_source(source)
+    counted = CountingIterator(rows.rows)
+    messages = (encode(rows.columns, row) for row in counted)
+    started = time.monotonic()
+    plugin.bulk_publish(client, topic, messages)
+    return SeedResult(topic, counted.count, time.monotonic() - started)
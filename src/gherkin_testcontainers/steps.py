@@ -0,0 +1,109 @@
+"""Built-in behave steps. Import this module from a step file to register them::
+
+    # features/steps/builtin.py
+    from gherkin_testcontainers import steps  # noqa: F401
+"""
+import logging
+import re
+
+import parse
+from behave import given, register_type, then, when
+
+from gherkin_testcontainers.loadgen import LoadResult, load
+from gherkin_testcontainers.seeding import SeedResult, seed
+
+logger = logging.getLogger(__name__)
+
+
+def _record(context, result: SeedResult) -> None:
+    if not hasattr(context, "seed_results"):
+        context.seed_results = []
+    context.seed_results.append(result)
+    logger.info(
+        "Seeded %d rows into %s in %.3fs (%.0f rows/s)",
+        result.rows, result.table, result.seconds, result.rows_per_second,
+    )
+
+
+@given('the "{table}" table in {plugin_name} contains:')
+def step_seed_from_table(context, table, plugin_name):
+    _record(context, seed(context.containers, plugin_name, table, context.table))
+
+
+@given('the "{table}" table in {plugin_name} is loaded from "{path}"')
+def step_seed_from_file(context, table, plugin_name, path):
+    _record(context, seed(context.containers, plugin_name, table, path))
+
+
+@parse.with_pattern(r"(?: at \d+(?:\.\d+)?/s)?(?: with \d+ workers?)?")
+def parse_load_shape(text: str) -> dict:
+    """The optional `` at RATE/s`` and `` with N workers`` suffix of a load step."""
+    rate = re.search(r"at (\d+(?:\.\d+)?)/s", text)
+    workers = re.search(r"with (\d+) worker", text)
+    return {
+        "rate": float(rate.group(1)) if rate else None,
+        "concurrency": int(workers.group(1)) if workers else None,
+    }
+
+
+register_type(LoadShape=parse_load_shape)
+
+
+def _load(context, plugin_name: str, target: str, count: int, shape: dict) -> None:
+    result = load(context.containers, plugin_name, target, count=count, **shape)
+    if not hasattr(context, "load_results"):
+        context.load_results = []
+    context.load_results.append(result)
+    context.load_result = result
+    latency = result.latency.summary()
+    logger.info(
+        "%s load on %s: %d ok, %d failed in %.2fs (%.0f/s, %d workers); p50 %.2fms p99 %.2fms max %.2fms",
+        plugin_name, target, result.operations, result.errors, result.seconds, result.throughput,
+        result.concurrency, latency["p50_ms"], latency["p99_ms"], latency["max_ms"],
+    )
+
+
+@when('I run "{statement}" {count:d} times on {plugin_name:w}{shape:LoadShape}')
+def step_load_statement(context, statement, count, plugin_name, shape):
+    _load(context, plugin_name, statement, count, shape)
+
+
+@when('I publish {count:d} messages to "{topic}" on {plugin_name:w}{shape:LoadShape}')
+def step_load_messages(context, count, topic, plugin_name, shape):
+    _load(context, plugin_name, topic, count, shape)
+
+
+@when('I open "{url}" {count:d} times in {plugin_name:w}{shape:LoadShape}')
+def step_load_pages(context, url, count, plugin_name, shape):
+    _load(context, plugin_name, url, count, shape)
+
+
+def _last_load(context) -> LoadResult:
+    result = getattr(context, "load_result", None)
+    assert result is not None, "No load has been run in this scenario"
+    return result
+
+
+@then("p{percentile:g} latency is below {limit:g} ms")
+def step_assert_latency(context, percentile, limit):
+    result = _last_load(context)
+    actual = result.percentile(percentile) * 1000
+    assert actual < limit, (
+        f"p{percentile:g} latency was {actual:.2f} ms with {result.concurrency} worker(s),"
+        f" expected below {limit:g} ms"
+    )
+
+
+@then("throughput is at least {rate:g}/s")
+def step_assert_throughput(context, rate):
+    result = _last_load(context)
+    assert result.throughput >= rate, (
+        f"Throughput was {result.throughput:.1f}/s with {result.concurrency} worker(s),"
+        f" expected at least {rate:g}/s"
+    )
+
+
+@then("no operations failed")
+def step_assert_no_errors(context):
+    result = _last_load(context)
+    assert result.errors == 0, f"{result.errors} operation(s) failed, first: {result.first_error}"
@@ -0,0 +1,110 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from gherkin_testcontainers.bench import compare, distribution, run_bench, unresettable_plugins
+
+
+def test_distribution_reports_nearest_rank_percentiles_in_ms():
+    summary = distribution([i / 1000 for i in range(1, 101)])
+    assert summary["count"] == 100
+    assert summary["mean_ms"] == pytest.approx(50.5)
+    assert summary["p50_ms"] == pytest.approx(50)
+    assert summary["p95_ms"] == pytest.approx(95)
+    assert summary["p99_ms"] == pytest.approx(99)
+    assert summary["min_ms"] == pytest.approx(1)
+    assert summary["max_ms"] == pytest.approx(100)
+
+
+def test_distribution_of_nothing_is_just_a_count():
+    assert distribution([]) == {"count": 0}
+
+
+def _step(keyword, name, duration):
+    return SimpleNamespace(keyword=keyword, name=name, duration=duration)
+
+
+def _scenario(status, *durations, location="a.feature:3"):
+    steps = [_step("Given", "a thing", durations[0]), _step("When", "it runs", durations[1])]
+    return SimpleNamespace(
+        name="thing runs", location=location, status=SimpleNamespace(name=status),
+        duration=sum(durations), all_steps=steps,
+    )
+
+
+def _feature(*scenarios):
+    return SimpleNamespace(walk_scenarios=lambda: list(scenarios))
+
+
+def test_run_bench_discards_warmup_and_failed_scenarios():
+    runs = iter([
+        (False, [_feature(_scenario("passed", 9.0, 9.0))]),  # warmup
+        (False, [_feature(_scenario("passed", 0.001, 0.002), _scenario("skipped", 0, 0, location="b:1"))]),
+        (True, [_feature(_scenario("failed", 0.5, 0.0))]),
+        (False, [_feature(_scenario("passed", 0.003, 0.004))]),
+    ])
+    with patch("gherkin_testcontainers.bench._run_behave", side_effect=lambda args: next(runs)) as run, \
+            patch("gherkin_testcontainers.bench.load_features", return_value=([], None, None)), \
+            patch("gherkin_testcontainers.bench.hold_containers") as hold:
+        result = run_bench(["features"], tags=["@bench"], repeat=3, warmup=1)
+    hold.assert_called_once()
+    assert run.call_count == 4
+    assert run.call_args.args[0][:2] == ["features", "--tags=@bench"]
+    assert result["failed_runs"] == 1
+    assert result["run"]["count"] == 3
+    assert list(result["scenarios"]) == ["a.feature:3"]
+    scenario = result["scenarios"]["a.feature:3"]
+    assert scenario["failures"] == 1
+    assert scenario["count"] == 2
+    assert scenario["mean_ms"] == pytest.approx(5)
+    assert [step["step"] for step in scenario["steps"]] == ["Given a thing", "When it runs"]
+    assert scenario["steps"][1]["max_ms"] == pytest.approx(4)
+
+
+def test_run_bench_rejects_no_repeats():
+    with pytest.raises(ValueError):
+        run_bench(repeat=0)
+
+
+def test_run_bench_refuses_plugins_that_cant_reset_before_running(monkeypatch):
+    from gherkin_testcontainers.scan import ContainerRequest, ScenarioScan
+
+    scans = [
+        ScenarioScan(SimpleNamespace(name="seeds orders"), [ContainerRequest("kafka")]),
+        ScenarioScan(SimpleNamespace(name="sends events"), [ContainerRequest("eventhubs")]),
+    ]
+    monkeypatch.delenv("GTC_STANDINS", raising=False)
+    monkeypatch.delenv("GTC_EVENTHUBS_URL", raising=False)
+    with patch("gherkin_testcontainers.bench.load_features", return_value=([], None, None)), \
+            patch("gherkin_testcontainers.bench.scan_features", return_value=scans), \
+            patch("gherkin_testcontainers.bench._run_behave") as run:
+        with pytest.raises(ValueError, match="eventhubs"):
+            run_bench(["features"])
+        run.assert_not_called()
+        assert unresettable_plugins(scans[:1]) == []
+        monkeypatch.setenv("GTC_EVENTHUBS_URL", "sb://localhost")
+        assert unresettable_plugins(scans) == []
+
+
+def _result(scenario_ms, step_ms):
+    return {"scenarios": {"a.feature:3": {
+        "mean_ms": scenario_ms, "p50_ms": scenario_ms, "p95_ms": scenario_ms,
+        "steps": [{"step": "Given a thing", "mean_ms": step_ms, "p50_ms": step_ms, "p95_ms": step_ms}],
+    }}}
+
+
+def test_compare_flags_slowdowns_past_threshold_and_min_delta():
+    regressions = compare(_result(130, 1.5), _result(100, 1.0), threshold=0.2, min_delta_ms=1.0)
+    assert {(r["step"], r["stat"]) for r in regressions} == {
+        (None, "mean_ms"), (None, "p50_ms"), (None, "p95_ms"),
+    }
+    assert regressions[0]["change"] == pytest.approx(0.3)
+    assert compare(_result(110, 1.0), _result(100, 1.0), threshold=0.2) == []
+
+
+def test_compare_skips_scenarios_and_steps_missing_from_baseline():
+    baseline = _result(100, 1.0)
+    baseline["scenarios"]["a.feature:3"]["steps"][0]["step"] = "Given another thing"
+    assert compare(_result(100, 50.0), baseline) == []
+    assert compare(_result(500, 50.0), {"scenarios": {}}) == []
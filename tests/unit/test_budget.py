@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+
+import pytest
+from unittest.mock import patch
+from gherkin_testcontainers.budget import HostBudget, ResourceSpec
+
+
+def _as_other_worker():
+    """Make reservations on behalf of another live process (the test runner's parent)."""
+    return patch("gherkin_testcontainers.budget.os.getpid", return_value=os.getppid())
+
+
+@pytest.fixture
+def budget(tmp_path):
+    return HostBudget(memory_mb=1000, cpus=2.0, path=str(tmp_path / "budget.json"))
+
+
+def test_resource_spec_docker_limits():
+    spec = ResourceSpec(memory_mb=512, cpus=1.5)
+    assert spec.docker_limits() == {"mem_limit": "512m", "nano_cpus": 1_500_000_000}
+    assert ResourceSpec().is_empty
+    assert ResourceSpec().docker_limits() == {}
+
+
+def test_try_acquire_admits_until_budget_is_full(budget):
+    with _as_other_worker():
+        first = budget.try_acquire(ResourceSpec(600, 1.0), "oracle")
+    assert first is not None
+    assert budget.try_acquire(ResourceSpec(600, 0.5), "kafka") is None
+    assert budget.try_acquire(ResourceSpec(400, 1.0), "postgres") is not None
+    assert budget.usage() == (1000, 2.0)
+
+
+def test_release_frees_the_reservation(budget):
+    with _as_other_worker():
+        token = budget.try_acquire(ResourceSpec(900, 1.0))
+    assert budget.try_acquire(ResourceSpec(200, 0.1)) is None
+    budget.release(token)
+    assert budget.try_acquire(ResourceSpec(200, 0.1)) is not None
+
+
+def test_oversized_request_is_admitted_when_nothing_else_runs(budget):
+    assert budget.try_acquire(ResourceSpec(5000, 8.0)) is not None
+
+
+def test_reservations_of_dead_processes_are_dropped(budget):
+    with patch("gherkin_testcontainers.budget.os.getpid", return_value=2**22 + 1):
+        budget.try_acquire(ResourceSpec(1000, 2.0))
+    assert budget.usage() == (0, 0)
+
+
+def test_acquire_times_out_when_budget_stays_full(budget):
+    with _as_other_worker():
+        budget.try_acquire(ResourceSpec(1000, 2.0), "oracle")
+    with patch("gherkin_testcontainers.budget.POLL_INTERVAL", 0.01):
+        with pytest.raises(TimeoutError, match=r"kafka.*reserved by: oracle \(1000 MB"):
+            budget.acquire(ResourceSpec(100, 0.1), "kafka", timeout=0.05)
+    # The timed-out request left the queue.
+    assert budget.try_acquire(ResourceSpec(0, 0.0)) is not None
+
+
+def test_request_not_fitting_beside_own_reservations_is_admitted(tmp_path):
+    budget = HostBudget(memory_mb=3000, cpus=8.0, path=str(tmp_path / "budget.json"))
+    assert budget.try_acquire(ResourceSpec(1536, 1.0), "pulsar") is not None
+
+    assert budget.acquire(ResourceSpec(2048, 1.0), "oracle", timeout=1) is not None
+    assert budget.usage() == (3584, 2.0)
+
+
+def test_acquire_admits_requests_in_arrival_order(budget):
+    with _as_other_worker():
+        held = budget.try_acquire(ResourceSpec(900, 1.0), "oracle")
+
+    def start(label, memory_mb):
+        budget.acquire(ResourceSpec(memory_mb, 0.1), label, timeout=5)
+
+    def reserved_labels():
+        # Under the lock: waiting workers rewrite the file as they poll.
+        return budget._update(lambda reservations, queue: [entry["label"] for entry in reservations.values()])
+
+    with patch("gherkin_testcontainers.budget.POLL_INTERVAL", 0.01):
+        large = threading.Thread(target=start, args=("large", 800))
+        large.start()
+        time.sleep(0.1)
+        small = threading.Thread(target=start, args=("small", 50))
+        small.start()
+        time.sleep(0.1)
+        try:
+            # 50 MB would fit beside the 900 MB, but the 800 MB request is first in line.
+            assert reserved_labels() == ["oracle"]
+        finally:
+            budget.release(held)
+            large.join()
+            small.join()
+
+    assert reserved_labels() == ["large", "small"]
+
+
+def test_from_env(monkeypatch, tmp_path):
+    monkeypatch.delenv("GTC_HOST_MEMORY_MB", raising=False)
+    assert HostBudget.from_env() is None
+    monkeypatch.setenv("GTC_HOST_MEMORY_MB", "8192")
+    monkeypatch.setenv("GTC_HOST_CPUS", "4")
+    monkeypatch.setenv("GTC_BUDGET_FILE", str(tmp_path / "b.json"))
+    budget = HostBudget.from_env()
+    assert (budget.memory_mb, budget.cpus, budget.path) == (8192, 4.0, str(tmp_path / "b.json"))
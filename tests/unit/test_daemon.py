@@ -0,0 +1,197 @@
+import threading
+import time
+
+import pytest
+from unittest.mock import MagicMock
+
+from gherkin_testcontainers.daemon import (
+    BrokerClient,
+    BrokerServer,
+    ContainerBroker,
+    container_key,
+)
+from gherkin_testcontainers.manager import ContainerManager
+from gherkin_testcontainers.plugin import ContainerPlugin
+from gherkin_testcontainers.registry import PluginRegistry
+
+
+class FakePlugin(ContainerPlugin):
+    started = 0
+    reset_error: Exception | None = None
+
+    @property
+    def name(self) -> str:
+        return "fake"
+
+    def create_container(self, **kwargs):
+        FakePlugin.started += 1
+        container = MagicMock()
+        container.number = FakePlugin.started
+        container.resets = 0
+        return container
+
+    def external_url(self, container):
+        return f"fake://host:{container.number}"
+
+    def reset(self, container):
+        container.resets += 1
+        if FakePlugin.reset_error is not None:
+            raise FakePlugin.reset_error
+
+    def create_external(self, endpoint, **kwargs):
+        service = MagicMock()
+        service.endpoint = endpoint
+        return service
+
+    def get_client(self, container):
+        return MagicMock(name="fake_client")
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    PluginRegistry._plugins.clear()
+    PluginRegistry._discovered = True
+    PluginRegistry.register("fake", FakePlugin)
+    FakePlugin.started = 0
+    FakePlugin.reset_error = None
+    yield
+    PluginRegistry._plugins.clear()
+    PluginRegistry._discovered = False
+
+
+@pytest.fixture
+def server(tmp_path):
+    path = str(tmp_path / "d.sock")
+    server = BrokerServer(path, ContainerBroker(ttl=60))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, path
+    server.shutdown()
+    server.server_close()
+
+
+def test_container_key_ignores_kwarg_order():
+    assert container_key("pg", {"a": 1, "b": 2}) == container_key("pg", {"b": 2, "a": 1})
+    assert container_key("pg", {"a": 1}) != container_key("pg", {"a": 2})
+
+
+def test_broker_reuses_released_containers_after_reset():
+    broker = ContainerBroker()
+    lease_id, warm = broker.lease("fake", {})
+    warm.container.start.assert_called_once()
+    broker.release(lease_id)
+    assert warm.container.resets == 1
+    _, again = broker.lease("fake", {})
+    assert again is warm and warm.leases == 2
+    assert FakePlugin.started == 1
+
+
+def test_broker_refuses_plugins_without_reset_before_starting_anything():
+    class NoResetPlugin(FakePlugin):
+        reset = ContainerPlugin.reset
+
+    PluginRegistry.register("noreset", NoResetPlugin)
+    with pytest.raises(ValueError, match="can't be pooled"):
+        ContainerBroker().lease("noreset", {})
+    assert FakePlugin.started == 0
+
+
+def test_broker_never_shares_a_leased_container():
+    broker = ContainerBroker()
+    _, first = broker.lease("fake", {})
+    _, second = broker.lease("fake", {})
+    assert first is not second
+    assert [entry["state"] for entry in broker.status()] == ["leased", "leased"]
+
+
+def test_broker_stops_containers_whose_reset_fails():
+    broker = ContainerBroker()
+    lease_id, warm = broker.lease("fake", {})
+    FakePlugin.reset_error = RuntimeError("boom")
+    broker.release(lease_id)
+    warm.container.stop.assert_called_once()
+    assert broker.status() == []
+
+
+def test_broker_evicts_containers_idle_past_ttl():
+    broker = ContainerBroker(ttl=10)
+    lease_id, warm = broker.lease("fake", {})
+    broker.release(lease_id)
+    assert broker.evict_idle(now=warm.idle_since + 5) == []
+    assert broker.evict_idle(now=warm.idle_since + 10) == [warm]
+    warm.container.stop.assert_called_once()
+
+
+def test_broker_shutdown_stops_everything():
+    broker = ContainerBroker()
+    idle_id, idle = broker.lease("fake", {})
+    broker.release(idle_id)
+    _, leased = broker.lease("fake", {})
+    broker.shutdown()
+    idle.container.stop.assert_called_once()
+    leased.container.stop.assert_called_once()
+
+
+def test_client_leases_over_the_socket_and_releases_on_disconnect(server):
+    broker_server, path = server
+    client = BrokerClient(path)
+    lease = client.lease("fake", {"image": "x"})
+    assert lease.endpoint == "fake://host:1"
+    assert lease.key == container_key("fake", {"image": "x"})
+    assert client.status()[0]["state"] == "leased"
+
+    lease._connection.close()
+    deadline = time.monotonic() + 5
+    while client.status()[0]["state"] != "idle" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert client.status()[0]["state"] == "idle"
+
+
+def test_client_reports_daemon_errors(server):
+    _, path = server
+    with pytest.raises(RuntimeError, match="not found"):
+        BrokerClient(path).lease("missing", {})
+
+
+def test_server_refuses_to_replace_a_running_daemon(server):
+    _, path = server
+    with pytest.raises(RuntimeError, match="already listening"):
+        BrokerServer(path, ContainerBroker())
+
+
+def test_manager_binds_leased_containers_and_returns_them(server):
+    _, path = server
+    manager = ContainerManager(broker=BrokerClient(path))
+    manager.start("fake")
+    service, _ = manager._containers["fake"]
+    assert service.endpoint == "fake://host:1"
+    manager.stop_all()
+    service.stop.assert_not_called()
+    assert BrokerClient(path).status()[0]["state"] == "idle"
+
+    manager = ContainerManager(broker=BrokerClient(path))
+    manager.start("fake")
+    assert manager._containers["fake"][0].endpoint == "fake://host:1"
+    manager.stop_all()
+
+
+def test_manager_starts_locally_when_the_daemon_is_unreachable(tmp_path):
+    manager = ContainerManager(broker=BrokerClient(str(tmp_path / "missing.sock")))
+    manager.start("fake")
+    container, _ = manager._containers["fake"]
+    container.start.assert_called_once()
+    manager.stop_all()
+    container.stop.assert_called_once()
+
+
+def test_manager_starts_plugins_the_daemon_cant_pool_without_asking_it():
+    class LocalPlugin(FakePlugin):
+        external_url = ContainerPlugin.external_url
+
+    PluginRegistry.register("local", LocalPlugin)
+    broker = MagicMock()
+    manager = ContainerManager(broker=broker)
+    manager.start("local")
+    broker.lease.assert_not_called()
+    manager._containers["local"][0].start.assert_called_once()
+    manager.stop_all()
@@ -0,0 +1,86 @@
+import datetime
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from gherkin_testcontainers.datagen import Column, Schema
+
+
+def _schema(**kwargs):
+    return Schema(
+        (
+            Column("id", distribution="sequence", low=1),
+            Column("score", type="float", distribution="normal", mean=10, stddev=2),
+            Column("user", type="string", cardinality=5),
+            Column("country", type="choice", values=("DE", "FR"), weights=(3, 1)),
+            Column("active", type="bool"),
+            Column("at", type="timestamp", high=3600),
+        ),
+        **kwargs,
+    )
+
+
+def test_batches_split_rows_by_batch_size():
+    sizes = [len(batch["id"]) for batch in _schema(batch_size=4).batches(10)]
+    assert sizes == [4, 4, 2]
+
+
+def test_same_seed_gives_same_rows():
+    assert list(_schema(seed=7).rows(50)) == list(_schema(seed=7).rows(50))
+    assert list(_schema(seed=7).rows(50)) != list(_schema(seed=8).rows(50))
+
+
+def test_appending_a_column_keeps_existing_values():
+    base = _schema(seed=3)
+    extended = Schema(base.columns + (Column("extra"),), seed=3)
+    assert [row[:-1] for row in extended.rows(20)] == list(base.rows(20))
+
+
+def test_rows_are_python_values_within_bounds():
+    rows = list(_schema(batch_size=3).rows(7))
+    assert [row[0] for row in rows] == list(range(1, 8))
+    for _, score, user, country, active, at in rows:
+        assert isinstance(score, float)
+        assert user in {f"user-{n}" for n in range(5)}
+        assert country in ("DE", "FR")
+        assert isinstance(active, bool)
+        assert datetime.datetime(2024, 1, 1) <= at < datetime.datetime(2024, 1, 1, 1)
+
+
+def test_zipf_strings_respect_cardinality():
+    column = Column("key", type="string", distribution="zipf", cardinality=3, prefix="k")
+    values = {row[0] for row in Schema((column,)).rows(1000)}
+    assert values <= {"k0", "k1", "k2"}
+
+
+def test_null_fraction_inserts_nones():
+    column = Column("maybe", null_fraction=0.5)
+    values = [row[0] for row in Schema((column,)).rows(1000)]
+    assert 300 < values.count(None) < 700
+    assert all(isinstance(value, int) for value in values if value is not None)
+
+
+def test_source_feeds_seeding():
+    source = _schema().source(3)
+    assert source.columns == ["id", "score", "user", "country", "active", "at"]
+    assert len(list(source.rows)) == 3
+
+
+def test_from_dict_builds_columns():
+    schema = Schema.from_dict({
+        "seed": 42,
+        "batch_size": 100,
+        "columns": [{"name": "tier", "type": "choice", "values": ["a", "b"]}],
+    })
+    assert schema.seed == 42 and schema.batch_size == 100
+    assert schema.columns == (Column("tier", type="choice", values=("a", "b")),)
+
+
+def test_invalid_columns_raise():
+    with pytest.raises(ValueError, match="Unknown type"):
+        Column("x", type="uuid")
+    with pytest.raises(ValueError, match="needs values"):
+        Column("x", type="choice")
+    with pytest.raises(ValueError, match="weights"):
+        Column("x", type="choice", values=("a",), weights=(1, 2))
@@ -73,3 +73,34 @@ def test_decorator_reuses_existing_container():
 
     client2 = step_fn(ctx)
     assert client1 is client2
+
+
+def test_decorator_records_container_requests():
+    @use_container("fake", image="fake:2")
+    @use_container("other")
+    def step_fn(context, fake_client, other_client):
+        pass
+
+    assert step_fn.container_requests == [("other", {}), ("fake", {"image": "fake:2"})]
+
+
+def test_lazy_decorator_injects_proxy_without_blocking():
+    from gherkin_testcontainers.lazy import LazyClient, resolve
+
+    @use_container("fake", lazy=True)
+    def step_fn(context, fake_client):
+        return fake_client
+
+    ctx = _make_context()
+    client = step_fn(ctx)
+    assert isinstance(client, LazyClient)
+    assert resolve(client) is ctx.containers.get_client("fake")
+    ctx.containers.stop_all()
+
+
+def test_lazy_is_not_recorded_as_container_kwarg():
+    @use_container("fake", lazy=True, image="fake:1")
+    def step_fn(context, fake_client):
+        pass
+
+    assert step_fn.container_requests == [("fake", {"image": "fake:1"})]
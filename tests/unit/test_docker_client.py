@@ -0,0 +1,71 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from testcontainers.core.container import DockerContainer
+from testcontainers.core.network import Network
+from gherkin_testcontainers.docker_client import SharedDockerClient
+
+
+@pytest.fixture(autouse=True)
+def fake_docker_client():
+    SharedDockerClient._client = None
+    SharedDockerClient._api_calls = 0
+    with patch("gherkin_testcontainers.docker_client.DockerClient") as docker_client_cls:
+        docker_client_cls.side_effect = lambda **kwargs: MagicMock(kwargs=kwargs)
+        yield docker_client_cls
+    SharedDockerClient._client = None
+
+
+def test_get_returns_one_pooled_client():
+    client = SharedDockerClient.get()
+    assert SharedDockerClient.get() is client
+    assert client.kwargs == {"max_pool_size": SharedDockerClient.max_pool_size}
+
+
+def test_inject_routes_containers_and_networks_to_shared_client():
+    with SharedDockerClient.inject():
+        container = DockerContainer("fake:1")
+        network = Network()
+    shared = SharedDockerClient.get()
+    assert container._docker is shared
+    assert network._docker is shared
+
+
+def test_objects_created_outside_inject_get_their_own_client():
+    with SharedDockerClient.inject():
+        pass
+    container = DockerContainer("fake:1")
+    assert container._docker is not SharedDockerClient.get()
+
+
+def test_other_threads_keep_their_own_client_during_inject():
+    import threading
+
+    created = []
+    with SharedDockerClient.inject():
+        worker = threading.Thread(target=lambda: created.append(DockerContainer("fake:1")))
+        worker.start()
+        worker.join(5)
+    assert created[0]._docker is not SharedDockerClient.get()
+
+
+def test_explicit_docker_client_kw_is_respected():
+    with SharedDockerClient.inject():
+        container = DockerContainer("fake:1", docker_client_kw={"timeout": 5})
+    assert container._docker is not SharedDockerClient.get()
+    assert container._docker.kwargs == {"timeout": 5}
+
+
+def test_api_calls_are_counted_through_response_hook():
+    client = SharedDockerClient.get()
+    hooks = client.client.api.hooks.__getitem__.return_value
+    counter = hooks.append.call_args.args[0]
+    counter(MagicMock())
+    counter(MagicMock())
+    assert SharedDockerClient.api_calls() == 2
+
+
+def test_shutdown_closes_and_forgets_client():
+    client = SharedDockerClient.get()
+    SharedDockerClient.shutdown()
+    client.client.close.assert_called_once()
+    assert SharedDockerClient.get() is not client
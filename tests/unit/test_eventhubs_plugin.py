@@ -2,15 +2,30 @@
 from unittest.mock import MagicMock, patch
 
 from gherkin_testcontainers.plugin import ContainerPlugin
+import asyncio
+
+import pytest
+
+from gherkin_testcontainers_eventhubs.helpers import (
+    receive_events,
+    send_events,
+    send_events_async,
+)
 from gherkin_testcontainers_eventhubs.plugin import (
+    DEFAULT_AZURITE_IMAGE,
+    DEFAULT_CONFIG,
     DEFAULT_EVENTHUBS_IMAGE,
     DEFAULT_EVENTHUB_NAME,
     DEFAULT_EVENTHUB_NAMESPACE,
     EVENTHUBS_AMQP_PORT,
     EVENTHUBS_SHARED_ACCESS_KEY,
     EVENTHUBS_SHARED_ACCESS_KEY_NAME,
+    AzuriteSidecar,
     EventHubsContainer,
+    ExternalEventHubs,
     EventHubsPlugin,
+    build_config,
+    first_eventhub,
 )
 
 
@@ -54,6 +69,7 @@ def test_eventhubs_container_get_connection_string_default():
     container = MagicMock(spec=EventHubsContainer)
     container.get_container_host_ip.return_value = "localhost"
     container.get_exposed_port.return_value = "15672"
+    container.default_eventhub = DEFAULT_EVENTHUB_NAME
     container.get_connection_string = EventHubsContainer.get_connection_string.__get__(container)
 
     conn_str = container.get_connection_string()
@@ -77,9 +93,39 @@ def test_eventhubs_container_get_connection_string_custom_eventhub():
     assert "EntityPath=my-hub;" in conn_str
 
 
+def test_first_eventhub_is_the_first_configured_hub():
+    assert first_eventhub(build_config({"orders": {"partition_count": 4}, "audit": {}})) == "orders"
+    assert first_eventhub(build_config()) == DEFAULT_EVENTHUB_NAME
+    assert first_eventhub({"UserConfig": {"NamespaceConfig": []}}) == DEFAULT_EVENTHUB_NAME
+
+
+def test_eventhubs_container_connection_string_targets_default_hub():
+    container = MagicMock(spec=EventHubsContainer)
+    container.get_container_host_ip.return_value = "localhost"
+    container.get_exposed_port.return_value = "15672"
+    container.default_eventhub = "orders"
+    container.get_connection_string = EventHubsContainer.get_connection_string.__get__(container)
+
+    assert "EntityPath=orders;" in container.get_connection_string()
+    assert "EntityPath=audit;" in container.get_connection_string("audit")
+
+
+def test_external_eventhubs_honors_eventhub_name():
+    service = ExternalEventHubs("Endpoint=sb://eh:5672;SharedAccessKey=k;EntityPath=orders;UseDevelopmentEmulator=true;")
+
+    assert service.get_connection_string() == service.url
+    assert service.get_connection_string("audit") == (
+        "Endpoint=sb://eh:5672;SharedAccessKey=k;EntityPath=audit;UseDevelopmentEmulator=true;"
+    )
+    assert ExternalEventHubs("Endpoint=sb://eh:5672").get_connection_string("audit") == (
+        "Endpoint=sb://eh:5672;EntityPath=audit;"
+    )
+
+
 def test_eventhubs_plugin_get_client_returns_producer():
     plugin = EventHubsPlugin()
     mock_container = MagicMock(spec=EventHubsContainer)
+    mock_container.async_client = False
     mock_container.get_connection_string.return_value = (
         "Endpoint=sb://localhost:15672;"
         "SharedAccessKeyName=RootManageSharedAccessKey;"
@@ -96,3 +142,220 @@ def test_eventhubs_plugin_get_client_returns_producer():
 
         MockProducer.assert_called_once_with(mock_container.get_connection_string.return_value)
         assert client is mock_producer
+
+
+def test_build_config_defaults_match_default_config():
+    assert build_config() == DEFAULT_CONFIG
+
+
+def test_build_config_from_hub_names():
+    config = build_config(["orders", "payments"], namespace="ns2", partition_count=4)
+    namespace = config["UserConfig"]["NamespaceConfig"][0]
+
+    assert namespace["Name"] == "ns2"
+    assert [e["Name"] for e in namespace["Entities"]] == ["orders", "payments"]
+    assert all(e["PartitionCount"] == 4 for e in namespace["Entities"])
+    assert namespace["Entities"][0]["ConsumerGroups"] == [{"Name": "cg1"}]
+
+
+def test_build_config_per_hub_overrides():
+    config = build_config({
+        "orders": {"partition_count": 8, "consumer_groups": ["billing", "audit"]},
+        "payments": {},
+    })
+    orders, payments = config["UserConfig"]["NamespaceConfig"][0]["Entities"]
+
+    assert orders["PartitionCount"] == 8
+    assert orders["ConsumerGroups"] == [{"Name": "billing"}, {"Name": "audit"}]
+    assert payments["PartitionCount"] == 2
+
+
+@pytest.fixture
+def clean_sidecar():
+    AzuriteSidecar._network = None
+    AzuriteSidecar._azurite = None
+    yield
+    AzuriteSidecar._network = None
+    AzuriteSidecar._azurite = None
+
+
+def test_azurite_sidecar_is_started_once(clean_sidecar):
+    network, azurite = MagicMock(), MagicMock()
+    with patch(
+        "gherkin_testcontainers_eventhubs.plugin._start_azurite",
+        return_value=(network, azurite),
+    ) as mock_start, patch("gherkin_testcontainers_eventhubs.plugin.atexit"):
+        assert AzuriteSidecar.acquire() is network
+        assert AzuriteSidecar.acquire() is network
+
+    mock_start.assert_called_once()
+
+
+def test_azurite_sidecar_shutdown_stops_container_and_network(clean_sidecar):
+    network, azurite = MagicMock(), MagicMock()
+    AzuriteSidecar._network, AzuriteSidecar._azurite = network, azurite
+
+    AzuriteSidecar.shutdown()
+
+    azurite.stop.assert_called_once()
+    network.remove.assert_called_once()
+    assert AzuriteSidecar._network is None
+    AzuriteSidecar.shutdown()  # idempotent
+
+
+def test_eventhubs_plugin_get_client_returns_async_producer():
+    plugin = EventHubsPlugin()
+    mock_container = MagicMock(spec=EventHubsContainer)
+    mock_container.async_client = True
+    mock_container.get_connection_string.return_value = "Endpoint=sb://localhost:15672;"
+
+    with patch("azure.eventhub.aio.EventHubProducerClient.from_connection_string") as MockProducer:
+        client = plugin.get_client(mock_container)
+
+        MockProducer.assert_called_once_with("Endpoint=sb://localhost:15672;")
+        assert client is MockProducer.return_value
+
+
+def test_eventhubs_plugin_closes_async_client_on_its_own_loop():
+    import threading
+
+    plugin = EventHubsPlugin()
+    mock_container = MagicMock(spec=EventHubsContainer)
+    mock_container.async_client = True
+    mock_container.get_connection_string.return_value = "Endpoint=sb://localhost:15672;"
+    loop = asyncio.new_event_loop()
+    worker = threading.Thread(target=loop.run_forever)
+    worker.start()
+    closed_on = []
+
+    async def close():
+        closed_on.append(asyncio.get_running_loop())
+
+    async def create():
+        return plugin.get_client(mock_container)
+
+    try:
+        with patch("azure.eventhub.aio.EventHubProducerClient.from_connection_string") as MockProducer:
+            MockProducer.return_value.close = close
+            client = asyncio.run_coroutine_threadsafe(create(), loop).result(5)
+        plugin.close_client(client)
+        assert closed_on == [loop]
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        worker.join(5)
+        loop.close()
+
+
+class FakeBatch:
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.events = []
+
+    def add(self, event):
+        if len(self.events) >= self.capacity:
+            raise ValueError("batch is full")
+        self.events.append(event)
+
+    def __len__(self):
+        return len(self.events)
+
+
+def _fake_producer(capacity):
+    producer = MagicMock()
+    producer.create_batch.side_effect = lambda **kwargs: FakeBatch(capacity)
+    return producer
+
+
+def test_send_events_splits_into_batches():
+    producer = _fake_producer(capacity=3)
+
+    batches = send_events(producer, (f"event-{i}" for i in range(7)), partition_id="0")
+
+    assert batches == 3
+    sent = [call.args[0] for call in producer.send_batch.call_args_list]
+    assert [len(batch) for batch in sent] == [3, 3, 1]
+    assert sent[0].events[0].body_as_str() == "event-0"
+    producer.create_batch.assert_called_with(partition_id="0")
+
+
+def test_send_events_with_no_events_sends_nothing():
+    producer = _fake_producer(capacity=3)
+    assert send_events(producer, []) == 0
+    producer.send_batch.assert_not_called()
+
+
+def test_send_events_raises_when_single_event_exceeds_limit():
+    producer = _fake_producer(capacity=0)
+    with pytest.raises(ValueError):
+        send_events(producer, ["too big"])
+
+
+def test_send_events_async_splits_into_batches():
+    producer = MagicMock()
+
+    async def create_batch(**kwargs):
+        return FakeBatch(2)
+
+    async def send_batch(batch):
+        sent.append(batch)
+
+    sent = []
+    producer.create_batch.side_effect = create_batch
+    producer.send_batch.side_effect = send_batch
+
+    batches = asyncio.run(send_events_async(producer, ["a", "b", "c"]))
+
+    assert batches == 2
+    assert [len(batch) for batch in sent] == [2, 1]
+
+
+def test_receive_events_stops_once_expected_count_arrives():
+    consumer = MagicMock()
+
+    def receive(on_event, starting_position):
+        for i in range(5):
+            on_event(MagicMock(), f"event-{i}")
+
+    consumer.receive.side_effect = receive
+
+    with patch(
+        "azure.eventhub.EventHubConsumerClient.from_connection_string",
+        return_value=consumer,
+    ) as from_conn:
+        events = receive_events("Endpoint=sb://localhost;", expected_count=5, timeout=5)
+
+    from_conn.assert_called_once_with("Endpoint=sb://localhost;", consumer_group="$Default")
+    assert events == [f"event-{i}" for i in range(5)]
+    consumer.close.assert_called_once()
+
+
+def test_receive_events_returns_partial_results_at_deadline():
+    consumer = MagicMock()
+    consumer.receive.side_effect = lambda on_event, starting_position: on_event(MagicMock(), "only")
+
+    with patch(
+        "azure.eventhub.EventHubConsumerClient.from_connection_string",
+        return_value=consumer,
+    ):
+        events = receive_events("Endpoint=sb://localhost;", expected_count=2, timeout=0.1)
+
+    assert events == ["only"]
+
+
+def test_receive_events_reraises_consumer_errors():
+    consumer = MagicMock()
+    consumer.receive.side_effect = ConnectionError("emulator unreachable")
+
+    with patch(
+        "azure.eventhub.EventHubConsumerClient.from_connection_string",
+        return_value=consumer,
+    ):
+        with pytest.raises(ConnectionError, match="emulator unreachable"):
+            receive_events("Endpoint=sb://localhost;", expected_count=1, timeout=5)
+
+    consumer.close.assert_called_once()
+
+
+def test_eventhubs_plugin_get_images_includes_azurite():
+    plugin = EventHubsPlugin()
+    assert plugin.get_images() == [DEFAULT_EVENTHUBS_IMAGE, DEFAULT_AZURITE_IMAGE]
@@ -1,6 +1,10 @@
 # tests/unit/test_google_pubsub_plugin.py
 from unittest.mock import patch, MagicMock
-from gherkin_testcontainers_google_pubsub.plugin import GooglePubSubPlugin
+from gherkin_testcontainers_google_pubsub.plugin import (
+    DEFAULT_BATCH_SETTINGS,
+    GooglePubSubPlugin,
+    PubSubClient,
+)
 from gherkin_testcontainers.plugin import ContainerPlugin
 
 
@@ -23,13 +27,191 @@ def test_google_pubsub_plugin_create_container():
         MockContainer.assert_called_once_with(project="test-project")
 
 
-def test_google_pubsub_plugin_get_client_returns_publisher():
+def test_google_pubsub_plugin_create_container_keeps_publisher_settings():
     plugin = GooglePubSubPlugin()
-    mock_container = MagicMock()
-    mock_publisher = MagicMock()
-    mock_container.get_publisher.return_value = mock_publisher
+    with patch(
+        "gherkin_testcontainers_google_pubsub.plugin.PubSubContainer"
+    ) as MockContainer:
+        container = plugin.create_container(
+            project="test-project",
+            batch_settings={"max_messages": 50},
+            enable_message_ordering=True,
+        )
+        MockContainer.assert_called_once_with(project="test-project")
+
+    settings = container.publisher_settings
+    assert settings["batch_settings"] == {**DEFAULT_BATCH_SETTINGS, "max_messages": 50}
+    assert settings["enable_message_ordering"] is True
+
+
+def test_google_pubsub_plugin_get_client_returns_bundle():
+    from google.cloud.pubsub_v1 import types
+
+    plugin = GooglePubSubPlugin()
+    with patch("gherkin_testcontainers_google_pubsub.plugin.PubSubContainer"):
+        mock_container = plugin.create_container(batch_settings={"max_latency": 0.05})
+    mock_container.project = "test-project"
 
     client = plugin.get_client(mock_container)
 
-    mock_container.get_publisher.assert_called_once()
-    assert client is mock_publisher
+    assert isinstance(client, PubSubClient)
+    assert client.publisher is mock_container.get_publisher_client.return_value
+    assert client.subscriber is mock_container.get_subscriber_client.return_value
+    assert client.project == "test-project"
+    kwargs = mock_container.get_publisher_client.call_args.kwargs
+    assert kwargs["batch_settings"].max_latency == 0.05
+    flow_control = kwargs["publisher_options"].flow_control
+    assert flow_control.limit_exceeded_behavior == types.LimitExceededBehavior.BLOCK
+
+
+def _client():
+    publisher = MagicMock()
+    publisher.topic_path.side_effect = lambda project, topic: f"projects/{project}/topics/{topic}"
+    subscriber = MagicMock()
+    subscriber.subscription_path.side_effect = (
+        lambda project, sub: f"projects/{project}/subscriptions/{sub}"
+    )
+    return PubSubClient(publisher, subscriber, "p")
+
+
+def test_pubsub_client_creates_topics_and_subscriptions_in_bulk():
+    from google.api_core.exceptions import AlreadyExists
+
+    client = _client()
+    client.publisher.create_topic.side_effect = [None, AlreadyExists("exists")]
+
+    topics = client.create_topics("a", "b")
+    subs = client.create_subscriptions({"a-sub": "a", "b-sub": "b"})
+
+    assert topics == ["projects/p/topics/a", "projects/p/topics/b"]
+    assert subs == ["projects/p/subscriptions/a-sub", "projects/p/subscriptions/b-sub"]
+    client.subscriber.create_subscription.assert_any_call(
+        request={"name": "projects/p/subscriptions/b-sub", "topic": "projects/p/topics/b"}
+    )
+
+
+def test_pubsub_client_publish_many_waits_for_all_ids():
+    client = _client()
+    futures = [MagicMock(), MagicMock()]
+    futures[0].result.return_value = "1"
+    futures[1].result.return_value = "2"
+    client.publisher.publish.side_effect = futures
+
+    ids = client.publish_many("a", [b"x", b"y"])
+
+    assert ids == ["1", "2"]
+    client.publisher.publish.assert_any_call("projects/p/topics/a", b"y")
+
+
+def test_pubsub_client_collect_stops_at_expected_count():
+    client = _client()
+    messages = [MagicMock(), MagicMock(), MagicMock()]
+
+    def subscribe(path, callback):
+        for message in messages[:2]:
+            callback(message)
+        return MagicMock()
+
+    client.subscriber.subscribe.side_effect = subscribe
+
+    received = client.collect("a-sub", expected_count=2, timeout=5)
+
+    assert received == messages[:2]
+    messages[0].ack.assert_called_once()
+    client.subscriber.subscribe.assert_called_once()
+
+
+def test_pubsub_client_collect_returns_partial_results_on_timeout():
+    client = _client()
+    future = MagicMock()
+    client.subscriber.subscribe.return_value = future
+
+    received = client.collect("a-sub", expected_count=1, timeout=0.05)
+
+    assert received == []
+    future.cancel.assert_called_once()
+
+
+def test_google_pubsub_bulk_publish_waits_per_chunk():
+    client = MagicMock()
+    with patch("gherkin_testcontainers_google_pubsub.plugin.BULK_PUBLISH_CHUNK_SIZE", 2):
+        GooglePubSubPlugin().bulk_publish(client, "events", iter([b"a", b"b", b"c"]))
+    assert [c.args for c in client.publish_many.call_args_list] == [
+        ("events", [b"a", b"b"]),
+        ("events", [b"c"]),
+    ]
+
+
+def test_google_pubsub_plugin_binds_to_external_emulator():
+    service = GooglePubSubPlugin().create_external(
+        "localhost:8085", project="demo", batch_settings={"max_messages": 5}
+    )
+    assert service.project == "demo"
+    assert service.get_pubsub_emulator_host() == "localhost:8085"
+    assert service.publisher_settings["batch_settings"]["max_messages"] == 5
+
+
+def test_google_pubsub_standin_publishes_and_delivers_in_memory():
+    from google.api_core.exceptions import NotFound
+    import pytest
+
+    plugin = GooglePubSubPlugin()
+    service = plugin.create_external("memory://", project="p")
+    client = plugin.get_client(service)
+    client.create_topics("orders", "orders")
+    client.publish("orders", b"before").result()
+    client.create_subscriptions({"orders-sub": "orders"})
+    assert client.publish_many("orders", [b"a", b"b"]) == ["1", "2"]
+    received = client.collect("orders-sub", expected_count=2, timeout=5)
+    assert [message.data for message in received] == [b"a", b"b"]
+    assert all(message.acked for message in received)
+    with pytest.raises(NotFound):
+        client.publish("missing", b"x").result()
+    client.close()
+
+
+def test_google_pubsub_standin_pull_and_nack():
+    plugin = GooglePubSubPlugin()
+    client = plugin.get_client(plugin.create_external("memory://"))
+    client.create_topics("t")
+    path = client.create_subscriptions({"s": "t"})[0]
+    client.publish("t", b"x", origin="test")
+    response = client.subscriber.pull(request={"subscription": path, "max_messages": 10})
+    [received] = response.received_messages
+    assert (received.message.data, received.message.attributes) == (b"x", {"origin": "test"})
+    client.subscriber.modify_ack_deadline(
+        request={"subscription": path, "ack_ids": [received.ack_id], "ack_deadline_seconds": 0}
+    )
+    [again] = client.subscriber.pull(subscription=path, max_messages=10).received_messages
+    assert again.message.delivery_attempt == 2
+    client.subscriber.acknowledge(request={"subscription": path, "ack_ids": [again.ack_id]})
+    assert client.subscriber.pull(subscription=path).received_messages == []
+
+
+def test_google_pubsub_standin_reset_drops_topics_and_subscriptions():
+    plugin = GooglePubSubPlugin()
+    service = plugin.create_external("memory://")
+    client = plugin.get_client(service)
+    client.create_topics("t")
+    client.create_subscriptions({"s": "t"})
+    service.reset()
+    client = plugin.get_client(service)
+    assert service.subscriptions == {}
+    assert client.create_topics("t") and client.create_subscriptions({"s": "t"})
+
+
+def test_google_pubsub_reset_deletes_the_projects_subscriptions_and_topics():
+    plugin = GooglePubSubPlugin()
+    container = MagicMock(project="p")
+    subscriber = container.get_subscriber_client.return_value
+    subscriber.list_subscriptions.return_value = [MagicMock(name="sub")]
+    publisher = container.get_publisher_client.return_value
+    publisher.list_topics.return_value = [MagicMock(name="topic")]
+    plugin.reset(container)
+    subscriber.list_subscriptions.assert_called_once_with(request={"project": "projects/p"})
+    subscriber.delete_subscription.assert_called_once_with(
+        request={"subscription": subscriber.list_subscriptions.return_value[0].name}
+    )
+    publisher.delete_topic.assert_called_once_with(request={"topic": publisher.list_topics.return_value[0].name})
+    subscriber.close.assert_called_once()
+    publisher.stop.assert_called_once()
@@ -31,3 +31,129 @@ def test_after_scenario_calls_stop_all():
     with patch.object(manager, "stop_all") as mock_stop:
         namespace["after_scenario"](context, scenario)
         mock_stop.assert_called_once()
+
+
+def test_setup_hooks_without_prepull_adds_no_before_all():
+    namespace = {}
+    setup_hooks(namespace)
+    assert "before_all" not in namespace
+
+
+def test_before_all_prepulls_images_of_selected_scenarios():
+    namespace = {}
+    setup_hooks(namespace, prepull=True)
+    context = MagicMock()
+    with patch("gherkin_testcontainers.scan.parse_selected_features", return_value=["feature"]) as mock_parse, \
+            patch("gherkin_testcontainers.scan.scan_features", return_value=["scan"]) as mock_scan, \
+            patch("gherkin_testcontainers.scan.resolve_images", return_value={"img:1": ["fake"]}), \
+            patch("gherkin_testcontainers.prepull.prepull_images") as mock_prepull:
+        namespace["before_all"](context)
+    mock_parse.assert_called_once_with(context.config)
+    mock_scan.assert_called_once_with(["feature"], context.config.tag_expression)
+    mock_prepull.assert_called_once_with({"img:1": ["fake"]})
+    context.config.setup_logging.assert_not_called()
+
+
+def test_before_all_prepull_failure_does_not_abort_the_run(caplog):
+    from docker.errors import DockerException
+
+    namespace = {}
+    setup_hooks(namespace, prepull=True)
+    context = MagicMock()
+    with patch("gherkin_testcontainers.scan.parse_selected_features", return_value=[]), \
+            patch("gherkin_testcontainers.scan.resolve_images", return_value={"img:1": ["fake"]}), \
+            patch("gherkin_testcontainers.prepull.prepull_images", side_effect=DockerException("no daemon")):
+        namespace["before_all"](context)
+    assert "Pre-pulling images failed" in caplog.text
+
+
+def test_track_leaks_records_resource_growth():
+    namespace = {}
+    setup_hooks(namespace, track_leaks=True)
+    context = MagicMock()
+    scenario = MagicMock()
+    namespace["before_scenario"](context, scenario)
+    namespace["after_scenario"](context, scenario)
+    assert set(context.containers.stats["resource_growth"]) == {"fds", "threads", "rss_bytes"}
+
+
+def test_unknown_scope_is_rejected():
+    import pytest
+
+    with pytest.raises(ValueError):
+        setup_hooks({}, scope="module")
+
+
+def test_feature_scope_shares_manager_across_scenarios():
+    namespace = {}
+    setup_hooks(namespace, scope="feature", idle_timeout=30)
+    context = MagicMock()
+    feature = MagicMock()
+    namespace["before_feature"](context, feature)
+    manager = context.containers
+    assert manager.idle_timeout == 30
+    with patch.object(manager, "stop_all") as mock_stop, \
+            patch.object(manager, "release") as mock_release:
+        namespace["before_scenario"](context, MagicMock())
+        namespace["after_scenario"](context, MagicMock())
+        assert context.containers is manager
+        mock_release.assert_called_once()
+        mock_stop.assert_not_called()
+        namespace["after_feature"](context, feature)
+        mock_stop.assert_called_once()
+
+
+def test_session_scope_creates_manager_in_before_all():
+    namespace = {}
+    setup_hooks(namespace, scope="session")
+    assert "before_feature" not in namespace
+    context = MagicMock()
+    namespace["before_all"](context)
+    manager = context.containers
+    assert isinstance(manager, ContainerManager)
+    with patch.object(manager, "stop_all") as mock_stop:
+        namespace["after_all"](context)
+        mock_stop.assert_called_once()
+
+
+def test_report_path_writes_run_report(tmp_path):
+    import json
+
+    path = tmp_path / "run.json"
+    namespace = {}
+    setup_hooks(namespace, report_path=str(path))
+    context = MagicMock()
+    scenario = MagicMock(filename="features/a.feature", line=3)
+    scenario.name = "one"
+    scenario.feature.name = "A"
+    scenario.status.name = "passed"
+    namespace["before_scenario"](context, scenario)
+    namespace["after_scenario"](context, scenario)
+    namespace["after_all"](context)
+    [entry] = json.loads(path.read_text())["scenarios"]
+    assert entry["location"] == "features/a.feature:3"
+    assert entry["resource_usage"] == {}
+    assert entry["lifecycle"]["docker_api_calls"] == 0
+
+
+def test_hold_containers_shares_one_manager_and_resets_instead_of_stopping():
+    from gherkin_testcontainers.hooks import hold_containers
+
+    namespace = {}
+    setup_hooks(namespace)
+    managers = []
+    with patch.object(ContainerManager, "stop_all") as mock_stop, \
+            patch.object(ContainerManager, "reset") as mock_reset:
+        with hold_containers():
+            for _ in range(2):
+                context = MagicMock()
+                namespace["before_scenario"](context, MagicMock())
+                managers.append(context.containers)
+                namespace["after_scenario"](context, MagicMock())
+            assert mock_reset.call_count == 2
+            mock_stop.assert_not_called()
+        mock_stop.assert_called_once()
+    assert managers[0] is managers[1]
+    context = MagicMock()
+    namespace["before_scenario"](context, MagicMock())
+    assert context.containers is not managers[0]
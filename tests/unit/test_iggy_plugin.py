@@ -1,6 +1,8 @@
 # tests/unit/test_iggy_plugin.py
+import pytest
 from unittest.mock import patch, MagicMock
 from gherkin_testcontainers_iggy.plugin import (
+    IggyConnection,
     IggyPlugin,
     DEFAULT_IGGY_IMAGE,
     IGGY_HTTP_PORT,
@@ -47,11 +49,29 @@ def test_iggy_plugin_create_container_custom_image():
         )
 
 
-def test_iggy_plugin_get_client_returns_iggy_client():
+def test_iggy_plugin_create_container_forwards_extra_kwargs_and_credentials():
+    plugin = IggyPlugin()
+    with patch(
+        "gherkin_testcontainers_iggy.plugin.DockerContainer"
+    ) as MockContainer:
+        mock_instance = MagicMock()
+        MockContainer.return_value = mock_instance
+        container = plugin.create_container(
+            username="admin", password="secret", mem_limit="512m"
+        )
+        MockContainer.assert_called_once_with(DEFAULT_IGGY_IMAGE, mem_limit="512m")
+        mock_instance.with_env.assert_any_call("IGGY_ROOT_USERNAME", "admin")
+        mock_instance.with_env.assert_any_call("IGGY_ROOT_PASSWORD", "secret")
+        assert container.iggy_credentials == ("admin", "secret")
+
+
+def test_iggy_plugin_get_client_returns_connected_client():
     plugin = IggyPlugin()
     mock_container = MagicMock()
     mock_container.get_container_host_ip.return_value = "localhost"
     mock_container.get_exposed_port.return_value = "12345"
+    mock_container.iggy_credentials = ("iggy", "iggy")
+    mock_container.iggy_connections = []
 
     with patch("iggy_py.IggyClient") as MockIggyClient:
         mock_client = MagicMock()
@@ -59,7 +79,105 @@ def test_iggy_plugin_get_client_returns_iggy_client():
 
         client = plugin.get_client(mock_container)
 
-        mock_container.get_container_host_ip.assert_called_once()
         mock_container.get_exposed_port.assert_called_once_with(IGGY_TCP_PORT)
-        MockIggyClient.assert_called_once_with(host="localhost", port=12345)
-        assert client is mock_client
+        MockIggyClient.assert_called_once_with("localhost:12345")
+        mock_client.connect.assert_called_once()
+        mock_client.login_user.assert_called_once_with("iggy", "iggy")
+        assert isinstance(client, IggyConnection)
+        assert client.client is mock_client
+        assert mock_container.iggy_connections == [client]
+
+
+def test_iggy_plugin_get_client_retries_connect_until_server_is_up():
+    plugin = IggyPlugin()
+    mock_container = MagicMock()
+    mock_container.get_exposed_port.return_value = "12345"
+    mock_container.iggy_credentials = ("iggy", "iggy")
+    mock_container.iggy_connections = []
+
+    with patch("iggy_py.IggyClient") as MockIggyClient, \
+            patch("gherkin_testcontainers_iggy.plugin.time.sleep"):
+        mock_client = MockIggyClient.return_value
+        mock_client.connect.side_effect = [RuntimeError("refused"), None]
+
+        plugin.get_client(mock_container)
+
+        assert mock_client.connect.call_count == 2
+
+
+def test_iggy_plugin_on_stop_closes_connections():
+    plugin = IggyPlugin()
+    mock_container = MagicMock()
+    connection = MagicMock()
+    mock_container.iggy_connections = [connection]
+
+    plugin.on_stop(mock_container)
+
+    connection.close.assert_called_once()
+    assert mock_container.iggy_connections == []
+
+
+def test_iggy_connection_send_batch_chunks_messages():
+    raw = MagicMock()
+    connection = IggyConnection(raw)
+
+    sent = connection.send_batch("s", "t", [f"m{i}" for i in range(5)], batch_size=2)
+
+    assert sent == 5
+    sizes = [len(call.args[3]) for call in raw.send_messages.call_args_list]
+    assert sizes == [2, 2, 1]
+    assert raw.send_messages.call_args_list[0].args[:3] == ("s", "t", 1)
+
+
+def test_iggy_connection_send_batch_rejects_binary_payloads():
+    raw = MagicMock()
+    connection = IggyConnection(raw)
+
+    assert connection.send_batch("s", "t", ["text", "café".encode()]) == 2
+    with pytest.raises(TypeError, match="Payload 1 isn't UTF-8"):
+        connection.send_batch("s", "t", [b"ok", b"\xff\xfe"])
+    with pytest.raises(TypeError, match="Payload 0 is int"):
+        connection.send_batch("s", "t", [42])
+    assert raw.send_messages.call_count == 1
+
+
+def test_iggy_connection_poll_reads_until_count():
+    def message(offset):
+        msg = MagicMock()
+        msg.offset.return_value = offset
+        return msg
+
+    raw = MagicMock()
+    raw.poll_messages.side_effect = [
+        [message(0), message(1)],
+        [],
+        [message(2)],
+    ]
+    connection = IggyConnection(raw)
+
+    with patch("gherkin_testcontainers_iggy.plugin.time.sleep"):
+        messages = connection.poll("s", "t", count=3, batch_size=2)
+
+    assert [m.offset() for m in messages] == [0, 1, 2]
+    assert raw.poll_messages.call_count == 3
+    assert raw.poll_messages.call_args_list[0].args[4] == 2
+    assert raw.poll_messages.call_args_list[2].args[4] == 1
+
+
+def test_iggy_connection_ensure_topic_creates_missing_entities():
+    raw = MagicMock()
+    raw.get_stream.return_value = None
+    raw.get_topic.return_value = None
+    connection = IggyConnection(raw)
+
+    connection.ensure_topic("s", "t", partitions_count=3)
+
+    raw.create_stream.assert_called_once_with(name="s")
+    raw.create_topic.assert_called_once_with(stream="s", name="t", partitions_count=3)
+
+
+def test_iggy_plugin_binds_to_external_server_with_url_credentials():
+    service = IggyPlugin().create_external("tcp://admin:pw@iggy:8090")
+    assert service.iggy_credentials == ("admin", "pw")
+    assert service.get_exposed_port(IGGY_TCP_PORT) == 8090
+    assert service.iggy_connections == []
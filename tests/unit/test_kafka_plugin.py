@@ -46,3 +46,97 @@ def test_kafka_plugin_get_client_returns_kafka_producer():
 
         MockProducer.assert_called_once_with(bootstrap_servers="localhost:9093")
         assert client is mock_producer
+
+
+def test_kafka_close_client_bounds_flush():
+    producer = MagicMock()
+    KafkaPlugin().close_client(producer)
+    producer.close.assert_called_once_with(timeout=10.0)
+
+
+def test_kafka_bulk_publish_sends_then_flushes():
+    producer = MagicMock()
+    KafkaPlugin().bulk_publish(producer, "events", iter([b"a", b"b"]))
+    assert producer.send.call_count == 2
+    producer.send.assert_any_call("events", value=b"b")
+    producer.flush.assert_called_once_with()
+
+
+def test_kafka_bulk_publish_raises_on_failed_sends():
+    import pytest
+
+    producer = MagicMock()
+    producer.send.return_value.add_errback.side_effect = lambda errback: errback(ValueError("x"))
+    with pytest.raises(RuntimeError, match="1 Kafka send"):
+        KafkaPlugin().bulk_publish(producer, "events", [b"a"])
+
+
+def test_kafka_plugin_binds_to_external_broker():
+    from gherkin_testcontainers_kafka.plugin import ExternalKafka
+
+    service = KafkaPlugin().create_external("broker:9092")
+    assert isinstance(service, ExternalKafka)
+    assert service.get_bootstrap_server() == "broker:9092"
+
+
+def test_kafka_load_operation_waits_for_the_ack():
+    producer = MagicMock()
+    KafkaPlugin().load_operation(producer, "events", message_size=4)(7)
+    producer.send.assert_called_once_with("events", value=b"7...")
+    producer.send.return_value.get.assert_called_once_with(timeout=30.0)
+
+
+def test_kafka_standin_produces_and_consumes_in_memory():
+    from gherkin_testcontainers_kafka import open_consumer
+
+    plugin = KafkaPlugin()
+    producer = plugin.get_client(plugin.create_external("memory://"))
+    metadata = producer.send("orders", b"one", key=b"k").get(timeout=1)
+    assert (metadata.topic, metadata.partition, metadata.offset) == ("orders", 0, 0)
+    producer.send("orders", b"two", headers=[("h", b"v")])
+    producer.flush()
+    consumer = open_consumer(producer, "orders", auto_offset_reset="earliest", consumer_timeout_ms=50)
+    records = list(consumer)
+    assert [(r.key, r.value, r.headers) for r in records] == [(b"k", b"one", []), (None, b"two", [("h", b"v")])]
+    plugin.close_client(producer)
+
+
+def test_kafka_standin_group_members_share_records():
+    from gherkin_testcontainers_kafka import open_consumer
+
+    plugin = KafkaPlugin()
+    producer = plugin.get_client(plugin.create_external("memory://"))
+    members = [
+        open_consumer(producer, "t", group_id="g", auto_offset_reset="earliest", consumer_timeout_ms=50)
+        for _ in range(2)
+    ]
+    for value in range(4):
+        producer.send("t", str(value).encode())
+    first = members[0].poll(timeout_ms=10, max_records=3)
+    assert [r.value for batch in first.values() for r in batch] == [b"0", b"1", b"2"]
+    assert [r.value for r in members[1]] == [b"3"]
+
+
+def test_kafka_open_consumer_uses_bootstrap_servers_of_a_real_producer():
+    producer = MagicMock()
+    producer.config = {"bootstrap_servers": "localhost:9093"}
+    with patch("kafka.KafkaConsumer") as MockConsumer:
+        from gherkin_testcontainers_kafka import open_consumer
+
+        open_consumer(producer, "t", group_id="g")
+    MockConsumer.assert_called_once_with("t", bootstrap_servers="localhost:9093", group_id="g")
+
+
+def test_kafka_reset_deletes_consumer_groups_and_user_topics():
+    plugin = KafkaPlugin()
+    container = MagicMock()
+    container.get_bootstrap_server.return_value = "localhost:9092"
+    with patch("kafka.KafkaAdminClient") as MockAdmin:
+        admin = MockAdmin.return_value
+        admin.list_consumer_groups.return_value = [("g", "consumer")]
+        admin.list_topics.side_effect = [["__consumer_offsets", "orders"], ["orders"], ["__consumer_offsets"]]
+        plugin.reset(container)
+    MockAdmin.assert_called_once_with(bootstrap_servers="localhost:9092")
+    admin.delete_consumer_groups.assert_called_once_with(["g"])
+    assert admin.delete_topics.call_args.args == (["orders"],)
+    admin.close.assert_called_once()
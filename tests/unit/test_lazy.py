@@ -0,0 +1,60 @@
+import pytest
+from unittest.mock import MagicMock
+from gherkin_testcontainers.lazy import LazyClient, resolve
+
+
+def test_lazy_client_loads_once_on_first_attribute_access():
+    target = MagicMock()
+    load = MagicMock(return_value=target)
+    client = LazyClient(load)
+    load.assert_not_called()
+    client.execute("SELECT 1")
+    client.commit()
+    load.assert_called_once()
+    target.execute.assert_called_once_with("SELECT 1")
+
+
+def test_lazy_client_forwards_special_methods():
+    client = LazyClient(lambda: [1, 2, 3])
+    assert len(client) == 3
+    assert list(client) == [1, 2, 3]
+    assert client[0] == 1
+    assert 2 in client
+    assert client == [1, 2, 3]
+
+
+def test_lazy_client_forwards_calls_and_context_manager():
+    target = MagicMock()
+    client = LazyClient(lambda: target)
+    client("x")
+    target.assert_called_once_with("x")
+    with client as entered:
+        assert entered is target.__enter__.return_value
+    target.__exit__.assert_called_once()
+
+
+def test_lazy_client_sets_attributes_on_target():
+    target = MagicMock()
+    client = LazyClient(lambda: target)
+    client.autocommit = True
+    assert target.autocommit is True
+
+
+def test_lazy_client_repr_does_not_load():
+    load = MagicMock()
+    assert repr(LazyClient(load)) == "<LazyClient (not started)>"
+    load.assert_not_called()
+
+
+def test_lazy_client_propagates_load_errors():
+    def load():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        LazyClient(load).ping()
+
+
+def test_resolve_returns_target_or_object_itself():
+    target = object()
+    assert resolve(LazyClient(lambda: target)) is target
+    assert resolve(target) is target
@@ -0,0 +1,38 @@
+import threading
+import pytest
+from gherkin_testcontainers.leaks import LeakDetector, ResourceSnapshot, take_snapshot
+
+
+def test_snapshot_difference():
+    after = ResourceSnapshot(fds=12, threads=5, rss_bytes=2048)
+    before = ResourceSnapshot(fds=10, threads=5, rss_bytes=None)
+    assert (after - before).as_dict() == {"fds": 2, "threads": 0, "rss_bytes": None}
+
+
+def test_take_snapshot_reports_current_usage():
+    snapshot = take_snapshot()
+    assert snapshot.threads >= 1
+    assert snapshot.fds is None or snapshot.fds > 0
+
+
+def test_leak_detector_reports_open_files_and_threads(tmp_path):
+    detector = LeakDetector()
+    detector.start()
+    handle = open(tmp_path / "leak.txt", "w")
+    stop = threading.Event()
+    thread = threading.Thread(target=stop.wait)
+    thread.start()
+    try:
+        growth = detector.stop()
+    finally:
+        stop.set()
+        thread.join()
+        handle.close()
+    if growth.fds is not None:
+        assert growth.fds >= 1
+    assert growth.threads >= 1
+
+
+def test_leak_detector_stop_requires_start():
+    with pytest.raises(RuntimeError):
+        LeakDetector().stop()
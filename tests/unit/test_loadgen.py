@@ -0,0 +1,221 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from unittest.mock import MagicMock
+
+from gherkin_testcontainers.loadgen import (
+    LatencyHistogram,
+    load,
+    message_payload,
+    run_load,
+)
+from gherkin_testcontainers.manager import ContainerManager
+from gherkin_testcontainers.plugin import ContainerPlugin
+from gherkin_testcontainers.registry import PluginRegistry
+
+
+def test_histogram_is_exact_for_small_values():
+    histogram = LatencyHistogram(precision_bits=3)
+    for micros in range(1, 11):
+        histogram.record(micros / 1_000_000)
+    assert histogram.percentile(50) == pytest.approx(5e-6)
+    assert histogram.percentile(100) == pytest.approx(10e-6)
+    assert histogram.mean == pytest.approx(5.5e-6)
+
+
+def test_histogram_relative_error_is_bounded():
+    histogram = LatencyHistogram(precision_bits=7)
+    values = [0.0001 * 1.37 ** n for n in range(40)]
+    for value in values:
+        histogram.record(value)
+    for n, value in enumerate(sorted(values), start=1):
+        reported = histogram.percentile(100 * n / len(values))
+        assert value * 0.99 <= reported <= value * 1.01
+
+
+def test_histogram_merge_combines_counts_and_extremes():
+    first, second = LatencyHistogram(), LatencyHistogram()
+    first.record(0.001)
+    second.record(0.003)
+    second.record(0.002)
+    first.merge(second)
+    assert first.count == 3
+    assert first.min_us == 1000 and first.max_us == 3000
+    assert first.summary()["max_ms"] == 3.0
+
+
+def test_histogram_merge_rejects_other_precision():
+    with pytest.raises(ValueError):
+        LatencyHistogram(5).merge(LatencyHistogram(7))
+
+
+def test_run_load_closed_loop_runs_every_operation_once():
+    seen = []
+    lock = threading.Lock()
+
+    def operation(index):
+        with lock:
+            seen.append(index)
+
+    result = run_load(operation, count=200, concurrency=4)
+    assert sorted(seen) == list(range(200))
+    assert result.operations == 200 and result.errors == 0
+    assert result.throughput > 0
+
+
+def test_run_load_open_loop_paces_to_the_rate():
+    result = run_load(lambda index: None, count=20, rate=100, concurrency=2)
+    # 20 operations at 100/s: the last is scheduled 190ms after the first.
+    assert result.seconds >= 0.19
+    assert result.rate == 100
+
+
+def test_run_load_open_loop_measures_from_the_scheduled_time():
+    # One worker, 10ms operations at 200/s: the schedule falls behind and
+    # later operations wait, which must show up in their latency.
+    result = run_load(lambda index: time.sleep(0.01), count=10, rate=200, concurrency=1)
+    assert result.percentile(100) >= 0.04
+
+
+def test_run_load_counts_errors():
+    def operation(index):
+        if index % 2:
+            raise ValueError(f"odd {index}")
+
+    result = run_load(operation, count=10, concurrency=1)
+    assert result.operations == 5 and result.errors == 5
+    assert result.first_error.startswith("ValueError: odd")
+
+
+def test_run_load_with_duration():
+    result = run_load(lambda index: time.sleep(0.001), duration=0.05, concurrency=2)
+    assert result.operations > 0
+    assert result.seconds < 1
+
+
+def test_run_load_runs_coroutines_as_tasks():
+    async def operation(index):
+        await asyncio.sleep(0.001)
+
+    result = run_load(operation, count=50, concurrency=10)
+    assert result.operations == 50
+
+
+def test_run_load_needs_count_or_duration():
+    with pytest.raises(ValueError):
+        run_load(lambda index: None)
+
+
+def test_run_load_with_one_worker_stays_on_the_calling_thread():
+    threads = set()
+    run_load(lambda index: threads.add(threading.current_thread()), count=5, concurrency=1)
+    assert threads == {threading.current_thread()}
+
+
+def test_message_payload_has_the_requested_size():
+    assert message_payload(42, 8) == b"42......"
+    assert len(message_payload(7)) == 100
+
+
+def test_load_caps_concurrency_at_the_plugin_limit():
+    operation = MagicMock()
+
+    class SerialPlugin(ContainerPlugin):
+        max_load_concurrency = 1
+
+        @property
+        def name(self) -> str:
+            return "serial"
+
+        def create_container(self, **kwargs):
+            return MagicMock()
+
+        def get_client(self, container):
+            return MagicMock()
+
+        def load_operation(self, client, target, **options):
+            assert target == "SELECT 1" and options == {"message_size": 10}
+            return operation
+
+    PluginRegistry._plugins.clear()
+    PluginRegistry.register("serial", SerialPlugin)
+    try:
+        result = load(ContainerManager(), "serial", "SELECT 1", count=3, concurrency=8, message_size=10)
+    finally:
+        PluginRegistry._plugins.clear()
+    assert result.concurrency == 1
+    assert operation.call_count == 3
+
+
+def test_load_does_not_cap_coroutine_operations():
+    class AsyncPlugin(ContainerPlugin):
+        max_load_concurrency = 1
+
+        @property
+        def name(self) -> str:
+            return "async"
+
+        def create_container(self, **kwargs):
+            return MagicMock()
+
+        def get_client(self, container):
+            return MagicMock()
+
+        def load_operation(self, client, target, **options):
+            async def run(index):
+                await asyncio.sleep(0)
+
+            return run
+
+    PluginRegistry._plugins.clear()
+    PluginRegistry.register("async", AsyncPlugin)
+    try:
+        result = load(ContainerManager(), "async", "http://app", count=10, concurrency=5)
+    finally:
+        PluginRegistry._plugins.clear()
+    assert result.concurrency == 5 and result.operations == 10
+
+
+def test_load_gives_each_worker_its_own_client_when_asked():
+    clients, closed, used = [], [], {}
+
+    class ConnectionPlugin(ContainerPlugin):
+        load_client_per_worker = True
+
+        @property
+        def name(self) -> str:
+            return "conn"
+
+        def create_container(self, **kwargs):
+            return MagicMock()
+
+        def get_client(self, container):
+            client = MagicMock()
+            clients.append(client)
+            return client
+
+        def close_client(self, client):
+            closed.append(client)
+
+        def load_operation(self, client, target, **options):
+            def run(index):
+                used.setdefault(client, set()).add(threading.current_thread())
+                time.sleep(0.001)
+
+            return run
+
+    PluginRegistry._plugins.clear()
+    PluginRegistry.register("conn", ConnectionPlugin)
+    manager = ContainerManager()
+    try:
+        result = load(manager, "conn", "SELECT 1", count=40, concurrency=4)
+        manager.stop_all()
+    finally:
+        PluginRegistry._plugins.clear()
+    assert result.concurrency == 4 and result.operations == 40
+    scenario_client, *worker_clients = clients
+    assert len(worker_clients) == 4 and closed[:4] == worker_clients
+    assert scenario_client not in used
+    assert all(len(threads) == 1 for threads in used.values())
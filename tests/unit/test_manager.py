@@ -59,6 +59,19 @@ def test_start_passes_kwargs_to_plugin():
     assert container._kwargs == {"image": "custom:latest"}
 
 
+def test_get_container_returns_running_container():
+    manager = ContainerManager()
+    manager.start("fake")
+    container, _ = manager._containers["fake"]
+    assert manager.get_container("fake") is container
+
+
+def test_get_container_raises_when_not_running():
+    manager = ContainerManager()
+    with pytest.raises(KeyError, match="fake"):
+        manager.get_container("fake")
+
+
 def test_stop_all_stops_containers_and_calls_hooks():
     manager = ContainerManager()
     manager.start("fake")
@@ -71,3 +84,445 @@ def test_stop_all_stops_containers_and_calls_hooks():
 def test_stop_all_on_empty_manager():
     manager = ContainerManager()
     manager.stop_all()  # should not raise
+
+
+def test_submit_starts_container_in_background():
+    manager = ContainerManager()
+    future = manager.submit("fake", image="fake:1")
+    client = future.result(timeout=5)
+    assert manager.get_client("fake") is client
+    assert manager.get_container("fake")._kwargs == {"image": "fake:1"}
+    manager.stop_all()
+
+
+def test_start_waits_for_in_flight_submit():
+    import threading
+
+    release = threading.Event()
+    created = []
+
+    class SlowPlugin(FakePlugin):
+        def create_container(self, **kwargs):
+            release.wait(5)
+            created.append(kwargs)
+            return super().create_container(**kwargs)
+
+    PluginRegistry.register("fake", SlowPlugin)
+    manager = ContainerManager()
+    future = manager.submit("fake")
+    assert manager.submit("fake") is future
+    release.set()
+    assert manager.start("fake") is future.result(timeout=5)
+    assert len(created) == 1
+    manager.stop_all()
+
+
+def test_concurrent_start_and_submit_share_one_start():
+    import threading
+
+    entered = threading.Event()
+    release = threading.Event()
+    created = []
+
+    class SlowPlugin(FakePlugin):
+        def create_container(self, **kwargs):
+            entered.set()
+            release.wait(5)
+            created.append(kwargs)
+            return super().create_container(**kwargs)
+
+    PluginRegistry.register("fake", SlowPlugin)
+    manager = ContainerManager()
+    clients = []
+    starter = threading.Thread(target=lambda: clients.append(manager.start("fake")))
+    starter.start()
+    assert entered.wait(5)
+    future = manager.submit("fake")
+    release.set()
+    starter.join(5)
+    assert clients == [future.result(timeout=5)]
+    assert len(created) == 1
+    manager.stop_all()
+
+
+def test_stop_all_stops_containers_started_in_background():
+    manager = ContainerManager()
+    manager.submit("fake")
+    manager.stop_all()
+    assert manager._containers == {}
+    assert manager._pending == {}
+
+
+def test_lazy_client_starts_on_first_use_for_thread_bound_plugins():
+    class ThreadBoundPlugin(FakePlugin):
+        background_start = False
+
+    PluginRegistry.register("fake", ThreadBoundPlugin)
+    manager = ContainerManager()
+    client = manager.get_lazy_client("fake")
+    assert manager._containers == {} and manager._pending == {}
+    client.execute("SELECT 1")
+    assert "fake" in manager._containers
+
+
+def test_failed_background_start_surfaces_on_first_use():
+    class BrokenPlugin(FakePlugin):
+        def create_container(self, **kwargs):
+            raise RuntimeError("no docker")
+
+    PluginRegistry.register("fake", BrokenPlugin)
+    manager = ContainerManager()
+    client = manager.get_lazy_client("fake")
+    with pytest.raises(RuntimeError, match="no docker"):
+        client.ping()
+    manager.stop_all()
+
+
+def test_manager_stats_count_docker_api_calls_since_creation():
+    from gherkin_testcontainers.docker_client import SharedDockerClient
+
+    with patch.object(SharedDockerClient, "api_calls", side_effect=[10, 13, 15]):
+        manager = ContainerManager()
+        manager.start("fake")
+        assert manager.stats["docker_api_calls"] == 3
+        manager.stop_all()
+        assert manager.stats["docker_api_calls"] == 5
+
+
+def test_stop_all_closes_clients_before_on_stop():
+    calls = []
+
+    class OrderedPlugin(FakePlugin):
+        def close_client(self, client):
+            calls.append("close_client")
+
+        def on_stop(self, container):
+            calls.append("on_stop")
+
+    PluginRegistry.register("fake", OrderedPlugin)
+    manager = ContainerManager()
+    container_client = manager.start("fake")
+    container = manager.get_container("fake")
+    container.stop.side_effect = lambda: calls.append("stop")
+    manager.stop_all()
+    assert calls == ["close_client", "on_stop", "stop"]
+    assert container_client is not None
+
+
+def test_stop_all_stops_container_when_close_client_fails():
+    class BrokenClosePlugin(FakePlugin):
+        def close_client(self, client):
+            raise OSError("socket already gone")
+
+    PluginRegistry.register("fake", BrokenClosePlugin)
+    manager = ContainerManager()
+    manager.start("fake")
+    container = manager.get_container("fake")
+    manager.stop_all()
+    container.stop.assert_called_once()
+
+
+def test_stop_all_releases_everything_when_a_teardown_fails(tmp_path):
+    from gherkin_testcontainers.budget import HostBudget, ResourceSpec
+
+    class BrokenStopPlugin(FakePlugin):
+        resources = ResourceSpec(memory_mb=100)
+
+        def on_stop(self, container):
+            raise RuntimeError("on_stop broke")
+
+    class OtherPlugin(FakePlugin):
+        resources = ResourceSpec(memory_mb=100)
+
+        @property
+        def name(self) -> str:
+            return "other"
+
+    PluginRegistry.register("fake", BrokenStopPlugin)
+    PluginRegistry.register("other", OtherPlugin)
+    budget = HostBudget(memory_mb=1000, cpus=2.0, path=str(tmp_path / "budget.json"))
+    manager = ContainerManager(budget=budget)
+    manager.start("fake")
+    manager.start("other")
+    broken, other = manager.get_container("fake"), manager.get_container("other")
+
+    with pytest.raises(RuntimeError, match="on_stop broke"):
+        manager.stop_all()
+
+    broken.stop.assert_called_once()
+    other.stop.assert_called_once()
+    assert budget.usage() == (0, 0)
+    assert manager._containers == {}
+
+
+def _pausable_plugin():
+    from testcontainers.core.container import DockerContainer
+
+    class PausablePlugin(FakePlugin):
+        def create_container(self, **kwargs):
+            container = MagicMock(spec=DockerContainer)
+            container.get_wrapped_container.return_value = MagicMock()
+            return container
+
+    return PausablePlugin
+
+
+def test_pause_idle_pauses_only_released_containers_past_timeout():
+    PluginRegistry.register("fake", _pausable_plugin())
+    manager = ContainerManager(idle_timeout=60)
+    manager.start("fake")
+    docker_container = manager.get_container("fake").get_wrapped_container()
+    assert manager.pause_idle() == []  # still in use by the scenario
+
+    manager.release()
+    assert manager.pause_idle() == []  # released, but not idle long enough
+
+    with patch("gherkin_testcontainers.manager.time.monotonic", return_value=10**9):
+        assert manager.pause_idle() == ["fake"]
+    docker_container.pause.assert_called_once()
+    assert manager.stats["pauses"] == {"fake": 1}
+    manager.stop_all()
+
+
+def test_get_client_unpauses_and_records_latency():
+    PluginRegistry.register("fake", _pausable_plugin())
+    manager = ContainerManager(idle_timeout=0)
+    client = manager.start("fake")
+    docker_container = manager.get_container("fake").get_wrapped_container()
+    manager.release()
+    assert manager.pause_idle() == ["fake"]
+
+    assert manager.get_client("fake") is client
+    docker_container.unpause.assert_called_once()
+    assert len(manager.stats["unpause_seconds"]["fake"]) == 1
+    report = manager.idle_report()["fake"]
+    assert report["unpauses"] == 1
+    assert report["start_seconds"] == manager.stats["start_seconds"]["fake"]
+    manager.stop_all()
+
+
+def test_stop_all_unpauses_before_closing_clients():
+    PluginRegistry.register("fake", _pausable_plugin())
+    manager = ContainerManager(idle_timeout=0)
+    manager.start("fake")
+    docker_container = manager.get_container("fake").get_wrapped_container()
+    manager.release()
+    manager.pause_idle()
+    manager.stop_all()
+    docker_container.unpause.assert_called_once()
+
+
+def test_pause_idle_skips_non_docker_containers():
+    manager = ContainerManager(idle_timeout=0)
+    manager.start("fake")
+    manager.release()
+    assert manager.pause_idle() == []
+    manager.stop_all()
+
+
+def test_idle_thread_pauses_in_background():
+    import time
+
+    PluginRegistry.register("fake", _pausable_plugin())
+    manager = ContainerManager(idle_timeout=0.05)
+    manager.start("fake")
+    docker_container = manager.get_container("fake").get_wrapped_container()
+    manager.release()
+    deadline = time.monotonic() + 5
+    while not docker_container.pause.called and time.monotonic() < deadline:
+        time.sleep(0.01)
+    docker_container.pause.assert_called_once()
+    manager.stop_all()
+    assert manager._idle_thread is None
+
+
+def test_start_reserves_budget_and_stop_all_releases_it(tmp_path):
+    from gherkin_testcontainers.budget import HostBudget, ResourceSpec
+
+    class HungryPlugin(FakePlugin):
+        resources = ResourceSpec(memory_mb=700, cpus=1.0)
+
+    PluginRegistry.register("fake", HungryPlugin)
+    budget = HostBudget(memory_mb=1000, cpus=2.0, path=str(tmp_path / "budget.json"))
+    manager = ContainerManager(budget=budget)
+    manager.start("fake")
+    assert budget.usage() == (700, 1.0)
+    assert manager.stats["queue_wait_seconds"]["fake"] >= 0
+    manager.stop_all()
+    assert budget.usage() == (0, 0)
+
+
+def test_start_releases_budget_when_start_fails(tmp_path):
+    from gherkin_testcontainers.budget import HostBudget, ResourceSpec
+
+    class BrokenPlugin(FakePlugin):
+        resources = ResourceSpec(memory_mb=700, cpus=1.0)
+
+        def create_container(self, **kwargs):
+            raise RuntimeError("no docker")
+
+    PluginRegistry.register("fake", BrokenPlugin)
+    budget = HostBudget(memory_mb=1000, cpus=2.0, path=str(tmp_path / "budget.json"))
+    manager = ContainerManager(budget=budget)
+    with pytest.raises(RuntimeError):
+        manager.start("fake")
+    assert budget.usage() == (0, 0)
+
+
+def test_start_stops_the_container_when_get_client_fails(tmp_path):
+    from gherkin_testcontainers.budget import HostBudget, ResourceSpec
+
+    containers = []
+
+    class BrokenClientPlugin(FakePlugin):
+        resources = ResourceSpec(memory_mb=700, cpus=1.0)
+
+        def create_container(self, **kwargs):
+            containers.append(super().create_container(**kwargs))
+            return containers[-1]
+
+        def get_client(self, container):
+            raise RuntimeError("refused")
+
+    PluginRegistry.register("fake", BrokenClientPlugin)
+    budget = HostBudget(memory_mb=1000, cpus=2.0, path=str(tmp_path / "budget.json"))
+    manager = ContainerManager(budget=budget)
+    with pytest.raises(RuntimeError, match="refused"):
+        manager.start("fake")
+    [container] = containers
+    assert container.on_stop_called
+    container.stop.assert_called_once()
+    assert budget.usage() == (0, 0)
+
+
+def test_enforced_resources_are_applied_as_docker_limits():
+    from testcontainers.core.container import DockerContainer
+    from gherkin_testcontainers.budget import ResourceSpec
+
+    class LimitedPlugin(FakePlugin):
+        def create_container(self, **kwargs):
+            container = DockerContainer("fake:1", shm_size="64m")
+            container.start = MagicMock()
+            return container
+
+    PluginRegistry.register("fake", LimitedPlugin)
+    manager = ContainerManager()
+    with patch("gherkin_testcontainers.docker_client.DockerClient"), \
+            patch("gherkin_testcontainers.docker_client.SharedDockerClient._client", None):
+        manager.start("fake", resources=ResourceSpec(memory_mb=256, cpus=0.5, enforce=True))
+    container = manager.get_container("fake")
+    assert container._kwargs == {
+        "shm_size": "64m", "mem_limit": "256m", "nano_cpus": 500_000_000,
+    }
+
+
+def test_sample_interval_samples_docker_containers():
+    PluginRegistry.register("fake", _pausable_plugin())
+    summary = {"samples": 1}
+    with patch("gherkin_testcontainers.manager.ContainerSampler") as sampler_cls:
+        sampler = sampler_cls.return_value.start.return_value
+        sampler.summary.return_value = summary
+        manager = ContainerManager(sample_interval=0.5, max_samples=10)
+        manager.start("fake")
+        docker_container = manager.get_container("fake").get_wrapped_container()
+        sampler_cls.assert_called_once_with(docker_container, 0.5, 10)
+        assert manager.resource_usage(since=1.0) == {"fake": summary}
+        sampler.summary.assert_called_once_with(1.0)
+        manager.stop_all()
+        sampler.stop.assert_called_once()
+    assert manager.resource_usage() == {}
+    assert "fake" in manager.stats["stop_seconds"]
+
+
+class ExternalFakePlugin(FakePlugin):
+    def create_external(self, endpoint, **kwargs):
+        service = MagicMock()
+        service.endpoint = endpoint
+        service._kwargs = kwargs
+        return service
+
+
+def test_start_with_endpoint_kwarg_skips_container(tmp_path):
+    from gherkin_testcontainers.budget import HostBudget, ResourceSpec
+
+    class Plugin(ExternalFakePlugin):
+        resources = ResourceSpec(memory_mb=700, cpus=1.0)
+
+        def create_container(self, **kwargs):
+            raise AssertionError("no container should be created")
+
+    PluginRegistry.register("fake", Plugin)
+    budget = HostBudget(memory_mb=1000, cpus=2.0, path=str(tmp_path / "budget.json"))
+    manager = ContainerManager(budget=budget)
+    manager.start("fake", endpoint="fake://svc:1", option=1)
+    service, _ = manager._containers["fake"]
+    assert service.endpoint == "fake://svc:1"
+    assert service._kwargs == {"option": 1}
+    assert service.on_start_called is True
+    service.start.assert_not_called()
+    assert budget.usage() == (0, 0)
+    manager.stop_all()
+    assert service.on_stop_called is True
+    service.stop.assert_not_called()
+
+
+def test_start_reads_endpoint_from_environment(monkeypatch):
+    PluginRegistry.register("fake", ExternalFakePlugin)
+    monkeypatch.setenv("GTC_FAKE_URL", "fake://from-env:2")
+    manager = ContainerManager()
+    manager.start("fake")
+    service, _ = manager._containers["fake"]
+    assert service.endpoint == "fake://from-env:2"
+    manager.stop_all()
+
+
+def test_start_with_endpoint_raises_for_plugins_without_external_support():
+    manager = ContainerManager()
+    with pytest.raises(NotImplementedError):
+        manager.start("fake", endpoint="fake://svc:1")
+
+
+def test_reset_empties_in_memory_standins_and_reconnects():
+    from gherkin_testcontainers.memory import MemoryService
+
+    class StandinPlugin(FakePlugin):
+        def create_external(self, endpoint, **kwargs):
+            return MemoryService(endpoint)
+
+        def get_client(self, container):
+            return MagicMock(log=container.log)
+
+    PluginRegistry.register("fake", StandinPlugin)
+    manager = ContainerManager()
+    first = manager.start("fake", endpoint="memory://")
+    first.log.create("orders")
+    manager.reset()
+    client = manager.get_client("fake")
+    assert client is not first
+    assert client.log is manager.get_container("fake").log
+    assert "orders" not in client.log
+    manager.stop_all()
+
+
+def test_reset_recreates_clients_of_owned_containers_only():
+    calls = []
+
+    class ResettablePlugin(ExternalFakePlugin):
+        def close_client(self, client):
+            calls.append("close_client")
+
+        def reset(self, container):
+            calls.append("reset")
+
+    PluginRegistry.register("fake", ResettablePlugin)
+    PluginRegistry.register("bound", ResettablePlugin)
+    manager = ContainerManager()
+    first = manager.start("fake")
+    manager.start("bound", endpoint="fake://svc:1")
+    container = manager.get_container("fake")
+    manager.reset()
+    assert calls == ["close_client", "reset"]
+    assert manager.get_client("fake") is not first
+    assert manager.get_container("fake") is container
+    container.stop.assert_not_called()
+    manager.stop_all()
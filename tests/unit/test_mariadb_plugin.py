@@ -1,5 +1,8 @@
 # tests/unit/test_mariadb_plugin.py
 from unittest.mock import patch, MagicMock
+
+import pytest
+
 from gherkin_testcontainers_mariadb.plugin import MariadbPlugin
 from gherkin_testcontainers.plugin import ContainerPlugin
 
@@ -21,3 +24,60 @@ def test_mariadb_plugin_create_container():
     ) as MockContainer:
         plugin.create_container(image="mariadb:11")
         MockContainer.assert_called_once_with(image="mariadb:11")
+
+
+def test_mariadb_close_client_disposes_engine():
+    connection = MagicMock()
+    MariadbPlugin().close_client(connection)
+    connection.close.assert_called_once()
+    connection.engine.dispose.assert_called_once()
+
+
+def test_mariadb_bulk_load_uses_load_data_local_infile():
+    import os
+
+    client = MagicMock()
+    captured = {}
+
+    def exec_driver_sql(statement, params):
+        captured["statement"] = statement
+        with open(params[0], encoding="utf-8") as handle:
+            captured["data"] = handle.read()
+        captured["path"] = params[0]
+
+    client.exec_driver_sql.side_effect = exec_driver_sql
+    rows = iter([(1, 'say "hi"'), (2, None), (3, True)])
+    MariadbPlugin().bulk_load(client, "users", ["id", "name"], rows)
+    assert captured["statement"].startswith("LOAD DATA LOCAL INFILE %s INTO TABLE `users`")
+    assert captured["statement"].endswith("(`id`, `name`)")
+    assert captured["data"] == '"1","say ""hi"""\n"2",NULL\n"3","1"\n'
+    client.commit.assert_called_once()
+    assert not os.path.exists(captured["path"])
+
+
+def _capture_load_data(client):
+    captured = {}
+
+    def exec_driver_sql(statement, params):
+        captured["statement"] = statement
+        with open(params[0], encoding="utf-8") as handle:
+            captured["data"] = handle.read()
+
+    client.exec_driver_sql.side_effect = exec_driver_sql
+    return captured
+
+
+def test_mariadb_bulk_load_hex_encodes_bytes():
+    client = MagicMock()
+    captured = _capture_load_data(client)
+    rows = iter([(1, b"\x00\xffab"), (2, None)])
+    MariadbPlugin().bulk_load(client, "blobs", ["id", "payload"], rows)
+    assert captured["statement"].endswith("(`id`, @hex1) SET `payload` = UNHEX(@hex1)")
+    assert captured["data"] == '"1",00ff6162\n"2",NULL\n'
+
+
+def test_mariadb_bulk_load_rejects_columns_mixing_bytes_and_text():
+    client = MagicMock()
+    with pytest.raises(TypeError, match="payload"):
+        MariadbPlugin().bulk_load(client, "blobs", ["id", "payload"], iter([(1, b"a"), (2, "b")]))
+    client.exec_driver_sql.assert_not_called()
@@ -0,0 +1,110 @@
+import threading
+import time
+
+from gherkin_testcontainers.memory import MemoryLog, MemoryService, is_memory_endpoint, standin_selected
+from gherkin_testcontainers.plugin import ContainerPlugin
+
+
+def test_log_appends_with_consecutive_offsets_per_topic():
+    log = MemoryLog()
+    assert log.append("a", b"1").offset == 0
+    assert log.append("a", b"2", key="k", headers={"h": "v"}).offset == 1
+    assert log.append("b", b"3").offset == 0
+    assert [record.value for record in log.read("a", 1)] == [b"2"]
+    assert log.read("a", 0, max_count=1)[0].value == b"1"
+    assert log.end_offset("a") == 2 and log.end_offset("missing") == 0
+
+
+def test_create_reports_existing_topics():
+    log = MemoryLog()
+    assert log.create("a") is True
+    assert log.create("a") is False
+    assert "a" in log and log.topics() == ["a"]
+
+
+def test_claim_hands_each_record_to_one_reader_of_a_group():
+    log = MemoryLog()
+    for value in range(5):
+        log.append("t", value)
+    assert [r.value for r in log.claim("g", "t", 2)] == [0, 1]
+    assert [r.value for r in log.claim("g", "t")] == [2, 3, 4]
+    assert log.claim("g", "t") == []
+    assert [r.value for r in log.claim("other", "t", 1)] == [0]
+
+
+def test_subscribe_from_end_skips_earlier_records():
+    log = MemoryLog()
+    log.append("t", "old")
+    log.subscribe("g", "t", from_end=True)
+    log.append("t", "new")
+    assert [r.value for r in log.claim("g", "t")] == ["new"]
+
+
+def test_redelivered_records_come_first_with_a_count():
+    log = MemoryLog()
+    log.append("t", "a")
+    log.append("t", "b")
+    first = log.claim("g", "t", 1)
+    log.redeliver("g", first)
+    claimed = log.claim("g", "t")
+    assert [(r.value, r.redeliveries) for r in claimed] == [("a", 1), ("b", 0)]
+
+
+def test_poll_waits_for_an_append_from_another_thread():
+    log = MemoryLog()
+    timer = threading.Timer(0.05, log.append, args=("t", "late"))
+    timer.start()
+    started = time.monotonic()
+    records = log.poll(lambda: log.claim("g", "t"), timeout=5)
+    assert [r.value for r in records] == ["late"]
+    assert time.monotonic() - started < 5
+    assert log.poll(lambda: log.claim("g", "t"), timeout=0.01) == []
+
+
+def test_memory_endpoints_and_standin_selection(monkeypatch):
+    assert is_memory_endpoint("memory://") and not is_memory_endpoint("kafka:9092")
+    assert not is_memory_endpoint(None)
+    monkeypatch.setenv("GTC_STANDINS", "kafka, pulsar")
+    assert standin_selected("pulsar") and not standin_selected("google_pubsub")
+    monkeypatch.setenv("GTC_STANDINS", "all")
+    assert standin_selected("google_pubsub")
+    assert MemoryService().start().log is not MemoryService().log
+
+
+class _Plugin(ContainerPlugin):
+    supports_standin = True
+
+    @property
+    def name(self):
+        return "broker"
+
+    def create_container(self, **kwargs):
+        return None
+
+    def get_client(self, container):
+        return None
+
+
+def test_get_endpoint_falls_back_to_memory_for_selected_standins(monkeypatch):
+    monkeypatch.delenv("GTC_STANDINS", raising=False)
+    assert _Plugin().get_endpoint() is None
+    monkeypatch.setenv("GTC_STANDINS", "broker")
+    assert _Plugin().get_endpoint() == "memory://"
+    assert _Plugin().get_endpoint(endpoint="broker:1") == "broker:1"
+    monkeypatch.setenv("GTC_BROKER_URL", "broker:2")
+    assert _Plugin().get_endpoint() == "broker:2"
+    monkeypatch.delenv("GTC_BROKER_URL")
+
+    class NoStandin(_Plugin):
+        supports_standin = False
+
+    assert NoStandin().get_endpoint() is None
+
+
+def test_memory_service_reset_starts_a_fresh_log():
+    service = MemoryService()
+    old = service.log
+    old.create("orders")
+    service.reset()
+    assert service.log is not old
+    assert service.log.topics() == []
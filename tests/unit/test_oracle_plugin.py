@@ -21,3 +21,24 @@ def test_oracle_plugin_create_container():
     ) as MockContainer:
         plugin.create_container(image="gvenzl/oracle-free:slim")
         MockContainer.assert_called_once_with(image="gvenzl/oracle-free:slim")
+
+
+def test_oracle_bulk_load_binds_rows_in_batches():
+    client = MagicMock()
+    cursor = client.cursor.return_value.__enter__.return_value
+    rows = iter([(i, f"name{i}") for i in range(5)])
+    with patch("gherkin_testcontainers_oracle.plugin.BULK_LOAD_BATCH_SIZE", 2):
+        OraclePlugin().bulk_load(client, "users", ["id", "name"], rows)
+    statement = 'INSERT INTO "USERS" ("ID", "NAME") VALUES (:1, :2)'
+    assert [c.args[0] for c in cursor.executemany.call_args_list] == [statement] * 3
+    assert [len(c.args[1]) for c in cursor.executemany.call_args_list] == [2, 2, 1]
+    client.commit.assert_called_once()
+
+
+def test_oracle_bulk_load_quotes_identifiers():
+    client = MagicMock()
+    cursor = client.cursor.return_value.__enter__.return_value
+    OraclePlugin().bulk_load(client, "app.OrderItems", ["id", "level", 'Say"x'], iter([(1, 2, 3)]))
+    assert cursor.executemany.call_args.args[0] == (
+        'INSERT INTO "APP"."OrderItems" ("ID", "LEVEL", "Say""x") VALUES (:1, :2, :3)'
+    )
@@ -0,0 +1,130 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from behave.model_core import FileLocation
+from gherkin_testcontainers.cli import main
+from gherkin_testcontainers.plan import build_plan, format_plan
+from gherkin_testcontainers.plugin import ContainerPlugin
+from gherkin_testcontainers.registry import PluginRegistry
+from gherkin_testcontainers.runner import PLAN_RUNNER, parse_in_order, split_in_order
+from gherkin_testcontainers.scan import ContainerRequest, ScenarioScan
+
+
+def _plugin(plugin_name, estimate):
+    class FakePlugin(ContainerPlugin):
+        startup_estimate = estimate
+
+        @property
+        def name(self) -> str:
+            return plugin_name
+
+        def create_container(self, **kwargs):
+            return MagicMock()
+
+        def get_client(self, container):
+            return MagicMock()
+
+    return FakePlugin
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    PluginRegistry._plugins.clear()
+    PluginRegistry.register("db", _plugin("db", 10.0))
+    PluginRegistry.register("broker", _plugin("broker", 20.0))
+    yield
+    PluginRegistry._plugins.clear()
+
+
+def _scan(line, *plugin_names):
+    scenario = MagicMock(filename="features/a.feature", line=line)
+    return ScenarioScan(scenario, [ContainerRequest(name) for name in plugin_names])
+
+
+def test_build_plan_groups_scenarios_by_signature_in_first_seen_order():
+    scans = [_scan(1, "db"), _scan(2, "broker"), _scan(3, "db"), _scan(4)]
+    plan = build_plan(scans)
+    assert [group.signature for group in plan.groups] == [("db()",), ("broker()",), ()]
+    assert [scan.location for scan in plan.reordered] == [
+        "features/a.feature:1", "features/a.feature:3",
+        "features/a.feature:2", "features/a.feature:4",
+    ]
+
+
+def test_build_plan_places_overlapping_signatures_next_to_each_other():
+    scans = [_scan(1, "db"), _scan(2), _scan(3, "db", "broker")]
+    plan = build_plan(scans)
+    assert [group.signature for group in plan.groups] == [("db()",), ("broker()", "db()"), ()]
+
+
+def test_plan_costs_with_and_without_reuse():
+    scans = [_scan(1, "db"), _scan(2, "broker"), _scan(3, "db"), _scan(4, "broker")]
+    plan = build_plan(scans)
+    assert plan.cost_without_reuse() == 60.0
+    assert plan.cost_with_reuse(plan.scans) == 60.0
+    assert plan.cost_with_reuse(plan.reordered) == 30.0
+
+
+def test_build_plan_reports_unknown_plugins_at_zero_cost():
+    plan = build_plan([_scan(1, "missing", "db")])
+    assert plan.unknown_plugins == ["missing"]
+    assert plan.cost_without_reuse() == 10.0
+    assert "missing" in format_plan(plan)
+
+
+def test_build_plan_costs_external_services_at_zero(monkeypatch):
+    monkeypatch.setenv("GTC_DB_URL", "db://shared:1")
+    plan = build_plan([_scan(1, "db", "broker")])
+    assert plan.cost_without_reuse() == 20.0
+
+
+def test_format_plan_lists_locations_when_verbose():
+    plan = build_plan([_scan(1, "db"), _scan(2)])
+    text = format_plan(plan, verbose=True)
+    assert "db()" in text
+    assert "(no containers)" in text
+    assert "features/a.feature:2" in text
+
+
+def test_cli_plan_writes_reordered_run_list(tmp_path, capsys):
+    order_file = tmp_path / "run.txt"
+    scans = [_scan(1, "db"), _scan(2, "broker"), _scan(3, "db")]
+    with patch("gherkin_testcontainers.cli.load_features", return_value=([], None, None)), \
+            patch("gherkin_testcontainers.cli.scan_features", return_value=scans):
+        assert main(["plan", "-o", str(order_file)]) == 0
+    assert order_file.read_text().splitlines() == [
+        "features/a.feature:1", "features/a.feature:3", "features/a.feature:2",
+    ]
+    assert f"behave --runner={PLAN_RUNNER} @{order_file}" in capsys.readouterr().out
+
+
+def test_split_in_order_splits_where_behave_would_reorder():
+    locations = [
+        FileLocation("a.feature", 6), FileLocation("a.feature", 2), FileLocation("a.feature", 4),
+        FileLocation("b.feature", 3), FileLocation("a.feature", 8),
+    ]
+
+    parts = split_in_order(locations)
+
+    assert [[(loc.filename, loc.line) for loc in part] for part in parts] == [
+        [("a.feature", 6)],
+        [("a.feature", 2), ("a.feature", 4), ("b.feature", 3), ("a.feature", 8)],
+    ]
+
+
+def test_parse_in_order_keeps_listed_scenario_order(tmp_path):
+    feature = tmp_path / "a.feature"
+    feature.write_text(
+        "Feature: a\n"
+        "  Scenario: a1\n    Given x\n"
+        "  Scenario: a2\n    Given x\n"
+        "  Scenario: a3\n    Given x\n"
+    )
+    locations = [FileLocation(str(feature), line) for line in (6, 2, 4)]
+
+    features = parse_in_order(locations)
+
+    selected = [
+        scenario.name for feature in features for scenario in feature.scenarios
+        if not scenario.should_skip
+    ]
+    assert selected == ["a3", "a1", "a2"]
@@ -1,8 +1,31 @@
 # tests/unit/test_playwright_plugin.py
-from unittest.mock import MagicMock, patch
+import os
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
 
 from gherkin_testcontainers.plugin import ContainerPlugin
-from gherkin_testcontainers_playwright.plugin import PlaywrightContainer, PlaywrightPlugin
+from gherkin_testcontainers_playwright.plugin import (
+    AssetCache,
+    AsyncBrowserSession,
+    AsyncPlaywrightClient,
+    BrowserSession,
+    PlaywrightContainer,
+    PlaywrightPlugin,
+    StorageStateCache,
+    _host_matcher,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_session():
+    BrowserSession._playwright = None
+    BrowserSession._browsers = {}
+    BrowserSession._atexit_registered = True
+    yield
+    BrowserSession._playwright = None
+    BrowserSession._browsers = {}
 
 
 def test_playwright_plugin_is_a_container_plugin():
@@ -22,6 +45,7 @@ def test_playwright_plugin_create_container_defaults():
     assert container.browser_type == "chromium"
     assert container.headless is True
     assert container.launch_kwargs == {}
+    assert container.context_kwargs == {}
 
 
 def test_playwright_plugin_create_container_custom_browser():
@@ -37,53 +61,460 @@ def test_playwright_plugin_create_container_passes_extra_kwargs():
     assert container.launch_kwargs == {"slow_mo": 50}
 
 
-def test_playwright_plugin_get_client_returns_new_page():
+def test_playwright_plugin_create_container_separates_context_kwargs():
+    plugin = PlaywrightPlugin()
+    container = plugin.create_container(slow_mo=50, context_kwargs={"locale": "de-DE"})
+    assert container.launch_kwargs == {"slow_mo": 50}
+    assert container.context_kwargs == {"locale": "de-DE"}
+
+
+def test_playwright_plugin_get_client_returns_new_page_in_context():
     plugin = PlaywrightPlugin()
     mock_page = MagicMock()
-    mock_browser = MagicMock()
-    mock_browser.new_page.return_value = mock_page
+    mock_context = MagicMock()
+    mock_context.new_page.return_value = mock_page
 
     container = PlaywrightContainer()
-    container._browser = mock_browser
+    container._context = mock_context
 
     client = plugin.get_client(container)
 
-    mock_browser.new_page.assert_called_once()
+    mock_context.new_page.assert_called_once()
     assert client is mock_page
 
 
-def test_playwright_container_start_launches_browser():
+def test_playwright_container_start_launches_browser_and_opens_context():
     with patch("gherkin_testcontainers_playwright.plugin.sync_playwright") as mock_sync_pw:
         mock_playwright = MagicMock()
         mock_browser = MagicMock()
         mock_sync_pw.return_value.start.return_value = mock_playwright
         mock_playwright.chromium.launch.return_value = mock_browser
 
-        container = PlaywrightContainer(browser_type="chromium", headless=True)
+        container = PlaywrightContainer(
+            browser_type="chromium", headless=True, context_kwargs={"locale": "de-DE"}
+        )
         result = container.start()
 
         mock_playwright.chromium.launch.assert_called_once_with(headless=True)
+        mock_browser.new_context.assert_called_once_with(locale="de-DE")
         assert container._browser is mock_browser
+        assert container._context is mock_browser.new_context.return_value
         assert result is container
 
 
-def test_playwright_container_stop_closes_browser():
+def test_playwright_containers_share_one_browser():
+    with patch("gherkin_testcontainers_playwright.plugin.sync_playwright") as mock_sync_pw:
+        mock_playwright = MagicMock()
+        mock_sync_pw.return_value.start.return_value = mock_playwright
+        mock_browser = mock_playwright.chromium.launch.return_value
+        mock_browser.new_context.side_effect = lambda **kwargs: MagicMock()
+
+        first = PlaywrightContainer().start()
+        first.stop()
+        second = PlaywrightContainer().start()
+
+        mock_sync_pw.return_value.start.assert_called_once()
+        mock_playwright.chromium.launch.assert_called_once()
+        assert mock_browser.new_context.call_count == 2
+        mock_browser.close.assert_not_called()
+        assert second._browser is mock_browser
+
+
+def test_playwright_reset_swaps_in_a_fresh_context_on_the_same_browser():
+    with patch("gherkin_testcontainers_playwright.plugin.sync_playwright") as mock_sync_pw:
+        mock_playwright = MagicMock()
+        mock_sync_pw.return_value.start.return_value = mock_playwright
+        mock_browser = mock_playwright.chromium.launch.return_value
+        mock_browser.new_context.side_effect = lambda **kwargs: MagicMock()
+
+        container = PlaywrightContainer().start()
+        used = container._context
+        PlaywrightPlugin().reset(container)
+
+        used.close.assert_called_once()
+        assert container._context is not used
+        assert container._browser is mock_browser
+        mock_playwright.chromium.launch.assert_called_once()
+
+
+def test_playwright_session_relaunches_crashed_browser():
+    with patch("gherkin_testcontainers_playwright.plugin.sync_playwright") as mock_sync_pw:
+        mock_playwright = MagicMock()
+        mock_sync_pw.return_value.start.return_value = mock_playwright
+        crashed, fresh = MagicMock(), MagicMock()
+        crashed.is_connected.return_value = False
+        mock_playwright.chromium.launch.side_effect = [crashed, fresh]
+
+        PlaywrightContainer().start()
+        container = PlaywrightContainer().start()
+
+        assert mock_playwright.chromium.launch.call_count == 2
+        assert container._browser is fresh
+
+
+def test_playwright_container_stop_closes_context_only():
     mock_browser = MagicMock()
-    mock_playwright = MagicMock()
+    mock_context = MagicMock()
 
     container = PlaywrightContainer()
     container._browser = mock_browser
-    container._playwright = mock_playwright
+    container._context = mock_context
 
     container.stop()
 
-    mock_browser.close.assert_called_once()
-    mock_playwright.stop.assert_called_once()
-    assert container._browser is None
-    assert container._playwright is None
+    mock_context.close.assert_called_once()
+    mock_browser.close.assert_not_called()
+    assert container._context is None
 
 
 def test_playwright_container_stop_is_safe_when_not_started():
     container = PlaywrightContainer()
     # Should not raise
     container.stop()
+
+
+def test_browser_session_shutdown_closes_browsers_and_driver():
+    mock_playwright = MagicMock()
+    mock_browser = MagicMock()
+    BrowserSession._playwright = mock_playwright
+    BrowserSession._browsers = {"chromium": mock_browser}
+
+    BrowserSession.shutdown()
+
+    mock_browser.close.assert_called_once()
+    mock_playwright.stop.assert_called_once()
+    assert BrowserSession._playwright is None
+    assert BrowserSession._browsers == {}
+
+
+def _fake_login(page):
+    page.goto("http://app/login")
+
+
+def _browser_writing_state():
+    browser = MagicMock()
+
+    def new_context(**kwargs):
+        context = MagicMock()
+        context.storage_state.side_effect = lambda path: open(path, "w").write("{}")
+        return context
+
+    browser.new_context.side_effect = new_context
+    return browser
+
+
+def test_storage_state_cache_logs_in_once_and_reuses_state(tmp_path):
+    cache = StorageStateCache(key="admin", directory=str(tmp_path))
+    browser = _browser_writing_state()
+    login = MagicMock()
+
+    first = cache.ensure(browser, login, {"locale": "en-US"})
+    second = cache.ensure(browser, login, {"locale": "en-US"})
+
+    assert first == second == cache.path
+    assert os.path.exists(first)
+    login.assert_called_once()
+    browser.new_context.assert_called_once_with(locale="en-US")
+
+
+def test_storage_state_cache_expires_after_ttl(tmp_path):
+    cache = StorageStateCache(key="admin", ttl=60, directory=str(tmp_path))
+    browser = _browser_writing_state()
+    cache.ensure(browser, MagicMock(), {})
+    assert cache.is_fresh()
+
+    stale = time.time() - 120
+    os.utime(cache.path, (stale, stale))
+
+    assert not cache.is_fresh()
+
+
+def test_storage_state_cache_path_depends_on_app_image(tmp_path):
+    def path_for(image_id):
+        cache = StorageStateCache(key="admin", directory=str(tmp_path), app_image="app:latest")
+        with patch("gherkin_testcontainers_playwright.plugin._image_id", return_value=image_id):
+            return cache.path
+
+    before, after = path_for("sha256:aaa"), path_for("sha256:bbb")
+
+    assert before != after
+    assert os.path.basename(before).startswith("admin-")
+
+
+def test_storage_state_cache_looks_up_app_image_once(tmp_path):
+    cache = StorageStateCache(key="admin", directory=str(tmp_path), app_image="app:latest")
+
+    with patch(
+        "gherkin_testcontainers_playwright.plugin.SharedDockerClient.get"
+    ) as get_client:
+        get_client.return_value.client.images.get.return_value.id = "sha256:aaa"
+        first, second = cache.path, cache.path
+
+    assert first == second
+    get_client.return_value.client.images.get.assert_called_once_with("app:latest")
+
+
+def test_storage_state_cache_invalidate_removes_file(tmp_path):
+    cache = StorageStateCache(key="admin", directory=str(tmp_path))
+    cache.ensure(_browser_writing_state(), MagicMock(), {})
+
+    cache.invalidate()
+    cache.invalidate()
+
+    assert not os.path.exists(cache.path)
+
+
+def test_playwright_plugin_create_container_builds_storage_state_cache(tmp_path):
+    plugin = PlaywrightPlugin()
+    container = plugin.create_container(
+        login=_fake_login, storage_state_ttl=10, storage_state_dir=str(tmp_path)
+    )
+
+    assert container.login is _fake_login
+    assert container.storage_state.key.endswith("_fake_login")
+    assert container.storage_state.ttl == 10
+    assert container.launch_kwargs == {}
+
+
+def test_playwright_container_start_uses_cached_storage_state(tmp_path):
+    browser = _browser_writing_state()
+    cache = StorageStateCache(key="admin", directory=str(tmp_path))
+
+    with patch.object(BrowserSession, "browser", return_value=browser):
+        container = PlaywrightContainer(login=MagicMock(), storage_state=cache).start()
+
+    assert browser.new_context.call_args_list[-1].kwargs == {"storage_state": cache.path}
+    assert container._context is not None
+
+
+def _route(url="https://app/static/app.js", resource_type="script", method="GET"):
+    route = MagicMock()
+    route.request.url = url
+    route.request.method = method
+    route.request.resource_type = resource_type
+    route.request.headers = {"accept": "*/*"}
+    return route
+
+
+def _response(status=200, body=b"console.log(1)", etag='"v1"'):
+    response = MagicMock()
+    response.status = status
+    response.headers = {"etag": etag, "content-type": "text/javascript", "content-encoding": "gzip"}
+    response.body.return_value = body
+    return response
+
+
+def test_asset_cache_falls_back_for_non_asset_requests(tmp_path):
+    cache = AssetCache(str(tmp_path))
+    route = _route(resource_type="document")
+
+    cache.handle(route)
+
+    route.fallback.assert_called_once()
+    route.fetch.assert_not_called()
+
+
+def test_asset_cache_stores_then_serves_from_disk(tmp_path):
+    cache = AssetCache(str(tmp_path), revalidate=False)
+    first = _route()
+    first.fetch.return_value = _response()
+
+    cache.handle(first)
+    first.fulfill.assert_called_once_with(response=first.fetch.return_value)
+
+    second = _route()
+    cache.handle(second)
+
+    second.fetch.assert_not_called()
+    kwargs = second.fulfill.call_args.kwargs
+    assert kwargs["status"] == 200
+    assert "content-encoding" not in kwargs["headers"]
+    with open(kwargs["path"], "rb") as f:
+        assert f.read() == b"console.log(1)"
+
+
+def test_asset_cache_revalidates_with_etag_by_default(tmp_path):
+    cache = AssetCache(str(tmp_path))
+    first = _route()
+    first.fetch.return_value = _response()
+    cache.handle(first)
+
+    second = _route()
+    second.fetch.return_value = _response(status=304)
+    cache.handle(second)
+
+    assert second.fetch.call_args.kwargs["headers"]["if-none-match"] == '"v1"'
+    assert "path" in second.fulfill.call_args.kwargs
+
+    rebuilt = _route()
+    rebuilt.fetch.return_value = _response(body=b"console.log(2)", etag='"v2"')
+    cache.handle(rebuilt)
+
+    rebuilt.fulfill.assert_called_once_with(response=rebuilt.fetch.return_value)
+
+
+def test_host_matcher_matches_patterns():
+    matches = _host_matcher(["*.googletagmanager.com", "cdn.example.com"])
+    assert matches("https://www.googletagmanager.com/gtm.js")
+    assert matches("https://cdn.example.com/lib.js")
+    assert not matches("http://localhost:8080/")
+
+
+def test_playwright_container_installs_routes_in_priority_order(tmp_path):
+    context = MagicMock()
+    cache = AssetCache(str(tmp_path))
+    container = PlaywrightContainer(
+        har_path="app.har", asset_cache=cache, block_hosts=["*.ads.example"]
+    )
+
+    container._install_routes(context)
+
+    names = [call[0] for call in context.method_calls]
+    assert names == ["route", "route_from_har", "route"]
+    assert context.route.call_args_list[0].args == ("**/*", cache.handle)
+    context.route_from_har.assert_called_once_with("app.har", not_found="fallback")
+
+
+def test_playwright_container_records_har():
+    context = MagicMock()
+    PlaywrightContainer(har_path="app.har", har_mode="record")._install_routes(context)
+    context.route_from_har.assert_called_once_with("app.har", update=True)
+
+
+def test_playwright_plugin_create_container_routing_options(tmp_path):
+    plugin = PlaywrightPlugin()
+    container = plugin.create_container(
+        har_path="app.har",
+        asset_cache_dir=str(tmp_path),
+        asset_cache_revalidate=False,
+        block_hosts=["*.ads.example"],
+    )
+
+    assert container.har_path == "app.har"
+    assert container.asset_cache.revalidate is False
+    assert container.block_hosts == ["*.ads.example"]
+    assert container.launch_kwargs == {}
+
+
+def test_playwright_plugin_rejects_unknown_har_mode():
+    with pytest.raises(ValueError, match="har_mode"):
+        PlaywrightPlugin().create_container(har_path="app.har", har_mode="stream")
+
+
+@pytest.fixture
+def async_session():
+    AsyncBrowserSession._atexit_registered = True
+    yield AsyncBrowserSession
+    AsyncBrowserSession.shutdown()
+    AsyncBrowserSession._playwright = None
+    AsyncBrowserSession._browsers = {}
+
+
+def _async_browser():
+    browser = MagicMock()
+    browser.is_connected.return_value = True
+    browser.close = AsyncMock()
+
+    async def new_context(**kwargs):
+        context = MagicMock()
+        context.kwargs = kwargs
+        context.new_page = AsyncMock(side_effect=lambda: MagicMock(context=context))
+        context.close = AsyncMock()
+        return context
+
+    browser.new_context.side_effect = new_context
+    return browser
+
+
+def test_playwright_plugin_async_mode_returns_async_client(async_session):
+    browser = _async_browser()
+    driver = MagicMock()
+    driver.chromium.launch = AsyncMock(return_value=browser)
+    driver.stop = AsyncMock()
+
+    with patch("gherkin_testcontainers_playwright.plugin.async_playwright") as mock_async_pw:
+        mock_async_pw.return_value.start = AsyncMock(return_value=driver)
+        plugin = PlaywrightPlugin()
+        container = plugin.create_container(mode="async").start()
+        client = plugin.get_client(container)
+        PlaywrightPlugin().create_container(mode="async").start()
+
+    assert isinstance(client, AsyncPlaywrightClient)
+    assert client.browser is browser
+    driver.chromium.launch.assert_awaited_once_with(headless=True)
+
+
+def test_async_client_run_users_drives_pages_concurrently(async_session):
+    import asyncio
+
+    client = AsyncPlaywrightClient(_async_browser(), {"locale": "fr-FR"})
+    started = []
+
+    async def user(page, index):
+        started.append(index)
+        await asyncio.sleep(0.05)
+        assert len(started) == 3  # every user started before any finished
+        if index == 1:
+            raise RuntimeError("boom")
+        return page.context.kwargs
+
+    results = client.run_users(3, user, timeout=5)
+
+    assert [r.user for r in results] == [0, 1, 2]
+    assert results[0].result == {"locale": "fr-FR"}
+    assert isinstance(results[1].error, RuntimeError)
+    assert all(r.elapsed >= 0.05 for r in results)
+
+    contexts = list(client._contexts)
+    client.close()
+    assert len(contexts) == 3
+    assert all(context.close.await_count == 1 for context in contexts)
+
+
+def test_playwright_async_load_runs_on_the_session_loop_reusing_pages(async_session):
+    import threading
+
+    from gherkin_testcontainers.loadgen import run_load
+
+    client = AsyncPlaywrightClient(_async_browser())
+    pages, threads = [], set()
+
+    async def new_page():
+        page = MagicMock()
+        page.goto = AsyncMock(side_effect=lambda *args, **kwargs: threads.add(threading.current_thread()))
+        pages.append(page)
+        return page
+
+    client.new_page = new_page
+    operation = PlaywrightPlugin().load_operation(client, "http://app/health", timeout=1000)
+    result = run_load(operation, count=20, concurrency=4)
+
+    assert result.operations == 20 and result.errors == 0
+    assert 1 <= len(pages) <= 4
+    assert sum(page.goto.await_count for page in pages) == 20
+    pages[0].goto.assert_awaited_with("http://app/health", timeout=1000)
+    assert threads == {AsyncBrowserSession._thread}
+
+
+def test_playwright_container_stop_closes_async_client():
+    container = PlaywrightContainer(mode="async")
+    async_client = MagicMock()
+    container._async_client = async_client
+
+    container.stop()
+
+    async_client.close.assert_called_once()
+    assert container._async_client is None
+
+
+def test_playwright_plugin_rejects_unknown_mode():
+    with pytest.raises(ValueError, match="mode"):
+        PlaywrightPlugin().create_container(mode="threaded")
+
+
+def test_playwright_plugin_rejects_sync_only_options_in_async_mode(tmp_path):
+    plugin = PlaywrightPlugin()
+    with pytest.raises(ValueError, match="asset_cache_dir"):
+        plugin.create_container(mode="async", asset_cache_dir=str(tmp_path))
+    with pytest.raises(ValueError, match="login"):
+        plugin.create_container(mode="async", login=_fake_login)
@@ -57,3 +57,123 @@ def test_on_start_and_on_stop_are_optional_noops():
     container = MagicMock()
     plugin.on_start(container)  # should not raise
     plugin.on_stop(container)   # should not raise
+
+
+def test_get_images_defaults_to_image_kwarg():
+    """The default get_images reports the ``image`` kwarg, if any."""
+    from unittest.mock import MagicMock
+
+    class FakePlugin(ContainerPlugin):
+        @property
+        def name(self) -> str:
+            return "fake"
+
+        def create_container(self, **kwargs):
+            return MagicMock()
+
+        def get_client(self, container):
+            return MagicMock()
+
+    plugin = FakePlugin()
+    assert plugin.get_images(image="fake:1") == ["fake:1"]
+    assert plugin.get_images() == []
+
+
+def test_estimate_startup_defaults_to_class_estimate():
+    """estimate_startup returns startup_estimate unless overridden."""
+    from unittest.mock import MagicMock
+
+    class FakePlugin(ContainerPlugin):
+        startup_estimate = 12.5
+
+        @property
+        def name(self) -> str:
+            return "fake"
+
+        def create_container(self, **kwargs):
+            return MagicMock()
+
+        def get_client(self, container):
+            return MagicMock()
+
+    assert FakePlugin().estimate_startup(image="fake:1") == 12.5
+
+
+def test_close_client_calls_close_and_awaits_async_close():
+    """Default close_client calls close(), awaiting it for async clients."""
+    from unittest.mock import AsyncMock, MagicMock
+
+    class FakePlugin(ContainerPlugin):
+        @property
+        def name(self) -> str:
+            return "fake"
+
+        def create_container(self, **kwargs):
+            return MagicMock()
+
+        def get_client(self, container):
+            return MagicMock()
+
+    plugin = FakePlugin()
+    client = MagicMock()
+    plugin.close_client(client)
+    client.close.assert_called_once_with()
+
+    async_client = MagicMock(close=AsyncMock())
+    plugin.close_client(async_client)
+    async_client.close.assert_awaited_once()
+
+    plugin.close_client(object())  # no close(): nothing to do
+
+
+def test_close_client_refuses_async_close_inside_a_running_loop():
+    """The default can't run an async close inside a running loop, so it says so."""
+    import asyncio
+    from unittest.mock import AsyncMock, MagicMock
+
+    import pytest
+
+    class FakePlugin(ContainerPlugin):
+        @property
+        def name(self) -> str:
+            return "fake"
+
+        def create_container(self, **kwargs):
+            return MagicMock()
+
+        def get_client(self, container):
+            return MagicMock()
+
+    async def close_in_loop():
+        FakePlugin().close_client(MagicMock(close=AsyncMock()))
+
+    with pytest.raises(RuntimeError, match="override close_client"):
+        asyncio.run(close_in_loop())
+
+
+def test_can_reset_and_can_lease_follow_the_overridden_hooks():
+    """Plugins are only reusable with a reset hook, and leasable with external_url too."""
+    from unittest.mock import MagicMock
+
+    class FakePlugin(ContainerPlugin):
+        @property
+        def name(self) -> str:
+            return "fake"
+
+        def create_container(self, **kwargs):
+            return MagicMock()
+
+        def get_client(self, container):
+            return MagicMock()
+
+    class ResettablePlugin(FakePlugin):
+        def reset(self, container):
+            pass
+
+    class LeasablePlugin(ResettablePlugin):
+        def external_url(self, container):
+            return "fake://host:1"
+
+    assert not FakePlugin().can_reset and not FakePlugin().can_lease
+    assert ResettablePlugin().can_reset and not ResettablePlugin().can_lease
+    assert LeasablePlugin().can_lease
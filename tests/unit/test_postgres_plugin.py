@@ -32,3 +32,32 @@ def test_postgres_plugin_create_container_returns_postgres_container():
             password="test",
             dbname="testdb",
         )
+
+
+def test_postgres_plugin_get_images_defaults_to_container_image():
+    plugin = PostgresPlugin()
+    assert plugin.get_images() == ["postgres:latest"]
+    assert plugin.get_images(image="postgres:16") == ["postgres:16"]
+
+
+def test_postgres_bulk_load_uses_copy():
+    from unittest.mock import MagicMock
+
+    client = MagicMock()
+    cursor = client.cursor.return_value.__enter__.return_value
+    copy = cursor.copy.return_value.__enter__.return_value
+    PostgresPlugin().bulk_load(client, "public.users", ["id", "name"], iter([(1, "a"), (2, None)]))
+    statement = cursor.copy.call_args.args[0]
+    assert statement.as_string(None) == 'COPY "public"."users" ("id", "name") FROM STDIN'
+    assert [c.args[0] for c in copy.write_row.call_args_list] == [(1, "a"), (2, None)]
+    client.commit.assert_called_once()
+
+
+def test_postgres_load_operation_fetches_rows_and_commits():
+    from unittest.mock import MagicMock
+
+    conn = MagicMock()
+    PostgresPlugin().load_operation(conn, "SELECT 1")(0)
+    conn.execute.assert_called_once_with("SELECT 1")
+    conn.execute.return_value.fetchall.assert_called_once()
+    conn.commit.assert_called_once()
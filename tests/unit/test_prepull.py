@@ -0,0 +1,75 @@
+from unittest.mock import MagicMock, patch
+from docker.errors import ImageNotFound
+from gherkin_testcontainers.cli import main
+from gherkin_testcontainers.prepull import prepull_images, pull_image
+
+
+def _client(present=()):
+    client = MagicMock()
+
+    def get(image):
+        if image not in present:
+            raise ImageNotFound(image)
+        return MagicMock()
+
+    client.images.get.side_effect = get
+    client.api.pull.return_value = [
+        {"status": "Pulling from library/fake", "id": "1"},
+        {"status": "Downloading", "id": "a"},
+        {"status": "Pull complete", "id": "a"},
+    ]
+    return client
+
+
+def test_pull_image_skips_present_images():
+    client = _client(present={"fake:1"})
+    assert pull_image(client, "fake:1", progress=MagicMock()) == "present"
+    client.api.pull.assert_not_called()
+
+
+def test_pull_image_pulls_missing_image_with_tag():
+    client = _client()
+    progress = MagicMock()
+    assert pull_image(client, "registry:5000/fake:1", progress) == "pulled"
+    client.api.pull.assert_called_once_with("registry:5000/fake", tag="1", stream=True, decode=True)
+    progress.assert_any_call("registry:5000/fake:1", "1/1 layers")
+
+
+def test_pull_image_raises_on_stream_error():
+    import pytest
+
+    client = _client()
+    client.api.pull.return_value = [{"error": "denied"}]
+    with pytest.raises(RuntimeError, match="denied"):
+        pull_image(client, "fake", progress=MagicMock())
+
+
+def test_prepull_images_reports_each_outcome():
+    client = _client(present={"fake:1"})
+    client.api.pull.side_effect = lambda repo, **kw: (
+        [{"error": "denied"}] if repo == "broken" else []
+    )
+    outcomes = prepull_images(["fake:1", "fake:2", "broken:1", "fake:1"], client=client, progress=MagicMock())
+    assert outcomes == {"fake:1": "present", "fake:2": "pulled", "broken:1": "failed: denied"}
+
+
+def test_prepull_images_with_nothing_to_pull_needs_no_docker():
+    with patch("docker.from_env") as mock_from_env:
+        assert prepull_images([]) == {}
+    mock_from_env.assert_not_called()
+
+
+def test_cli_prepull_dry_run_lists_images(capsys):
+    with patch("gherkin_testcontainers.cli.load_features", return_value=([], None, None)), \
+            patch("gherkin_testcontainers.cli.resolve_images", return_value={"fake:1": ["fake"]}), \
+            patch("gherkin_testcontainers.cli.prepull_images") as mock_prepull:
+        assert main(["prepull", "--dry-run", "features"]) == 0
+    mock_prepull.assert_not_called()
+    assert "fake:1  (fake)" in capsys.readouterr().out
+
+
+def test_cli_prepull_fails_when_a_pull_fails():
+    with patch("gherkin_testcontainers.cli.load_features", return_value=([], None, None)), \
+            patch("gherkin_testcontainers.cli.resolve_images", return_value={"fake:1": ["fake"]}), \
+            patch("gherkin_testcontainers.cli.prepull_images", return_value={"fake:1": "failed: x"}):
+        assert main(["prepull", "-j", "2"]) == 1
@@ -6,9 +6,19 @@ def test_public_api_imports():
         PluginRegistry,
         use_container,
         setup_hooks,
+        LazyClient,
+        resolve,
+        HostBudget,
+        ResourceSpec,
+        ExternalService,
     )
     assert ContainerPlugin is not None
     assert ContainerManager is not None
     assert PluginRegistry is not None
     assert use_container is not None
     assert setup_hooks is not None
+    assert LazyClient is not None
+    assert resolve is not None
+    assert HostBudget is not None
+    assert ResourceSpec is not None
+    assert ExternalService is not None
@@ -1,11 +1,16 @@
 # tests/unit/test_pulsar_plugin.py
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from gherkin_testcontainers.plugin import ContainerPlugin
 from gherkin_testcontainers_pulsar.plugin import (
     DEFAULT_PULSAR_IMAGE,
+    FAST_PROFILE_COMMAND,
+    FAST_PROFILE_ENV,
     PULSAR_BINARY_PORT,
     PULSAR_HTTP_PORT,
+    PulsarClient,
     PulsarContainer,
     PulsarPlugin,
 )
@@ -44,6 +49,45 @@ def test_pulsar_container_default_image():
                 assert DEFAULT_PULSAR_IMAGE == "apachepulsar/pulsar:3.0.0"
 
 
+def _build_container(**kwargs):
+    with patch("gherkin_testcontainers_pulsar.plugin.DockerContainer.__init__", return_value=None), \
+            patch.object(PulsarContainer, "with_command") as with_command, \
+            patch.object(PulsarContainer, "with_env") as with_env, \
+            patch.object(PulsarContainer, "with_exposed_ports"):
+        container = PulsarContainer(**kwargs)
+    return container, with_command, with_env
+
+
+def test_pulsar_container_default_profile_runs_plain_standalone():
+    container, with_command, with_env = _build_container()
+    assert container.profile == "default"
+    with_command.assert_called_once_with("bin/pulsar standalone")
+    with_env.assert_not_called()
+
+
+def test_pulsar_container_fast_profile_trims_standalone():
+    container, with_command, with_env = _build_container(profile="fast")
+    assert container.profile == "fast"
+    with_command.assert_called_once_with(FAST_PROFILE_COMMAND)
+    assert "-nfw -nss" in FAST_PROFILE_COMMAND
+    applied = {call.args[0]: call.args[1] for call in with_env.call_args_list}
+    assert applied == FAST_PROFILE_ENV
+    assert "-Xmx256m" in applied["PULSAR_MEM"]
+
+
+def test_pulsar_container_unknown_profile_raises():
+    with pytest.raises(ValueError, match="turbo"):
+        PulsarContainer(profile="turbo")
+
+
+def test_pulsar_plugin_create_container_passes_profile():
+    plugin = PulsarPlugin()
+
+    with patch("gherkin_testcontainers_pulsar.plugin.PulsarContainer") as MockContainer:
+        plugin.create_container(profile="fast")
+        MockContainer.assert_called_once_with(profile="fast")
+
+
 def test_pulsar_container_get_broker_url():
     container = MagicMock(spec=PulsarContainer)
     container.get_container_host_ip.return_value = "localhost"
@@ -68,9 +112,10 @@ def test_pulsar_container_get_admin_url():
     assert url == "http://localhost:18080"
 
 
-def test_pulsar_plugin_get_client_returns_pulsar_client():
+def test_pulsar_plugin_get_client_returns_wrapped_pulsar_client():
     plugin = PulsarPlugin()
     mock_container = MagicMock()
+    mock_container._clients = []
     mock_container.get_broker_url.return_value = "pulsar://localhost:6650"
 
     with patch("pulsar.Client") as MockClient:
@@ -80,4 +125,183 @@ def test_pulsar_plugin_get_client_returns_pulsar_client():
         client = plugin.get_client(mock_container)
 
         MockClient.assert_called_once_with("pulsar://localhost:6650")
-        assert client is mock_client
+        assert isinstance(client, PulsarClient)
+        assert client.client is mock_client
+        assert mock_container._clients == [client]
+
+
+def test_pulsar_plugin_on_stop_closes_clients():
+    plugin = PulsarPlugin()
+    mock_container = MagicMock()
+    client = MagicMock()
+    mock_container._clients = [client]
+
+    plugin.on_stop(mock_container)
+
+    client.close.assert_called_once()
+    assert mock_container._clients == []
+
+
+def test_pulsar_client_caches_producers_per_topic():
+    raw = MagicMock()
+    client = PulsarClient(raw)
+
+    first = client.producer("orders")
+    second = client.producer("orders")
+
+    assert first is second
+    raw.create_producer.assert_called_once_with(
+        "orders",
+        batching_enabled=True,
+        batching_max_publish_delay_ms=5,
+        block_if_queue_full=True,
+    )
+
+
+def test_pulsar_client_caches_consumers_per_topic_and_subscription():
+    import pulsar
+
+    raw = MagicMock()
+    raw.subscribe.side_effect = lambda *args, **kwargs: MagicMock()
+    client = PulsarClient(raw)
+
+    first = client.consumer("orders", "sub-a")
+    assert client.consumer("orders", "sub-a") is first
+    assert client.consumer("orders", "sub-b") is not first
+    raw.subscribe.assert_any_call(
+        "orders", "sub-a", initial_position=pulsar.InitialPosition.Earliest
+    )
+    assert raw.subscribe.call_count == 2
+
+
+def test_pulsar_client_send_is_async_and_flush_raises_on_failure():
+    import pulsar
+
+    raw = MagicMock()
+    producer = raw.create_producer.return_value
+    producer.send_async.side_effect = lambda content, callback, **kw: callback(
+        pulsar.Result.Timeout, None
+    )
+    client = PulsarClient(raw)
+
+    client.send("orders", b"hello")
+
+    producer.send_async.assert_called_once()
+    producer.send.assert_not_called()
+    try:
+        client.flush()
+    except RuntimeError as exc:
+        assert "1 Pulsar send(s) failed" in str(exc)
+    else:
+        raise AssertionError("flush() should raise when a send failed")
+    producer.flush.assert_called_once()
+
+
+def test_pulsar_client_close_closes_everything_once():
+    raw = MagicMock()
+    client = PulsarClient(raw)
+    producer = client.producer("orders")
+    consumer = client.consumer("orders", "sub")
+
+    client.close()
+    client.close()
+
+    producer.close.assert_called_once()
+    consumer.close.assert_called_once()
+    raw.close.assert_called_once()
+
+
+def test_pulsar_client_forwards_unknown_attributes():
+    raw = MagicMock()
+    client = PulsarClient(raw)
+
+    client.create_reader("orders", "earliest")
+
+    raw.create_reader.assert_called_once_with("orders", "earliest")
+
+
+def test_pulsar_plugin_estimates_faster_startup_for_fast_profile():
+    plugin = PulsarPlugin()
+    assert plugin.estimate_startup(profile="fast") < plugin.estimate_startup()
+
+
+def test_pulsar_plugin_declares_smaller_resources_for_fast_profile():
+    plugin = PulsarPlugin()
+    assert plugin.get_resources(profile="fast").memory_mb < plugin.get_resources().memory_mb
+
+
+def test_pulsar_bulk_publish_sends_async_then_flushes():
+    client = MagicMock()
+    PulsarPlugin().bulk_publish(client, "events", iter([b"a", b"b"]))
+    assert client.send.call_count == 2
+    client.flush.assert_called_once_with()
+
+
+def test_pulsar_plugin_binds_to_external_broker():
+    plugin = PulsarPlugin()
+    service = plugin.create_external("pulsar://broker:6650")
+    with patch("pulsar.Client") as MockClient:
+        client = plugin.get_client(service)
+    MockClient.assert_called_once_with("pulsar://broker:6650")
+    plugin.on_stop(service)
+    client.client.close.assert_called_once()
+
+
+def test_pulsar_load_operation_sends_synchronously_without_batching():
+    client = MagicMock()
+    operation = PulsarPlugin().load_operation(client, "events", message_size=3)
+    operation(1)
+    client.producer.assert_not_called()
+    client.client.create_producer.assert_called_once_with(
+        "events", batching_enabled=False, block_if_queue_full=True
+    )
+    client.client.create_producer.return_value.send.assert_called_once_with(b"1..")
+
+
+def test_pulsar_standin_sends_and_receives_in_memory():
+    import pulsar
+
+    plugin = PulsarPlugin()
+    service = plugin.create_external("memory://")
+    client = plugin.get_client(service)
+    client.send("t", b"a", properties={"k": "v"})
+    client.send("t", b"b")
+    client.flush()
+    consumer = client.consumer("t", "sub")
+    message = consumer.receive(timeout_millis=100)
+    assert (message.data(), message.properties()) == (b"a", {"k": "v"})
+    consumer.negative_acknowledge(message)
+    redelivered = consumer.receive(timeout_millis=100)
+    assert (redelivered.data(), redelivered.redelivery_count()) == (b"a", 1)
+    assert consumer.receive(timeout_millis=100).data() == b"b"
+    with pytest.raises(pulsar.Timeout):
+        consumer.receive(timeout_millis=10)
+    plugin.on_stop(service)
+    assert service._clients == []
+
+
+def test_pulsar_reset_force_deletes_user_topics_through_the_admin_api():
+    plugin = PulsarPlugin()
+    container = MagicMock()
+    container.get_admin_url.return_value = "http://h:8080"
+    admin = "http://h:8080/admin/v2"
+    listings = {
+        f"{admin}/tenants": ["public", "pulsar"],
+        f"{admin}/namespaces/public": ["public/default", "public/functions"],
+        f"{admin}/persistent/public/default/partitioned": ["persistent://public/default/p"],
+        f"{admin}/persistent/public/default": ["persistent://public/default/t", "persistent://public/default/__change_events"],
+    }
+    calls = []
+
+    def fake_admin(url, method="GET"):
+        calls.append((method, url))
+        return listings.get(url, [])
+
+    with patch("gherkin_testcontainers_pulsar.plugin._admin", side_effect=fake_admin):
+        plugin.reset(container)
+    assert [url for method, url in calls if method == "DELETE"] == [
+        f"{admin}/persistent/public/default/p/partitions?force=true",
+        f"{admin}/persistent/public/default/t?force=true",
+    ]
+    assert f"{admin}/namespaces/pulsar" not in [url for _, url in calls]
+    assert not any("public/functions" in url for _, url in calls)
@@ -0,0 +1,47 @@
+import json
+from unittest.mock import MagicMock
+from gherkin_testcontainers.report import RunReport, scenario_lifecycle
+
+
+def test_scenario_lifecycle_keeps_only_new_activity():
+    before = {
+        "docker_api_calls": 10,
+        "start_seconds": {"kafka": 12.0},
+        "queue_wait_seconds": {"kafka": 0.0},
+        "unpause_seconds": {"kafka": [0.1]},
+    }
+    after = {
+        "docker_api_calls": 14,
+        "start_seconds": {"kafka": 12.0, "postgres": 3.0},
+        "queue_wait_seconds": {"kafka": 0.0, "postgres": 1.5},
+        "unpause_seconds": {"kafka": [0.1, 0.2]},
+        "stop_seconds": {"postgres": 0.4},
+    }
+    assert scenario_lifecycle(before, after) == {
+        "docker_api_calls": 4,
+        "start_seconds": {"postgres": 3.0},
+        "queue_wait_seconds": {"postgres": 1.5},
+        "stop_seconds": {"postgres": 0.4},
+        "unpause_seconds": {"kafka": [0.2]},
+    }
+
+
+def test_run_report_writes_scenarios_as_json(tmp_path):
+    path = tmp_path / "reports" / "run.json"
+    report = RunReport(str(path))
+    scenario = MagicMock(filename="features/a.feature", line=3)
+    scenario.name = "one"
+    scenario.feature.name = "A"
+    scenario.status.name = "passed"
+    report.add_scenario(scenario, 1.5, lifecycle={"docker_api_calls": 2})
+    report.write()
+    data = json.loads(path.read_text())
+    assert data["scenarios"] == [{
+        "feature": "A",
+        "name": "one",
+        "location": "features/a.feature:3",
+        "status": "passed",
+        "duration_seconds": 1.5,
+        "lifecycle": {"docker_api_calls": 2},
+    }]
+    assert data["finished_at"] >= data["started_at"]
@@ -0,0 +1,91 @@
+import time
+from unittest.mock import MagicMock, patch
+from gherkin_testcontainers.sampling import (
+    ContainerSampler,
+    UsageSample,
+    parse_stats,
+    summarize,
+)
+
+
+def _stats(total_usage, system_usage, memory=100, cache=20, read=0, write=0, rx=0, tx=0):
+    return {
+        "cpu_stats": {
+            "cpu_usage": {"total_usage": total_usage},
+            "system_cpu_usage": system_usage,
+            "online_cpus": 2,
+        },
+        "precpu_stats": {"cpu_usage": {"total_usage": 0}, "system_cpu_usage": 0},
+        "memory_stats": {"usage": memory, "stats": {"inactive_file": cache}},
+        "blkio_stats": {"io_service_bytes_recursive": [
+            {"op": "read", "value": read}, {"op": "write", "value": write},
+        ]},
+        "networks": {"eth0": {"rx_bytes": rx, "tx_bytes": tx}},
+    }
+
+
+def test_parse_stats_computes_cpu_like_docker_stats():
+    sample = parse_stats(_stats(50, 200, read=7, write=9, rx=3, tx=4), timestamp=1.0)
+    assert sample.cpu_percent == 50.0
+    assert sample.memory_bytes == 80
+    assert (sample.block_read_bytes, sample.block_write_bytes) == (7, 9)
+    assert (sample.net_rx_bytes, sample.net_tx_bytes) == (3, 4)
+
+
+def test_parse_stats_skips_documents_without_cpu_data():
+    assert parse_stats({"cpu_stats": {}}, timestamp=1.0) is None
+
+
+def test_summarize_reports_peak_mean_and_io_deltas():
+    samples = [
+        UsageSample(1.0, 10.0, 100, 0, 0, 10, 5),
+        UsageSample(2.0, 30.0, 300, 50, 20, 40, 15),
+    ]
+    summary = summarize(samples)
+    assert summary["cpu_percent"] == {"peak": 30.0, "mean": 20.0}
+    assert summary["memory_bytes"] == {"peak": 300, "mean": 200.0}
+    assert summary["block_read_bytes"] == 50
+    assert summary["net_rx_bytes"] == 30
+    assert summarize([]) is None
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_sampler_keeps_a_bounded_buffer():
+    container = MagicMock()
+    container.stats.return_value = iter([_stats(i, 100 * i) for i in range(1, 11)])
+    sampler = ContainerSampler(container, interval=0, max_samples=3).start()
+    _wait_for(lambda: not sampler._thread.is_alive())
+    assert len(sampler.samples) == 3
+    assert sampler.summary()["samples"] == 3
+    container.stats.assert_called_once_with(stream=True, decode=True)
+
+
+def test_sampler_drops_readings_closer_than_interval():
+    container = MagicMock()
+    container.stats.return_value = iter([_stats(i, 100 * i) for i in range(1, 6)])
+    sampler = ContainerSampler(container, interval=3600).start()
+    _wait_for(lambda: not sampler._thread.is_alive())
+    assert len(sampler.samples) == 1
+
+
+def test_sampler_summary_since_filters_old_samples():
+    sampler = ContainerSampler(MagicMock())
+    sampler.samples.extend([
+        UsageSample(1.0, 10.0, 100, 0, 0, 0, 0),
+        UsageSample(5.0, 20.0, 200, 0, 0, 0, 0),
+    ])
+    assert sampler.summary(since=2.0)["samples"] == 1
+    assert sampler.summary(since=10.0) is None
+
+
+def test_sampler_survives_stream_errors():
+    container = MagicMock()
+    container.stats.side_effect = RuntimeError("container gone")
+    sampler = ContainerSampler(container).start()
+    _wait_for(lambda: not sampler._thread.is_alive())
+    assert sampler.summary() is None
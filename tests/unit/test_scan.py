@@ -0,0 +1,109 @@
+import pytest
+from unittest.mock import MagicMock
+from gherkin_testcontainers.plugin import ContainerPlugin
+from gherkin_testcontainers.registry import PluginRegistry
+from gherkin_testcontainers.scan import (
+    ContainerRequest,
+    ScenarioScan,
+    resolve_images,
+    scan_features,
+)
+
+
+class FakePlugin(ContainerPlugin):
+    @property
+    def name(self) -> str:
+        return "fake"
+
+    def create_container(self, **kwargs):
+        return MagicMock()
+
+    def get_client(self, container):
+        return MagicMock()
+
+    def get_images(self, **kwargs):
+        return [kwargs.get("image", "fake:latest"), "sidecar:1"]
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    PluginRegistry._plugins.clear()
+    PluginRegistry.register("fake", FakePlugin)
+    yield
+    PluginRegistry._plugins.clear()
+
+
+def _scenario(steps, line=3, runs=True):
+    scenario = MagicMock()
+    scenario.filename = "features/a.feature"
+    scenario.line = line
+    scenario.all_steps = steps
+    scenario.should_run_with_tags.return_value = runs
+    return scenario
+
+
+def _feature(*scenarios):
+    feature = MagicMock()
+    feature.walk_scenarios.return_value = list(scenarios)
+    return feature
+
+
+def _registry(funcs):
+    registry = MagicMock()
+
+    def find_match(step):
+        func = funcs.get(step)
+        return None if func is None else MagicMock(func=func)
+
+    registry.find_match.side_effect = find_match
+    return registry
+
+
+def test_resolve_images_skips_requests_bound_to_external_services():
+    scans = [ScenarioScan(MagicMock(), [ContainerRequest("fake", {"endpoint": "fake://svc:1"})])]
+    assert resolve_images(scans) == {}
+
+
+def test_request_signature_is_independent_of_kwarg_order():
+    a = ContainerRequest("fake", {"image": "x", "port": 1})
+    b = ContainerRequest("fake", {"port": 1, "image": "x"})
+    assert a.signature == b.signature == "fake(image='x', port=1)"
+
+
+def test_scenario_scan_location_and_signature():
+    scan = ScenarioScan(_scenario([], line=7), [
+        ContainerRequest("fake", {}), ContainerRequest("fake", {}),
+    ])
+    assert scan.location == "features/a.feature:7"
+    assert scan.signature == ("fake()",)
+
+
+def test_scan_features_collects_requests_from_matched_steps():
+    def step_fn():
+        pass
+
+    step_fn.container_requests = [("fake", {"image": "fake:2"})]
+    scenario = _scenario(["given", "unmatched"])
+    scans = scan_features([_feature(scenario)], step_registry=_registry({"given": step_fn}))
+    assert len(scans) == 1
+    assert scans[0].scenario is scenario
+    assert scans[0].requests == [ContainerRequest("fake", {"image": "fake:2"})]
+
+
+def test_scan_features_skips_scenarios_excluded_by_tags():
+    included = _scenario([], runs=True)
+    excluded = _scenario([], runs=False)
+    scans = scan_features([_feature(included, excluded)], "expr", _registry({}))
+    assert [scan.scenario for scan in scans] == [included]
+
+
+def test_resolve_images_deduplicates_and_skips_unknown_plugins():
+    scans = [
+        ScenarioScan(MagicMock(), [ContainerRequest("fake", {}), ContainerRequest("missing", {})]),
+        ScenarioScan(MagicMock(), [ContainerRequest("fake", {"image": "fake:2"})]),
+    ]
+    assert resolve_images(scans) == {
+        "fake:latest": ["fake"],
+        "sidecar:1": ["fake"],
+        "fake:2": ["fake"],
+    }
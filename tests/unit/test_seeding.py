@@ -0,0 +1,138 @@
+import pytest
+from unittest.mock import MagicMock
+from gherkin_testcontainers.manager import ContainerManager
+from gherkin_testcontainers.plugin import ContainerPlugin
+from gherkin_testcontainers.registry import PluginRegistry
+from gherkin_testcontainers.seeding import (
+    CountingIterator,
+    RowSource,
+    SeedResult,
+    csv_source,
+    json_message,
+    open_source,
+    parquet_source,
+    publish,
+    seed,
+    table_source,
+)
+
+
+class FakePlugin(ContainerPlugin):
+    loaded = []
+
+    @property
+    def name(self) -> str:
+        return "fake"
+
+    def create_container(self, **kwargs):
+        return MagicMock()
+
+    def get_client(self, container):
+        return MagicMock(name="fake_client")
+
+    def bulk_load(self, client, table, columns, rows):
+        FakePlugin.loaded.append((table, columns, list(rows)))
+
+    def bulk_publish(self, client, topic, messages):
+        FakePlugin.loaded.append((topic, list(messages)))
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    PluginRegistry._plugins.clear()
+    PluginRegistry.register("fake", FakePlugin)
+    FakePlugin.loaded = []
+    yield
+    PluginRegistry._plugins.clear()
+
+
+def _behave_table(headings, rows):
+    table = MagicMock(headings=headings)
+    table.rows = [MagicMock(cells=row) for row in rows]
+    return table
+
+
+def test_table_source_maps_empty_cells_to_none():
+    source = table_source(_behave_table(["id", "name"], [["1", "Alice"], ["2", ""]]))
+    assert source.columns == ["id", "name"]
+    assert list(source.rows) == [("1", "Alice"), ("2", None)]
+
+
+def test_csv_source_streams_rows(tmp_path):
+    path = tmp_path / "users.csv"
+    path.write_text('id,name\n1,Alice\n2,"Bob, Jr."\n3,\n')
+    source = csv_source(str(path))
+    assert source.columns == ["id", "name"]
+    rows = iter(source.rows)
+    assert next(rows) == ("1", "Alice")
+    assert list(rows) == [("2", "Bob, Jr."), ("3", None)]
+
+
+def test_csv_source_of_empty_file(tmp_path):
+    path = tmp_path / "empty.csv"
+    path.write_text("")
+    source = csv_source(str(path))
+    assert source.columns == [] and list(source.rows) == []
+
+
+def test_parquet_source_reads_batches(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    path = tmp_path / "users.parquet"
+    pq.write_table(pa.table({"id": [1, 2, 3], "name": ["a", None, "c"]}), path)
+    source = parquet_source(str(path), batch_size=2)
+    assert source.columns == ["id", "name"]
+    assert list(source.rows) == [(1, "a"), (2, None), (3, "c")]
+
+
+def test_open_source_dispatches_on_type(tmp_path):
+    row_source = RowSource(["a"], [(1,)])
+    assert open_source(row_source) is row_source
+    assert open_source(_behave_table(["a"], [["1"]])).columns == ["a"]
+    path = tmp_path / "a.csv"
+    path.write_text("a\n1\n")
+    assert open_source(path).columns == ["a"]
+    with pytest.raises(ValueError):
+        open_source("data.json")
+
+
+def test_counting_iterator_counts_consumed_rows():
+    rows = CountingIterator([(1,), (2,)])
+    assert list(rows) == [(1,), (2,)]
+    assert rows.count == 2
+
+
+def test_seed_streams_source_to_plugin_and_times_it():
+    manager = ContainerManager()
+    result = seed(manager, "fake", "users", RowSource(["id"], iter([(1,), (2,)])))
+    assert FakePlugin.loaded == [("users", ["id"], [(1,), (2,)])]
+    assert result.table == "users" and result.rows == 2
+    assert result.rows_per_second > 0
+    assert "fake" in manager._containers
+
+
+def test_plugins_without_bulk_load_raise():
+    class PlainPlugin(FakePlugin):
+        bulk_load = ContainerPlugin.bulk_load
+
+    PluginRegistry.register("fake", PlainPlugin)
+    with pytest.raises(NotImplementedError):
+        seed(ContainerManager(), "fake", "users", RowSource(["id"], []))
+
+
+def test_seed_result_rows_per_second():
+    assert SeedResult("t", 100, 2.0).rows_per_second == 50.0
+
+
+def test_publish_encodes_each_row_as_a_message():
+    result = publish(ContainerManager(), "fake", "events", RowSource(["id", "ok"], [(1, True)]))
+    assert FakePlugin.loaded == [("events", [b'{"id": 1, "ok": true}'])]
+    assert result.table == "events" and result.rows == 1
+
+
+def test_json_message_stringifies_unknown_types():
+    import datetime
+
+    message = json_message(["at"], (datetime.date(2024, 1, 2),))
+    assert message == b'{"at": "2024-01-02"}'
@@ -1,4 +1,5 @@
 # tests/unit/test_sqlite_plugin.py
+import os
 import sqlite3
 from gherkin_testcontainers_sqlite.plugin import SqlitePlugin
 from gherkin_testcontainers.plugin import ContainerPlugin
@@ -25,3 +26,53 @@ def test_sqlite_plugin_returns_sqlite_connection():
     row = client.execute("SELECT id FROM test").fetchone()
     assert row[0] == 1
     client.close()
+
+
+def test_sqlite_plugin_needs_no_images():
+    assert SqlitePlugin().get_images() == []
+
+
+def test_sqlite_bulk_load_inserts_rows_in_one_transaction():
+    conn = sqlite3.connect(":memory:")
+    conn.execute('CREATE TABLE "user data" (id INTEGER, name TEXT)')
+    rows = iter([(1, "Alice"), (2, None)])
+    SqlitePlugin().bulk_load(conn, "user data", ["id", "name"], rows)
+    assert conn.execute('SELECT * FROM "user data" ORDER BY id').fetchall() == [
+        (1, "Alice"), (2, None),
+    ]
+    assert not conn.in_transaction
+
+
+def test_sqlite_plugin_binds_to_existing_database_file(tmp_path):
+    path = str(tmp_path / "existing.db")
+    plugin = SqlitePlugin()
+    service = plugin.create_external(path)
+    conn = plugin.get_client(service)
+    conn.execute("CREATE TABLE t (x)")
+    conn.close()
+    service.stop()
+    assert os.path.exists(path)
+
+
+def test_sqlite_load_operation_runs_the_statement():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE t (x)")
+    operation = SqlitePlugin().load_operation(conn, "INSERT INTO t VALUES (1)")
+    operation(0)
+    operation(1)
+    assert conn.execute("SELECT count(*) FROM t").fetchone() == (2,)
+    assert SqlitePlugin.max_load_concurrency == 1
+
+
+def test_sqlite_reset_empties_the_database():
+    plugin = SqlitePlugin()
+    container = plugin.create_container().start()
+    conn = plugin.get_client(container)
+    conn.execute("CREATE TABLE t (x)")
+    conn.commit()
+    conn.close()
+    plugin.reset(container)
+    conn = plugin.get_client(container)
+    assert conn.execute("SELECT name FROM sqlite_master").fetchall() == []
+    conn.close()
+    container.stop()
@@ -0,0 +1,62 @@
+from unittest.mock import MagicMock, patch
+from gherkin_testcontainers.seeding import SeedResult
+from gherkin_testcontainers.steps import step_seed_from_file, step_seed_from_table
+
+
+def test_seed_from_table_step_records_result():
+    context = MagicMock(spec=["containers", "table"])
+    result = SeedResult("users", 2, 0.5)
+    with patch("gherkin_testcontainers.steps.seed", return_value=result) as mock_seed:
+        step_seed_from_table(context, "users", "postgres")
+    mock_seed.assert_called_once_with(context.containers, "postgres", "users", context.table)
+    assert context.seed_results == [result]
+
+
+def test_seed_from_file_step_appends_results():
+    context = MagicMock(spec=["containers"])
+    first, second = SeedResult("a", 1, 1.0), SeedResult("b", 2, 1.0)
+    with patch("gherkin_testcontainers.steps.seed", side_effect=[first, second]) as mock_seed:
+        step_seed_from_file(context, "a", "sqlite", "a.csv")
+        step_seed_from_file(context, "b", "sqlite", "b.parquet")
+    mock_seed.assert_called_with(context.containers, "sqlite", "b", "b.parquet")
+    assert context.seed_results == [first, second]
+
+
+def test_load_shape_parses_rate_and_workers():
+    from gherkin_testcontainers.steps import parse_load_shape
+
+    assert parse_load_shape("") == {"rate": None, "concurrency": None}
+    assert parse_load_shape(" at 5000/s") == {"rate": 5000.0, "concurrency": None}
+    assert parse_load_shape(" at 2.5/s with 8 workers") == {"rate": 2.5, "concurrency": 8}
+
+
+def test_load_step_records_results_and_assertions_check_them():
+    import pytest
+    from gherkin_testcontainers.loadgen import LatencyHistogram, LoadResult
+    from gherkin_testcontainers.steps import (
+        step_assert_latency,
+        step_assert_no_errors,
+        step_assert_throughput,
+        step_load_messages,
+    )
+
+    histogram = LatencyHistogram()
+    for millis in range(1, 101):
+        histogram.record(millis / 1000)
+    result = LoadResult(100, 0, 2.0, histogram, rate=50.0)
+    context = MagicMock(spec=["containers"])
+    shape = {"rate": 50.0, "concurrency": None}
+    with patch("gherkin_testcontainers.steps.load", return_value=result) as mock_load:
+        step_load_messages(context, 100, "events", "kafka", shape)
+    mock_load.assert_called_once_with(
+        context.containers, "kafka", "events", count=100, rate=50.0, concurrency=None
+    )
+    assert context.load_results == [result]
+
+    step_assert_latency(context, 99, 100)
+    step_assert_throughput(context, 50)
+    step_assert_no_errors(context)
+    with pytest.raises(AssertionError, match="p99 latency was 99"):
+        step_assert_latency(context, 99, 50)
+    with pytest.raises(AssertionError, match="Throughput was 50.0/s"):
+        step_assert_throughput(context, 60)